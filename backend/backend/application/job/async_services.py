@@ -0,0 +1,74 @@
+import logging
+from typing import List
+
+from backend.application.job.cache import JobPostingCache
+from backend.application.job.search import get_job_posting_search_backend
+from backend.application.job.services import JobPostingAppServices
+from backend.domain.job.models import JobPosting
+from backend.domain.job.services import JobPostingServices
+from utils.django.exceptions import JobPostingException
+from utils.mongo.connection import get_motor_collection
+
+logger = logging.getLogger("django")
+
+
+class AsyncJobPostingAppServices:
+    """
+    Job Posting reads for async views, on the motor driver.
+    Nothing here blocks the event loop, so slow queries wait on the socket instead of
+    holding a worker thread.
+    """
+
+    def __init__(self):
+        self.job_posting_services = JobPostingServices()
+        self.job_posting_app_services = JobPostingAppServices()
+        self.job_posting_cache = JobPostingCache()
+
+    def get_job_posting_collection(self):
+        """
+        This Method will return the motor collection of Job Postings.
+        """
+        if self.job_posting_services.get_job_posting_connection().vendor != "djongo":
+            raise JobPostingException(
+                "Async listing unavailable", "Job Postings are not stored in MongoDB")
+        return get_motor_collection(JobPosting._meta.db_table)
+
+    @staticmethod
+    def build_projection(fields: List[str]) -> dict:
+        return {"_id": 0, **{
+            JobPosting._meta.get_field(field).column: 1 for field in fields}}
+
+    async def search_job_posting(
+        self, job_title: str, limit: int, fields: List[str], filters: dict
+    ) -> List[dict]:
+        """
+        This Method will return up to limit Job Posting documents matching job_title and filters,
+        best match first.
+        """
+        return await get_job_posting_search_backend().asearch(
+            collection=self.get_job_posting_collection(),
+            query=job_title,
+            limit=limit,
+            projection=self.build_projection(fields),
+            match=self.job_posting_app_services.build_job_posting_match(filters),
+        )
+
+    async def compute_job_posting_facets(self, filters: dict) -> dict:
+        """
+        This Method will count facet values in a single $facet aggregation.
+        """
+        pipeline = self.job_posting_app_services.build_job_posting_facet_pipeline(filters)
+        result = await self.get_job_posting_collection().aggregate(pipeline).to_list(length=1)
+        return self.job_posting_app_services.format_job_posting_facets(
+            result[0] if result else {})
+
+    async def get_job_posting_facets(self, filters: dict) -> dict:
+        """
+        This Method will return value counts of every facet field for the given filters,
+        sharing the cache entries of the sync listing.
+        """
+        return await self.job_posting_cache.aget_or_set(
+            "facets", filters, lambda: self.compute_job_posting_facets(filters))
+
+    async def estimate_job_posting_count(self) -> int:
+        return await self.get_job_posting_collection().estimated_document_count()
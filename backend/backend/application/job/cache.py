@@ -0,0 +1,166 @@
+import hashlib
+import json
+import time
+from typing import Any, Awaitable, Callable, Optional, Tuple, Union
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+
+from backend.domain.job.services import JobPostingServices
+from utils.metrics.registry import registry
+
+GENERATION_NAME = "job_posting"
+
+# (generation, last modified timestamp, monotonic time it was read), shared by the instances
+# of this process.
+_generation_state: Optional[Tuple[int, float, float]] = None
+
+cache_requests = registry.counter(
+    "job_posting_cache_requests", "Job Posting cache reads by namespace and result.",
+    ["namespace", "result"])
+
+
+def record_cache_request(key: str, value: Any) -> None:
+    # Keys are job_posting:<namespace>:<generation>:<digest>.
+    cache_requests.inc(namespace=key.split(":", 2)[1], result="miss" if value is None else "hit")
+
+
+class JobPostingCache:
+    """
+    Versioned cache for Job Posting reads.
+    Keys embed the collection generation, which is bumped on every write, so a write makes
+    all earlier entries unreachable at once instead of deleting them one by one.
+    The generation is kept in the database, so a write in any process (an ingestion worker,
+    a management command) invalidates the entries of every process within
+    JOB_POSTING_GENERATION_TTL seconds, how long a process reuses the generation it read.
+    The cached values themselves are per process unless JOB_POSTING_CACHE_ALIAS points at a
+    shared backend (Redis/Memcached).
+    """
+
+    def __init__(self):
+        self.cache = caches[settings.JOB_POSTING_CACHE_ALIAS]
+
+    @staticmethod
+    def read_generation() -> Tuple[int, float]:
+        """
+        This method will return the generation and its last modified timestamp from the database.
+        """
+        generation_repo = JobPostingServices.get_job_posting_generation_repo()
+        row = generation_repo.filter(name=GENERATION_NAME).values_list(
+            "generation", "last_modified").first()
+        if row is None:
+            # Start from the clock rather than 1, so a reset database can never bring back a
+            # generation that entries are still cached under.
+            job_posting_generation, _ = generation_repo.get_or_create(
+                name=GENERATION_NAME,
+                defaults={"generation": time.time_ns(), "last_modified": time.time()})
+            row = (job_posting_generation.generation, job_posting_generation.last_modified)
+        return row
+
+    def get_generation_state(self) -> Tuple[int, float]:
+        """
+        This method will return the generation and its last modified timestamp, read from the
+        database at most once per JOB_POSTING_GENERATION_TTL seconds per process.
+        """
+        global _generation_state
+        state = _generation_state
+        now = time.monotonic()
+        if state is None or now - state[2] >= settings.JOB_POSTING_GENERATION_TTL:
+            generation, last_modified = self.read_generation()
+            state = _generation_state = (generation, last_modified, now)
+        return state[0], state[1]
+
+    def get_generation(self) -> int:
+        """
+        This method will return the current collection generation.
+        """
+        return self.get_generation_state()[0]
+
+    def bump_generation(self) -> None:
+        """
+        This method will invalidate every cached Job Posting read, in every process.
+        """
+        global _generation_state
+        now = time.time()
+        collection = JobPostingServices.get_job_posting_generation_collection()
+        if collection is not None:
+            # One atomic $inc round trip.
+            updated = collection.update_one(
+                {"name": GENERATION_NAME},
+                {"$inc": {"generation": 1}, "$set": {"last_modified": now}}).matched_count
+        else:
+            updated = JobPostingServices.get_job_posting_generation_repo().filter(
+                name=GENERATION_NAME).update(generation=F("generation") + 1, last_modified=now)
+        if not updated:
+            self.read_generation()
+        _generation_state = None
+
+    def build_key(self, namespace: str, params: dict, generation: Optional[int] = None) -> str:
+        """
+        This method will build a key for params under the current generation. Build the key
+        once per read, so a value computed before a write is never stored under a newer generation.
+        """
+        params_digest = hashlib.sha1(
+            json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        if generation is None:
+            generation = self.get_generation()
+        return f"job_posting:{namespace}:{generation}:{params_digest}"
+
+    def get_validators(self, namespace: str, params: dict) -> Tuple[str, str, float]:
+        """
+        This method will return the key of a read, with an ETag and a last modified timestamp
+        for conditional requests, both from the shared generation, so every process hands out
+        the same validators and a write anywhere changes them.
+        """
+        generation, last_modified = self.get_generation_state()
+        key = self.build_key(namespace, params, generation)
+        return key, f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"', last_modified
+
+    def get(self, key: str) -> Union[Any, None]:
+        value = self.cache.get(key)
+        record_cache_request(key, value)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self.cache.set(key, value)
+
+    def get_or_set(self, namespace: str, params: dict, producer: Callable[[], Any]) -> Any:
+        """
+        This method will return the cached value for params, calling producer on a miss.
+        """
+        key = self.build_key(namespace, params)
+        value = self.get(key)
+        if value is None:
+            value = producer()
+            self.cache.set(key, value)
+        return value
+
+    # Async variants. Django's own async cache methods run in the single thread-sensitive
+    # executor, these run in the shared pool so cache round trips don't queue behind each other.
+
+    async def abuild_key(self, namespace: str, params: dict) -> str:
+        return await sync_to_async(self.build_key, thread_sensitive=False)(namespace, params)
+
+    async def aget_validators(self, namespace: str, params: dict) -> Tuple[str, str, float]:
+        return await sync_to_async(self.get_validators, thread_sensitive=False)(namespace, params)
+
+    async def aget(self, key: str) -> Union[Any, None]:
+        return await sync_to_async(self.get, thread_sensitive=False)(key)
+
+    async def aset(self, key: str, value: Any) -> None:
+        await sync_to_async(self.cache.set, thread_sensitive=False)(key, value)
+
+    async def aget_or_set(
+        self, namespace: str, params: dict, producer: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        This method will return the cached value for params, awaiting producer() on a miss.
+        """
+        key = await self.abuild_key(namespace, params)
+        value = await self.aget(key)
+        if value is None:
+            value = await producer()
+            await self.aset(key, value)
+        return value
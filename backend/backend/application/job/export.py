@@ -0,0 +1,240 @@
+import csv
+import importlib.util
+import io
+import logging
+import zlib
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, Optional
+
+import orjson
+from django.conf import settings
+from django.db import models
+
+from backend.domain.job.models import JobPosting
+from backend.domain.job.services import JobPostingServices
+from utils.django.exceptions import JobPostingException
+
+logger = logging.getLogger("django")
+
+EXPORT_FORMATS = {
+    # format -> (content type, file extension)
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+# Internal bookkeeping, not part of the export.
+EXCLUDED_FIELDS = {"content_hash"}
+
+
+def get_export_fields() -> List[models.Field]:
+    return [field for field in JobPosting._meta.concrete_fields
+            if field.name not in EXCLUDED_FIELDS]
+
+
+def _as_utc(value: datetime) -> datetime:
+    # MongoDB hands datetimes back naive, in UTC.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _csv_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return _as_utc(value).isoformat()
+    return value if isinstance(value, str) else str(value)
+
+
+class JobPostingExporter:
+    """
+    Streams Job Postings as NDJSON, CSV or Parquet, optionally gzipped.
+    Rows are read in batches from a server-side cursor as plain tuples, never as model
+    instances or serializer output, and every batch is encoded and handed on before the next
+    one is read, so memory is bounded by the batch size whatever the collection size.
+    """
+
+    def __init__(
+        self,
+        export_format: str = "ndjson",
+        compress: bool = False,
+        modified_since: Optional[datetime] = None,
+        batch_size: Optional[int] = None,
+    ):
+        if export_format not in EXPORT_FORMATS:
+            raise JobPostingException(
+                "Invalid format", f"Choose one of {', '.join(EXPORT_FORMATS)}")
+        # Checked up front, a streamed response can't turn into an error response later.
+        if export_format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+            raise JobPostingException("Parquet export unavailable", "pyarrow is not installed")
+        self.job_posting_services = JobPostingServices()
+        self.export_format = export_format
+        self.compress = compress
+        self.modified_since = modified_since
+        self.batch_size = batch_size or settings.JOB_EXPORT_BATCH_SIZE
+        self.fields = get_export_fields()
+        self.columns = [field.column for field in self.fields]
+
+    @property
+    def content_type(self) -> str:
+        # Parquet compresses its own pages, the other formats are gzipped as a whole.
+        if self.compress and self.export_format != "parquet":
+            return "application/gzip"
+        return EXPORT_FORMATS[self.export_format][0]
+
+    @property
+    def file_name(self) -> str:
+        file_name = f"job_postings.{EXPORT_FORMATS[self.export_format][1]}"
+        if self.compress and self.export_format != "parquet":
+            file_name += ".gz"
+        return file_name
+
+    # Reading
+
+    def iter_batches(self) -> Iterator[List[tuple]]:
+        """
+        This method will yield lists of up to batch_size rows, each a tuple in column order.
+        """
+        collection = self.job_posting_services.get_job_posting_collection()
+        rows = self._iter_mongo_rows(collection) if collection is not None \
+            else self._iter_orm_rows()
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _iter_mongo_rows(self, collection) -> Iterator[tuple]:
+        query = {}
+        if self.modified_since:
+            query["modified_at"] = {"$gte": self.modified_since}
+        projection = {"_id": 0, **{column: 1 for column in self.columns}}
+        # A slow client can leave the cursor idle for longer than the server timeout.
+        with collection.find(query, projection, batch_size=self.batch_size,
+                             no_cursor_timeout=True) as cursor:
+            for document in cursor:
+                yield tuple(document.get(column) for column in self.columns)
+
+    def _iter_orm_rows(self) -> Iterator[tuple]:
+        queryset = self.job_posting_services.get_job_posting_repo().all()
+        if self.modified_since:
+            queryset = queryset.filter(modified_at__gte=self.modified_since)
+        yield from queryset.values_list(
+            *[field.name for field in self.fields]).iterator(chunk_size=self.batch_size)
+
+    # Encoding
+
+    def _encode_ndjson(self, batches: Iterable[List[tuple]]) -> Iterator[bytes]:
+        option = orjson.OPT_NAIVE_UTC | orjson.OPT_APPEND_NEWLINE
+        columns = self.columns
+        for batch in batches:
+            yield b"".join(orjson.dumps(dict(zip(columns, row)), option=option)
+                           for row in batch)
+
+    def _encode_csv(self, batches: Iterable[List[tuple]]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(self.columns)
+        for batch in batches:
+            writer.writerows([_csv_value(value) for value in row] for row in batch)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    def _parquet_schema(self):
+        import pyarrow as pa
+
+        types = {
+            models.DateTimeField: pa.timestamp("ms", tz="UTC"),
+            models.FloatField: pa.float64(),
+            models.BooleanField: pa.bool_(),
+        }
+        return pa.schema([
+            pa.field(field.column, next(
+                (arrow_type for field_class, arrow_type in types.items()
+                 if isinstance(field, field_class)), pa.string()))
+            for field in self.fields
+        ])
+
+    def _encode_parquet(self, batches: Iterable[List[tuple]]) -> Iterator[bytes]:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = self._parquet_schema()
+        string_columns = [index for index, field in enumerate(schema)
+                          if pa.types.is_string(field.type)]
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(
+            sink, schema, compression="gzip" if self.compress else "snappy")
+        try:
+            for batch in batches:
+                columns = [list(column) for column in zip(*batch)]
+                for index in string_columns:
+                    columns[index] = [None if value is None else str(value)
+                                      for value in columns[index]]
+                # One row group per batch.
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(column, type=field.type)
+                     for column, field in zip(columns, schema)], schema=schema))
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    @staticmethod
+    def _gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    def stream(self) -> Iterator[bytes]:
+        """
+        This method will yield the export file as byte chunks, about one per batch.
+        """
+        encoder = {
+            "ndjson": self._encode_ndjson,
+            "csv": self._encode_csv,
+            "parquet": self._encode_parquet,
+        }[self.export_format]
+        chunks = encoder(self.iter_batches())
+        if self.compress and self.export_format != "parquet":
+            chunks = self._gzip(chunks)
+        for chunk in chunks:
+            if chunk:
+                yield chunk
+        logger.info("Job Postings exported as %s", self.file_name)
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file that keeps what was written until drain() hands it out, so a Parquet file
+    can be streamed one row group at a time.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
@@ -0,0 +1,157 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import IO, TYPE_CHECKING, Callable, Iterator, List, Union
+
+from django.conf import settings
+
+from utils.django.exceptions import JobPostingException
+
+# pandas and openpyxl are imported when a file is ingested, not by every process loading the urls.
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Upload column -> JobPosting field
+JOB_POSTING_COLUMN_MAPPING = {
+    "job_name": "job_title",
+    "company_name": "company_name",
+    "job_full_text": "job_description",
+    "post_url": "job_post_url",
+    "post_apply_url": "job_apply_url",
+    "company_url": "company_url",
+    "Company Industry": "company_industry",
+    "Minimum Compensation": "min_compensation",
+    "Maximum Compensation": "max_compensation",
+    "Compensation Type": "type_of_compensation",
+    "Job Hours": "job_hours",
+    "Role Seniority": "role_seniority",
+    "Minimum Education": "min_education",
+    "Office Location": "office_location",
+    "post_html": "post_html",
+    "city": "city",
+    "region": "region",
+    "country": "country",
+}
+
+EXCEL_EXTENSIONS = (".xlsx", ".xlsm")
+CSV_EXTENSIONS = (".csv",)
+
+
+def _normalize_chunk(df: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    This method will rename upload columns to JobPosting fields for a whole chunk at once.
+    """
+    missing_columns = set(JOB_POSTING_COLUMN_MAPPING) - set(df.columns)
+    if missing_columns:
+        raise JobPostingException(
+            "Missing columns in file", ", ".join(sorted(missing_columns)))
+    df = df[list(JOB_POSTING_COLUMN_MAPPING)].rename(
+        columns=JOB_POSTING_COLUMN_MAPPING)
+    return df.fillna("")
+
+
+def _iter_excel_chunks(file: IO, chunk_size: int) -> Iterator["pd.DataFrame"]:
+    """
+    This method will stream rows of the first sheet in read-only mode, chunk by chunk.
+    """
+    import pandas as pd
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [str(column).strip() if column is not None else ""
+                  for column in header]
+        while True:
+            chunk = [row for row in islice(rows, chunk_size)
+                     if any(value is not None for value in row)]
+            if not chunk:
+                break
+            yield _normalize_chunk(pd.DataFrame.from_records(chunk, columns=header))
+    finally:
+        workbook.close()
+
+
+def _iter_csv_chunks(file: IO, chunk_size: int) -> Iterator["pd.DataFrame"]:
+    """
+    This method will stream a CSV upload chunk by chunk.
+    """
+    import pandas as pd
+
+    reader = pd.read_csv(
+        file,
+        chunksize=chunk_size,
+        dtype=str,
+        keep_default_na=False,
+        skipinitialspace=True,
+    )
+    for df in reader:
+        df.columns = [str(column).strip() for column in df.columns]
+        yield _normalize_chunk(df)
+
+
+def iter_job_posting_chunks(file: IO, file_name: str, chunk_size: int) -> Iterator[List[dict]]:
+    """
+    This method will yield lists of JobPosting field dicts of at most chunk_size rows,
+    so only one chunk of the upload is held in memory at a time.
+    """
+    extension = os.path.splitext(file_name or "")[1].lower()
+    if extension in EXCEL_EXTENSIONS:
+        chunks = _iter_excel_chunks(file, chunk_size)
+    elif extension in CSV_EXTENSIONS:
+        chunks = _iter_csv_chunks(file, chunk_size)
+    else:
+        raise JobPostingException(
+            "Unsupported file type", f"'{extension}', upload an .xlsx or .csv file")
+    for df in chunks:
+        yield df.to_dict("records")
+
+
+def estimate_job_posting_rows(file: IO, file_name: str) -> Union[int, None]:
+    """
+    This method will cheaply estimate the number of data rows in an upload, used for ETA.
+    Excel files report their sheet dimension, CSV files are estimated by counting newlines.
+    """
+    extension = os.path.splitext(file_name or "")[1].lower()
+    try:
+        if extension in EXCEL_EXTENSIONS:
+            from openpyxl import load_workbook
+
+            workbook = load_workbook(file, read_only=True)
+            try:
+                max_row = workbook.worksheets[0].max_row
+            finally:
+                workbook.close()
+            return max(max_row - 1, 0) if max_row else None
+        if extension in CSV_EXTENSIONS:
+            newlines = 0
+            for block in iter(lambda: file.read(1024 * 1024), b""):
+                newlines += block.count(b"\n")
+            return max(newlines - 1, 0)
+    finally:
+        file.seek(0)
+    return None
+
+
+_ingestion_executor = None
+_ingestion_executor_lock = threading.Lock()
+
+
+def submit_ingestion_task(task: Callable, *args, **kwargs) -> Future:
+    """
+    This method will queue an ingestion task on a bounded, lazily created worker pool.
+    """
+    global _ingestion_executor
+    if _ingestion_executor is None:
+        with _ingestion_executor_lock:
+            if _ingestion_executor is None:
+                _ingestion_executor = ThreadPoolExecutor(
+                    max_workers=settings.JOB_INGEST_WORKERS,
+                    thread_name_prefix="job-ingestion",
+                )
+    return _ingestion_executor.submit(task, *args, **kwargs)
@@ -0,0 +1,477 @@
+import bisect
+import heapq
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import timedelta
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models.query import QuerySet
+from django.utils.module_loading import import_string
+
+from backend.domain.job.models import JobPosting
+from backend.domain.job.services import JobPostingServices
+from utils.mongo.connection import get_mongo_collection
+
+logger = logging.getLogger("django")
+
+TOKEN_REGEX = re.compile(r"\w+")
+# Matches in the title rank above matches in the company name.
+FIELD_WEIGHTS = {"job_title": 2.0, "company_name": 1.0}
+# Postings are built before they are saved, so re-read a little behind the watermark.
+REFRESH_OVERLAP = timedelta(minutes=1)
+# Rows indexed per hold of the lock, so searches go on while the index is loaded.
+LOAD_BATCH_SIZE = 1000
+# Filtered searches rank this many times the page size, then keep the hits passing the filters.
+FILTER_OVERFETCH = 10
+
+
+def tokenize(value: str) -> List[str]:
+    return TOKEN_REGEX.findall((value or "").lower())
+
+
+def trigrams(token: str) -> Set[str]:
+    """
+    Start-padded trigrams, so that prefixes of a token share the trigrams of the token itself.
+    """
+    padded = f"$${token}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def allowed_edits(token: str, max_edits: int) -> int:
+    """
+    Short query terms get fewer edits, otherwise every short word matches everything.
+    """
+    if len(token) < 3:
+        return 0
+    if len(token) < 6:
+        return min(1, max_edits)
+    return max_edits
+
+
+def prefix_edit_distance(query: str, token: str, max_edits: int) -> Union[int, None]:
+    """
+    Smallest Levenshtein distance between query and any prefix of token, or None when every
+    prefix is more than max_edits away. Stops as soon as a DP row exceeds the bound.
+    """
+    previous = list(range(len(token) + 1))
+    for i, query_char in enumerate(query, start=1):
+        current = [i]
+        for j, token_char in enumerate(token, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (query_char != token_char),
+            ))
+        if min(current) > max_edits:
+            return None
+        previous = current
+    distance = min(previous)
+    return distance if distance <= max_edits else None
+
+
+class BaseJobPostingSearchBackend:
+    """
+    Base class for Job Posting title search backends.
+    """
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        fields: Optional[List[str]] = None,
+        queryset: Optional[QuerySet] = None,
+    ) -> List:
+        """
+        This method will return up to limit Job Postings (model instances or documents)
+        matching query, best match first. When fields is given only those are loaded; when
+        queryset is given only Job Postings in it are returned.
+        """
+        raise NotImplementedError
+
+    async def asearch(
+        self, collection, query: str, limit: int, projection: dict, match: dict
+    ) -> List[dict]:
+        """
+        This method will return up to limit Job Posting documents from a motor collection
+        matching query and the match filter, best match first.
+        """
+        raise NotImplementedError
+
+    def start(self) -> None:
+        """
+        This method will be called when a worker process starts, to prepare the backend
+        before the first search.
+        """
+
+    def index_job_postings(self, job_postings: Iterable[JobPosting]) -> None:
+        """
+        This method will be called with newly created or updated Job Postings.
+        """
+
+    @staticmethod
+    def fetch_in_rank_order(
+        ids: List[str], limit: int, fields: Optional[List[str]], queryset: QuerySet
+    ) -> List[JobPosting]:
+        """
+        This method will load ranked ids from queryset a window at a time, keeping rank order,
+        until limit Job Postings passed the queryset's filters.
+        """
+        if fields:
+            queryset = queryset.only(*fields)
+        job_postings = []
+        window_size = max(limit, 1) * 4
+        for start in range(0, len(ids), window_size):
+            window = ids[start:start + window_size]
+            found = {str(job_posting.id): job_posting
+                     for job_posting in queryset.filter(id__in=window)}
+            job_postings.extend(found[doc_id] for doc_id in window if doc_id in found)
+            if len(job_postings) >= limit:
+                break
+        return job_postings[:limit]
+
+
+class NgramJobPostingSearchBackend(BaseJobPostingSearchBackend):
+    """
+    In-process autocomplete index over job_title and company_name.
+    Words are indexed by start-padded trigrams; query terms are matched as fuzzy prefixes
+    with a bounded edit distance, and every query term has to match.
+    A background thread, started by the first search or on app ready with
+    JOB_SEARCH_START_ON_READY, builds the index and then pulls postings modified since the
+    last pass every JOB_SEARCH_REFRESH_SECONDS to pick up writes from other processes, and
+    drops deleted postings every JOB_SEARCH_RECONCILE_SECONDS. Bulk creates in this process
+    are indexed in place.
+    Every worker process holds its own copy of the index, so memory grows with the number of
+    workers; deployments running many workers should use AtlasJobPostingSearchBackend.
+    """
+
+    def __init__(self):
+        self.job_posting_services = JobPostingServices()
+        self.max_edits = settings.JOB_SEARCH_MAX_EDITS
+        self.refresh_seconds = settings.JOB_SEARCH_REFRESH_SECONDS
+        self.lock = threading.RLock()
+        self.refresh_lock = threading.Lock()
+        self.start_lock = threading.Lock()
+        self.documents: Dict[str, Dict[str, Set[str]]] = {}
+        self.postings: Dict[str, Dict[str, Set[str]]] = defaultdict(
+            lambda: defaultdict(set))
+        self.trigram_index: Dict[str, Set[str]] = defaultdict(set)
+        self.sorted_vocabulary: Union[List[str], None] = None
+        self.watermark = None
+        self.refreshed_at = None
+        self.reconciled_at = None
+        self.built = threading.Event()
+        self.thread = None
+        self.pid = None
+
+    # Index maintenance
+
+    def _add_token(self, token: str) -> None:
+        if token in self.postings:
+            return
+        self.sorted_vocabulary = None
+        for trigram in trigrams(token):
+            self.trigram_index[trigram].add(token)
+
+    def _drop_token(self, token: str) -> None:
+        del self.postings[token]
+        self.sorted_vocabulary = None
+        for trigram in trigrams(token):
+            self.trigram_index[trigram].discard(token)
+            if not self.trigram_index[trigram]:
+                del self.trigram_index[trigram]
+
+    def _remove_document(self, doc_id: str) -> None:
+        fields = self.documents.pop(doc_id, None)
+        if not fields:
+            return
+        for field, tokens in fields.items():
+            for token in tokens:
+                doc_ids = self.postings[token][field]
+                doc_ids.discard(doc_id)
+                if not doc_ids:
+                    del self.postings[token][field]
+                if not self.postings[token]:
+                    self._drop_token(token)
+
+    def _add_document(self, doc_id: str, job_title: str, company_name: str, modified_at) -> None:
+        self._remove_document(doc_id)
+        fields = {"job_title": set(tokenize(job_title)),
+                  "company_name": set(tokenize(company_name))}
+        self.documents[doc_id] = fields
+        for field, tokens in fields.items():
+            for token in tokens:
+                self._add_token(token)
+                self.postings[token][field].add(doc_id)
+        if modified_at and (self.watermark is None or modified_at > self.watermark):
+            self.watermark = modified_at
+
+    def _load(self, queryset) -> int:
+        loaded = 0
+        rows = queryset.values_list("id", "job_title", "company_name", "modified_at").iterator(
+            chunk_size=LOAD_BATCH_SIZE)
+        while True:
+            batch = list(islice(rows, LOAD_BATCH_SIZE))
+            if not batch:
+                return loaded
+            with self.lock:
+                for id, job_title, company_name, modified_at in batch:
+                    self._add_document(str(id), job_title, company_name, modified_at)
+            loaded += len(batch)
+
+    def _reconcile(self) -> int:
+        """
+        Drops indexed postings that are no longer in the database.
+        """
+        ids = {str(id) for id in self.job_posting_services.get_job_posting_repo().values_list(
+            "id", flat=True).iterator(chunk_size=LOAD_BATCH_SIZE * 10)}
+        with self.lock:
+            deleted = [doc_id for doc_id in self.documents if doc_id not in ids]
+            for doc_id in deleted:
+                self._remove_document(doc_id)
+        return len(deleted)
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        This method will build the index on the first call, then only pull postings modified
+        around or after the newest one already indexed, and drop deleted postings once
+        JOB_SEARCH_RECONCILE_SECONDS have passed. Searches are not blocked while it reads.
+        """
+        with self.refresh_lock:
+            now = time.monotonic()
+            if not force and self.refreshed_at is not None and (
+                    now - self.refreshed_at) < self.refresh_seconds:
+                return
+            queryset = self.job_posting_services.get_job_posting_repo().all()
+            if self.watermark is not None:
+                queryset = queryset.filter(
+                    modified_at__gte=self.watermark - REFRESH_OVERLAP)
+            loaded = self._load(queryset)
+            deleted = 0
+            if self.reconciled_at is None:
+                # A full load has nothing deleted to drop.
+                self.reconciled_at = now
+            elif now - self.reconciled_at >= settings.JOB_SEARCH_RECONCILE_SECONDS:
+                deleted = self._reconcile()
+                self.reconciled_at = now
+            self.refreshed_at = now
+            self.built.set()
+            if loaded or deleted:
+                logger.info("Job search index refreshed with %s postings, %s deleted",
+                            loaded, deleted)
+
+    def start(self) -> None:
+        """
+        This method will start the thread that builds and refreshes the index, once per process.
+        """
+        if self.thread is not None and self.pid == os.getpid():
+            return
+        with self.start_lock:
+            if self.thread is not None and self.pid == os.getpid():
+                return
+            if self.pid is not None:
+                # Forked from a process that had the thread; its locks may have been held.
+                self.lock = threading.RLock()
+                self.refresh_lock = threading.Lock()
+            self.pid = os.getpid()
+            self.thread = threading.Thread(target=self._run, name="job-search-index", daemon=True)
+            self.thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                close_old_connections()
+                self.refresh(force=True)
+            except Exception as e:
+                logger.error("Error while refreshing the job search index: %s", e)
+            time.sleep(self.refresh_seconds)
+
+    def index_job_postings(self, job_postings: Iterable[JobPosting]) -> None:
+        with self.lock:
+            if self.refreshed_at is None:
+                # Not built yet, the build will load them.
+                return
+            for job_posting in job_postings:
+                self._add_document(str(job_posting.id), job_posting.job_title,
+                                   job_posting.company_name, job_posting.modified_at)
+
+    # Querying
+
+    def _candidate_tokens(self, query_token: str, max_edits: int) -> Iterable[str]:
+        if max_edits == 0:
+            if self.sorted_vocabulary is None:
+                self.sorted_vocabulary = sorted(self.postings)
+            index = bisect.bisect_left(self.sorted_vocabulary, query_token)
+            while index < len(self.sorted_vocabulary) and \
+                    self.sorted_vocabulary[index].startswith(query_token):
+                yield self.sorted_vocabulary[index]
+                index += 1
+            return
+        query_trigrams = trigrams(query_token)
+        # Each edit breaks at most three trigrams of the query.
+        min_shared = max(len(query_trigrams) - 3 * max_edits, 1)
+        shared = Counter()
+        for trigram in query_trigrams:
+            shared.update(self.trigram_index.get(trigram, ()))
+        for token, count in shared.items():
+            if count >= min_shared:
+                yield token
+
+    def _match_token(self, query_token: str) -> Dict[str, float]:
+        """
+        Returns doc_id -> best score for one query term.
+        """
+        max_edits = allowed_edits(query_token, self.max_edits)
+        scores: Dict[str, float] = {}
+        for token in self._candidate_tokens(query_token, max_edits):
+            distance = prefix_edit_distance(query_token, token, max_edits)
+            if distance is None:
+                continue
+            closeness = 1.0 - distance / (len(query_token) + 1)
+            # Whole-word matches beat prefix matches.
+            if token == query_token:
+                closeness += 0.5
+            for field, doc_ids in self.postings[token].items():
+                score = closeness * FIELD_WEIGHTS[field]
+                for doc_id in doc_ids:
+                    if score > scores.get(doc_id, 0.0):
+                        scores[doc_id] = score
+        return scores
+
+    def search_ids(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        self.start()
+        if not self.built.wait(settings.JOB_SEARCH_BUILD_WAIT_SECONDS):
+            logger.warning("Job search index is still being built, results may be incomplete")
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+        with self.lock:
+            totals = None
+            for query_token in query_tokens:
+                scores = self._match_token(query_token)
+                if totals is None:
+                    totals = scores
+                else:
+                    totals = {doc_id: totals[doc_id] + score
+                              for doc_id, score in scores.items() if doc_id in totals}
+                if not totals:
+                    return []
+        if limit:
+            return heapq.nsmallest(limit, totals.items(), key=lambda item: (-item[1], item[0]))
+        return sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        fields: Optional[List[str]] = None,
+        queryset: Optional[QuerySet] = None,
+    ) -> List[JobPosting]:
+        # Unfiltered searches only need the top hits, filtered ones may have to skip some.
+        ranked = self.search_ids(
+            query, limit * FILTER_OVERFETCH if queryset is not None else limit)
+        if queryset is None:
+            queryset = self.job_posting_services.get_job_posting_repo().all()
+        return self.fetch_in_rank_order(
+            [doc_id for doc_id, _ in ranked], limit, fields, queryset)
+
+    async def asearch(
+        self, collection, query: str, limit: int, projection: dict, match: dict
+    ) -> List[dict]:
+        # Ranking is CPU work on the in-process index, keep it off the event loop.
+        ranked = await sync_to_async(self.search_ids, thread_sensitive=False)(
+            query, limit * FILTER_OVERFETCH if match else limit)
+        ids = [uuid.UUID(doc_id) for doc_id, _ in ranked]
+        documents = []
+        window_size = max(limit, 1) * 4
+        for start in range(0, len(ids), window_size):
+            window = ids[start:start + window_size]
+            found = {
+                document["id"]: document for document in await collection.find(
+                    {**match, "id": {"$in": window}}, {**projection, "id": 1}
+                ).to_list(length=None)
+            }
+            documents.extend(found[doc_id] for doc_id in window if doc_id in found)
+            if len(documents) >= limit:
+                break
+        return documents[:limit]
+
+
+class AtlasJobPostingSearchBackend(BaseJobPostingSearchBackend):
+    """
+    MongoDB Atlas Search autocomplete backend. Needs an Atlas cluster with the
+    JOB_SEARCH_ATLAS_INDEX search index on job_title.
+    """
+
+    def __init__(self):
+        self.job_collection = get_mongo_collection(JobPosting._meta.db_table)
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        fields: Optional[List[str]] = None,
+        queryset: Optional[QuerySet] = None,
+    ) -> List:
+        if queryset is not None:
+            # Filters live on the Django side: rank a wider set of ids in Atlas, then
+            # keep the ones that pass the queryset.
+            ids = [str(document["id"]) for document in self.job_collection.aggregate(
+                self.build_pipeline(query, limit * FILTER_OVERFETCH) + [
+                    {"$project": {"id": 1}}])]
+            return self.fetch_in_rank_order(ids, limit, fields, queryset)
+        pipeline = self.build_pipeline(query, limit)
+        if fields:
+            pipeline.append({"$project": {field: 1 for field in fields}})
+        return list(self.job_collection.aggregate(pipeline))
+
+    async def asearch(
+        self, collection, query: str, limit: int, projection: dict, match: dict
+    ) -> List[dict]:
+        pipeline = self.build_pipeline(
+            query, limit * FILTER_OVERFETCH if match else limit)
+        if match:
+            pipeline += [{"$match": match}, {"$limit": limit}]
+        pipeline.append({"$project": projection})
+        return await collection.aggregate(pipeline).to_list(length=None)
+
+    def build_pipeline(self, query: str, limit: int) -> List[dict]:
+        return [
+            {
+                "$search": {
+                    "index": settings.JOB_SEARCH_ATLAS_INDEX,
+                    "autocomplete": {
+                        "query": query,
+                        "path": "job_title",
+                        "fuzzy": {
+                            "maxEdits": settings.JOB_SEARCH_MAX_EDITS
+                        }
+                    }
+                }
+            },
+            {"$limit": limit}
+        ]
+
+
+_search_backend = None
+_search_backend_lock = threading.Lock()
+
+
+def get_job_posting_search_backend() -> BaseJobPostingSearchBackend:
+    """
+    This method will return the per-process search backend configured in JOB_SEARCH_BACKEND.
+    """
+    global _search_backend
+    if _search_backend is None:
+        with _search_backend_lock:
+            if _search_backend is None:
+                _search_backend = import_string(settings.JOB_SEARCH_BACKEND)()
+    return _search_backend
@@ -1,14 +1,42 @@
 import logging
-from typing import Union
+import time
+from datetime import timedelta
+from functools import partial
+from typing import IO, Callable, Optional, Union
 
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Count
 from django.db.models.query import QuerySet
+from django.utils import timezone
 
-from backend.domain.job.models import JobPosting
+from backend.application.job.cache import JobPostingCache
+from backend.application.job.ingestion import (estimate_job_posting_rows,
+                                               iter_job_posting_chunks,
+                                               submit_ingestion_task)
+from backend.application.job.search import get_job_posting_search_backend
+from backend.domain.job.models import (IngestionStatusChoices, JobIngestion,
+                                       JobPosting)
 from backend.domain.job.services import JobPostingServices
+from utils.django.exceptions import JobPostingException
+from utils.metrics.registry import registry
+from utils.mongo.documents import to_mongo_document
 
 logger = logging.getLogger(__name__)
 logger = logging.getLogger("django")
 
+# rows/sec is rate(job_posting_ingested_rows_total) / rate(job_posting_ingest_seconds_total).
+ingested_rows = registry.counter(
+    "job_posting_ingested_rows", "Job Posting rows written by bulk create or upsert.",
+    ["mode"])
+ingest_seconds = registry.counter(
+    "job_posting_ingest_seconds", "Time spent writing Job Posting rows.", ["mode"])
+
+JOB_POSTING_FACET_FIELDS = [
+    "country", "region", "city", "role_seniority", "office_location",
+    "type_of_compensation", "company_industry"
+]
+
 
 class JobPostingAppServices:
     """
@@ -44,11 +72,362 @@ class JobPostingAppServices:
         """
         return self.job_posting_services.get_job_posting_repo().order_by("-created_at")
 
-    def bulk_create_job_posting_data(self, data: list) -> list:
+    def estimate_job_posting_count(self) -> int:
+        """
+        This Method will return the collection's estimated document count from its metadata,
+        without scanning it.
+        """
+        collection = self.job_posting_services.get_job_posting_collection()
+        if collection is None:
+            return self.job_posting_services.get_job_posting_repo().count()
+        return collection.estimated_document_count()
+
+    def search_job_posting(
+        self,
+        job_title: str,
+        limit: int,
+        fields: Optional[list] = None,
+        queryset: Optional[QuerySet] = None,
+    ) -> list:
+        """
+        This Method will return Job Postings matching job_title from the configured search backend,
+        loading only fields when given and restricted to queryset when given.
+        """
+        return get_job_posting_search_backend().search(
+            query=job_title, limit=limit, fields=fields, queryset=queryset)
+
+    @staticmethod
+    def build_job_posting_match(filters: dict, exclude: Optional[str] = None) -> dict:
+        """
+        This method will translate listing filters into a MongoDB $match document,
+        leaving out the exclude field.
+        """
+        match = {}
+        for name, value in filters.items():
+            if name == exclude:
+                continue
+            if name in JOB_POSTING_FACET_FIELDS:
+                match[name] = {"$in": list(value)}
+            elif name == "min_salary":
+                match["max_annual_compensation"] = {"$gte": float(value)}
+            elif name == "max_salary":
+                match["min_annual_compensation"] = {"$lte": float(value)}
+        return match
+
+    def get_job_posting_facets(self, filters: dict) -> dict:
+        """
+        This Method will return value counts of every facet field for the given filters,
+        cached per filter combination.
+        Each facet is counted with every filter except its own, so a client can offer the other
+        values of a field it already filtered on.
+        """
+        return JobPostingCache().get_or_set(
+            "facets", filters, lambda: self.compute_job_posting_facets(filters))
+
+    def compute_job_posting_facets(self, filters: dict) -> dict:
+        """
+        This Method will count facet values in a single $facet aggregation.
+        """
+        collection = self.job_posting_services.get_job_posting_collection()
+        if collection is None:
+            return self.compute_job_posting_facets_with_orm(filters)
+        pipeline = self.build_job_posting_facet_pipeline(filters)
+        return self.format_job_posting_facets(next(collection.aggregate(pipeline), {}))
+
+    @classmethod
+    def build_job_posting_facet_pipeline(cls, filters: dict) -> list:
+        """
+        This method will build the $facet aggregation counting every facet field, each with
+        all filters but its own.
+        """
+        shared_match = {name: value for name, value in filters.items()
+                        if name not in JOB_POSTING_FACET_FIELDS}
+        pipeline = [{"$match": cls.build_job_posting_match(shared_match)}] if shared_match else []
+        pipeline.append({"$facet": {
+            field: [
+                {"$match": cls.build_job_posting_match(filters, exclude=field)},
+                {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+                {"$limit": settings.JOB_FACET_LIMIT},
+            ]
+            for field in JOB_POSTING_FACET_FIELDS
+        }})
+        return pipeline
+
+    @staticmethod
+    def format_job_posting_facets(result: dict) -> dict:
+        return {
+            field: [{"value": bucket["_id"], "count": bucket["count"]}
+                    for bucket in result.get(field, [])]
+            for field in JOB_POSTING_FACET_FIELDS
+        }
+
+    def compute_job_posting_facets_with_orm(self, filters: dict) -> dict:
+        """
+        This Method will count facet values with one GROUP BY per facet, for non-MongoDB databases.
+        """
+        limit = settings.JOB_FACET_LIMIT
+        facets = {}
+        for field in JOB_POSTING_FACET_FIELDS:
+            queryset = self.job_posting_services.get_job_posting_repo().all()
+            for name, value in filters.items():
+                if name == field:
+                    continue
+                if name in JOB_POSTING_FACET_FIELDS:
+                    queryset = queryset.filter(**{f"{name}__in": value})
+                elif name == "min_salary":
+                    queryset = queryset.filter(max_annual_compensation__gte=value)
+                elif name == "max_salary":
+                    queryset = queryset.filter(min_annual_compensation__lte=value)
+            buckets = queryset.values(field).annotate(count=Count("id")).order_by("-count")[:limit]
+            facets[field] = [{"value": bucket[field], "count": bucket["count"]}
+                             for bucket in buckets]
+        return facets
+
+    def bulk_create_job_posting_data(self, data: list, batch_size: Optional[int] = None) -> list:
         """
         This Method will create list of Job Postings.
+        job_post_url is unique, so data repeating a URL fails; file uploads send such chunks
+        to upsert_job_posting_data.
         """
-        return self.job_posting_services.get_job_posting_repo().bulk_create(
+        started = time.perf_counter()
+        job_postings = self.job_posting_services.get_job_posting_repo().bulk_create(
             [self.job_posting_services.get_job_posting_factory().build_entity_with_id(
-                **job_posting_data) for job_posting_data in data]
+                **job_posting_data) for job_posting_data in data],
+            batch_size=batch_size or settings.JOB_INGEST_BATCH_SIZE
+        )
+        get_job_posting_search_backend().index_job_postings(job_postings)
+        JobPostingCache().bump_generation()
+        ingested_rows.inc(len(job_postings), mode="create")
+        ingest_seconds.inc(time.perf_counter() - started, mode="create")
+        return job_postings
+
+    def upsert_job_posting_data(self, data: list, batch_size: Optional[int] = None) -> dict:
+        """
+        This Method will insert or update Job Postings keyed by job_post_url.
+        Rows whose content hash matches the stored posting are skipped without a write.
+        Returns inserted/updated/unchanged counts.
+        """
+        started = time.perf_counter()
+        batch_size = batch_size or settings.JOB_INGEST_BATCH_SIZE
+        job_posting_factory = self.job_posting_services.get_job_posting_factory()
+        # The last row wins when a feed repeats a URL.
+        job_postings = {}
+        for job_posting_data in data:
+            job_posting = job_posting_factory.build_entity_with_id(**job_posting_data)
+            job_postings[job_posting.job_post_url] = job_posting
+
+        existing = {
+            job_post_url: (id, content_hash)
+            for job_post_url, id, content_hash in
+            self.job_posting_services.get_job_posting_repo().filter(
+                job_post_url__in=list(job_postings)).values_list(
+                "job_post_url", "id", "content_hash")
+        }
+        to_insert, to_update = [], []
+        for job_post_url, job_posting in job_postings.items():
+            if job_post_url not in existing:
+                to_insert.append(job_posting)
+                continue
+            id, content_hash = existing[job_post_url]
+            if content_hash != job_posting.content_hash:
+                job_posting.id = id
+                to_update.append(job_posting)
+
+        collection = self.job_posting_services.get_job_posting_collection()
+        if collection is not None:
+            self._bulk_write_job_postings(collection, to_insert, to_update, batch_size)
+        else:
+            self.job_posting_services.get_job_posting_repo().bulk_create(
+                to_insert, batch_size=batch_size)
+            update_fields = [field.name for field in JobPosting._meta.concrete_fields
+                             if not field.primary_key and field.name != "created_at"]
+            for job_posting in to_update:
+                job_posting.modified_at = timezone.now()
+            self.job_posting_services.get_job_posting_repo().bulk_update(
+                to_update, update_fields, batch_size=batch_size)
+
+        if to_insert or to_update:
+            get_job_posting_search_backend().index_job_postings(to_insert + to_update)
+            JobPostingCache().bump_generation()
+        ingested_rows.inc(len(data), mode="upsert")
+        ingest_seconds.inc(time.perf_counter() - started, mode="upsert")
+        return dict(
+            rows_inserted=len(to_insert),
+            rows_updated=len(to_update),
+            # Rows repeating a URL were collapsed into the last one, not left unchanged.
+            rows_unchanged=len(job_postings) - len(to_insert) - len(to_update),
+        )
+
+    def _bulk_write_job_postings(
+        self, collection, to_insert: list, to_update: list, batch_size: int
+    ) -> None:
+        """
+        This Method will write inserts and updates as UpdateOne(upsert=True) operations keyed by
+        job_post_url, in unordered batches. id and created_at are only set on insert.
+        """
+        from pymongo import UpdateOne
+
+        connection = self.job_posting_services.get_job_posting_connection()
+        operations = []
+        for job_posting in to_insert + to_update:
+            document = to_mongo_document(
+                job_posting, connection, add=False, exclude=("id", "created_at"))
+            operations.append(UpdateOne(
+                {"job_post_url": job_posting.job_post_url},
+                {
+                    "$set": document,
+                    "$setOnInsert": to_mongo_document(
+                        job_posting, connection, add=True,
+                        exclude=[field.name for field in JobPosting._meta.concrete_fields
+                                 if field.name not in ("id", "created_at")]),
+                },
+                upsert=True,
+            ))
+        for start in range(0, len(operations), batch_size):
+            collection.bulk_write(operations[start:start + batch_size], ordered=False)
+
+    def has_existing_job_post_urls(self, data: list) -> bool:
+        """
+        This Method will return whether data repeats a job_post_url, within itself or of a
+        stored Job Posting.
+        """
+        job_post_urls = [job_posting_data["job_post_url"] for job_posting_data in data]
+        if len(set(job_post_urls)) < len(job_post_urls):
+            return True
+        return self.job_posting_services.get_job_posting_repo().filter(
+            job_post_url__in=job_post_urls).exists()
+
+    def bulk_create_job_posting_from_file(
+        self,
+        file: IO,
+        file_name: str,
+        chunk_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[dict], None]] = None,
+        upsert: bool = False,
+    ) -> dict:
+        """
+        This Method will stream an uploaded Excel/CSV file and create Job Postings chunk by chunk,
+        or upsert them by job_post_url when upsert is True. Chunks repeating a job_post_url,
+        within the chunk or of a stored posting, are upserted in either mode.
+        A chunk that fails to write is counted as failed and the upload carries on.
+        progress_callback is called with the running counts after each chunk.
+        """
+        counts = dict(rows_processed=0, rows_failed=0, rows_inserted=0,
+                      rows_updated=0, rows_unchanged=0)
+        for chunk in iter_job_posting_chunks(
+                file, file_name, chunk_size or settings.JOB_INGEST_CHUNK_SIZE):
+            try:
+                if upsert or self.has_existing_job_post_urls(chunk):
+                    # A repeated URL would fail the whole insert, the upsert keeps the last row.
+                    for name, value in self.upsert_job_posting_data(data=chunk).items():
+                        counts[name] += value
+                else:
+                    counts["rows_inserted"] += len(
+                        self.bulk_create_job_posting_data(data=chunk))
+                counts["rows_processed"] += len(chunk)
+            except Exception as e:
+                logger.error(
+                    "Error while writing Job Posting chunk from %s: %s", file_name, e)
+                counts["rows_failed"] += len(chunk)
+            if progress_callback:
+                progress_callback(dict(counts))
+        logger.info("Job Postings written from %s: %s", file_name, counts)
+        return counts
+
+
+class JobIngestionAppServices:
+    """
+    Job Ingestion Application Services
+    """
+
+    def __init__(self):
+        self.job_posting_services = JobPostingServices()
+        self.job_posting_app_services = JobPostingAppServices()
+
+    def get_job_ingestion_by_id(self, id: str) -> Union[JobIngestion, None]:
+        """
+        This method will return JobIngestion object if obtained by ID else return None.
+        """
+        self.fail_stale_job_ingestions()
+        try:
+            return self.job_posting_services.get_job_ingestion_repo().get(id=id)
+        except (JobIngestion.DoesNotExist, ValueError) as e:
+            logger.info("Job Ingestion not found by Id: %s", e)
+            return None
+
+    def fail_stale_job_ingestions(self) -> int:
+        """
+        This method will mark ingestions queued or running but not updated for
+        JOB_INGEST_STALE_SECONDS as failed: the task only lives in the pool of the process that
+        took the upload, so an ingestion outliving it can never finish. A task that does start
+        later marks its ingestion running again.
+        """
+        stale = self.job_posting_services.get_job_ingestion_repo().filter(
+            status__in=[IngestionStatusChoices.QUEUED, IngestionStatusChoices.RUNNING],
+            modified_at__lt=timezone.now() - timedelta(seconds=settings.JOB_INGEST_STALE_SECONDS),
+        ).update(
+            status=IngestionStatusChoices.FAILED,
+            finished_at=timezone.now(),
+            modified_at=timezone.now(),
+            error="Ingestion was interrupted, please upload the file again.",
         )
+        if stale:
+            logger.error("%s stale Job Ingestions marked failed", stale)
+        return stale
+
+    def create_job_ingestion(self, file: IO, upsert: bool = False) -> JobIngestion:
+        """
+        This Method will store the upload and queue it for background ingestion once the
+        surrounding transaction commits, so the task always finds the row.
+        """
+        job_ingestion = self.job_posting_services.get_job_ingestion_factory().build_entity_with_id(
+            file=file, file_name=file.name, upsert=upsert)
+        job_ingestion.rows_total = estimate_job_posting_rows(file, file.name)
+        job_ingestion.save()
+        transaction.on_commit(partial(submit_ingestion_task, self.run_job_ingestion,
+                                      job_ingestion.id))
+        logger.info("Job Ingestion queued: %s", job_ingestion.id)
+        return job_ingestion
+
+    def run_job_ingestion(self, id) -> None:
+        """
+        This Method runs on a worker thread and ingests a stored upload, recording progress.
+        """
+        close_old_connections()
+        job_ingestion_repo = self.job_posting_services.get_job_ingestion_repo()
+        try:
+            job_ingestion = job_ingestion_repo.get(id=id)
+            job_ingestion_repo.filter(id=id).update(
+                status=IngestionStatusChoices.RUNNING, started_at=timezone.now(),
+                finished_at=None, error="", modified_at=timezone.now())
+
+            def record_progress(counts: dict) -> None:
+                # modified_at tells fail_stale_job_ingestions the task is alive.
+                job_ingestion_repo.filter(id=id).update(modified_at=timezone.now(), **counts)
+
+            with job_ingestion.file.open("rb") as file:
+                result = self.job_posting_app_services.bulk_create_job_posting_from_file(
+                    file=file,
+                    file_name=job_ingestion.file_name,
+                    progress_callback=record_progress,
+                    upsert=job_ingestion.upsert,
+                )
+            job_ingestion_repo.filter(id=id).update(
+                status=IngestionStatusChoices.COMPLETED,
+                finished_at=timezone.now(),
+                modified_at=timezone.now(),
+                **result
+            )
+            job_ingestion.file.delete(save=False)
+        except Exception as e:
+            error = str(e) if isinstance(e, JobPostingException) else repr(e)
+            logger.error("Error while running Job Ingestion %s: %s", id, error)
+            job_ingestion_repo.filter(id=id).update(
+                status=IngestionStatusChoices.FAILED,
+                finished_at=timezone.now(),
+                modified_at=timezone.now(),
+                error=error
+            )
+        finally:
+            close_old_connections()
@@ -0,0 +1,142 @@
+import atexit
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from backend.application.user.hashing import password_hashing_service
+from backend.application.user.services import UserAppServices
+from backend.domain.user.models import User
+from backend.domain.user.services import UserServices
+from utils.django.exceptions import UserException
+
+logger = logging.getLogger("django")
+
+
+class LastLoginRecorder:
+    """
+    Collects last_login timestamps in memory and writes them in one batch, from a background
+    thread every USER_LAST_LOGIN_FLUSH_SECONDS or once USER_LAST_LOGIN_BATCH_SIZE users are
+    waiting, so a login never waits on that write.
+    Pending timestamps are flushed at a normal exit. They are only held in memory, so a
+    SIGKILL (or any exit that skips atexit) loses up to one interval of them.
+    """
+
+    def __init__(self):
+        self.user_services = UserServices()
+        self.lock = threading.Lock()
+        self.pending: Dict[uuid.UUID, datetime] = {}
+        self.wake_up = threading.Event()
+        self.thread = None
+        self.pid = None
+
+    def record(self, user_id: uuid.UUID, logged_in_at: datetime) -> None:
+        with self.lock:
+            self.pending[user_id] = logged_in_at
+            pending = len(self.pending)
+            if self.thread is None or self.pid != os.getpid():
+                self._start()
+        if pending >= settings.USER_LAST_LOGIN_BATCH_SIZE:
+            self.wake_up.set()
+
+    def _start(self) -> None:
+        # Threads don't survive a fork, every worker process starts its own.
+        self.pid = os.getpid()
+        self.thread = threading.Thread(
+            target=self._run, name="last-login-recorder", daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self.wake_up.wait(settings.USER_LAST_LOGIN_FLUSH_SECONDS)
+            self.wake_up.clear()
+            try:
+                close_old_connections()
+                self.flush()
+            except Exception as e:
+                logger.error("Error while recording last logins: %s", e)
+
+    def flush(self) -> int:
+        """
+        This method will write the pending last_login timestamps and return how many users
+        were updated.
+        """
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        if not pending:
+            return 0
+        collection = self.user_services.get_user_collection()
+        if collection is not None:
+            from pymongo import UpdateOne
+
+            connection = self.user_services.get_user_connection()
+            last_login_field = User._meta.get_field("last_login")
+            collection.bulk_write([
+                UpdateOne({"id": user_id}, {"$set": {
+                    last_login_field.column: last_login_field.get_db_prep_save(
+                        logged_in_at, connection=connection)}})
+                for user_id, logged_in_at in pending.items()
+            ], ordered=False)
+        else:
+            users = [User(id=user_id, last_login=logged_in_at)
+                     for user_id, logged_in_at in pending.items()]
+            self.user_services.get_user_repo().bulk_update(users, ["last_login"])
+        return len(pending)
+
+    def flush_at_exit(self) -> None:
+        """
+        This method will flush the pending timestamps at interpreter exit, logging rather
+        than raising when the database is already gone.
+        """
+        try:
+            flushed = self.flush()
+        except Exception as e:
+            logger.error("Error while recording last logins at exit: %s", e)
+            return
+        if flushed:
+            logger.info("%s last logins recorded at exit", flushed)
+
+
+last_login_recorder = LastLoginRecorder()
+atexit.register(last_login_recorder.flush_at_exit)
+
+
+class UserAuthAppServices:
+    """
+    Login in one read: the user is fetched once by email, the password is checked on that
+    instance and tokens are issued from it. last_login is recorded in the background.
+    Password checks run on the hashing pool; a hash made with an outdated hasher or work
+    factor is replaced on a successful login.
+    """
+
+    def __init__(self):
+        self.user_services = UserServices()
+        self.user_app_services = UserAppServices()
+
+    def login(self, email: str, password: str) -> dict:
+        """
+        This Method will return the user's tokens if email and password match an active user,
+        else raise UserException.
+        """
+        user = self.user_services.get_user_repo().filter(email=email).first()
+        if user is None:
+            # Hash anyway, so unknown emails take as long as wrong passwords.
+            password_hashing_service.make_password(password)
+            raise UserException("Invalid Credentials", "Email or Password is invalid")
+        is_correct, rehashed_password = password_hashing_service.check_password(
+            password, user.password)
+        if not is_correct or not user.is_active:
+            raise UserException("Invalid Credentials", "Email or Password is invalid")
+        if rehashed_password:
+            user.password = rehashed_password
+            user.save(update_fields=["password"])
+            logger.info("Password re-hashed for user %s", user.id)
+        user.last_login = timezone.now()
+        last_login_recorder.record(user.id, user.last_login)
+        return self.user_app_services.get_user_token(user=user)
@@ -0,0 +1,142 @@
+import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+from utils.django.exceptions import ServerBusyException
+
+logger = logging.getLogger("django")
+
+
+class PasswordHashingService:
+    """
+    Runs password hashing and verification on a bounded pool of PASSWORD_HASHING_WORKERS
+    threads instead of the request thread. Hashing releases the GIL, so the pool caps how many
+    cores auth work can take; at most PASSWORD_HASHING_QUEUE_SIZE more calls wait for a
+    worker, further calls wait up to PASSWORD_HASHING_TIMEOUT seconds and then raise
+    ServerBusyException.
+    Another pool reads its sizes from the settings named by workers_setting,
+    queue_size_setting and timeout_setting; without a timeout_setting calls wait for a worker.
+    Time spent per operation is kept in get_stats().
+    """
+
+    def __init__(self, workers_setting: str = "PASSWORD_HASHING_WORKERS",
+                 queue_size_setting: str = "PASSWORD_HASHING_QUEUE_SIZE",
+                 timeout_setting: Optional[str] = "PASSWORD_HASHING_TIMEOUT",
+                 thread_name_prefix: str = "password-hashing"):
+        self.workers_setting = workers_setting
+        self.queue_size_setting = queue_size_setting
+        self.timeout_setting = timeout_setting
+        self.thread_name_prefix = thread_name_prefix
+        self.lock = threading.Lock()
+        self.executor = None
+        self.slots = None
+        self.pid = None
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def workers(self) -> int:
+        return getattr(settings, self.workers_setting)
+
+    @property
+    def queue_size(self) -> int:
+        return getattr(settings, self.queue_size_setting)
+
+    @property
+    def timeout(self) -> Optional[float]:
+        return getattr(settings, self.timeout_setting) if self.timeout_setting else None
+
+    def _get_executor(self) -> Tuple[ThreadPoolExecutor, threading.BoundedSemaphore]:
+        with self.lock:
+            # Pool threads don't survive a fork, every worker process starts its own.
+            if self.executor is None or self.pid != os.getpid():
+                self.pid = os.getpid()
+                self.executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix=self.thread_name_prefix)
+                self.slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+            return self.executor, self.slots
+
+    def _record(self, operation: str, seconds: float) -> None:
+        with self.lock:
+            stats = self.stats.setdefault(
+                operation, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            stats["count"] += 1
+            stats["total_seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+
+    def _submit(self, operation: str, function: Callable, *args) -> Future:
+        executor, slots = self._get_executor()
+        if not slots.acquire(timeout=self.timeout):
+            logger.error("Password hashing queue is full")
+            raise ServerBusyException("Server busy", "Too many password operations, try again later",
+                                      retry_after=max(math.ceil(self.timeout or 1), 1))
+
+        def run():
+            started = time.perf_counter()
+            try:
+                return function(*args)
+            finally:
+                self._record(operation, time.perf_counter() - started)
+                slots.release()
+
+        try:
+            return executor.submit(run)
+        except Exception:
+            slots.release()
+            raise
+
+    def make_password(self, password: Optional[str]) -> str:
+        """
+        This method will return the password hashed with the preferred hasher.
+        """
+        return self._submit("hash", make_password, password).result()
+
+    def make_passwords(self, passwords: Iterable[Optional[str]]) -> List[str]:
+        """
+        This method will hash the passwords in parallel on the pool and return the hashes in
+        the same order.
+        """
+        futures = [self._submit("hash", make_password, password) for password in passwords]
+        return [future.result() for future in futures]
+
+    @staticmethod
+    def _check_password(password: str, encoded: str) -> Tuple[bool, Optional[str]]:
+        rehashed = []
+        is_correct = check_password(
+            password, encoded, setter=lambda raw_password: rehashed.append(make_password(raw_password)))
+        return is_correct, rehashed[0] if rehashed else None
+
+    def check_password(self, password: str, encoded: str) -> Tuple[bool, Optional[str]]:
+        """
+        This method will return whether the password matches the encoded hash and, when it
+        does but the hash was made with another hasher or work factor, a new hash to store.
+        """
+        return self._submit("verify", self._check_password, password, encoded).result()
+
+    def get_stats(self) -> dict:
+        """
+        This method will return the pool size and the count, total, mean and max seconds of
+        each operation in this process.
+        """
+        with self.lock:
+            operations = {
+                operation: {**values, "mean_seconds": values["total_seconds"] / values["count"]}
+                for operation, values in self.stats.items()
+            }
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "operations": operations,
+        }
+
+
+password_hashing_service = PasswordHashingService()
+# Bulk imports hash on their own pool, so they never hold the slots logins and signups wait for.
+user_import_hashing_service = PasswordHashingService(
+    "USER_IMPORT_HASHING_WORKERS", "USER_IMPORT_HASHING_QUEUE_SIZE", None, "user-import-hashing")
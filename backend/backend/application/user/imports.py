@@ -0,0 +1,23 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from django.conf import settings
+
+_import_executor = None
+_import_executor_lock = threading.Lock()
+
+
+def submit_user_import_task(task: Callable, *args, **kwargs) -> Future:
+    """
+    This method will queue a user import task on a bounded, lazily created worker pool.
+    """
+    global _import_executor
+    if _import_executor is None:
+        with _import_executor_lock:
+            if _import_executor is None:
+                _import_executor = ThreadPoolExecutor(
+                    max_workers=settings.USER_IMPORT_WORKERS,
+                    thread_name_prefix="user-import",
+                )
+    return _import_executor.submit(task, *args, **kwargs)
@@ -1,11 +1,19 @@
 import logging
-from typing import Union
+from datetime import timedelta
+from functools import partial
+from typing import Callable, List, Optional, Union
 
-from django.contrib.auth.hashers import make_password
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
 from django.db.models.query import QuerySet
+from django.utils import timezone
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from backend.domain.user.models import User
+from backend.application.user.hashing import (password_hashing_service,
+                                              user_import_hashing_service)
+from backend.application.user.imports import submit_user_import_task
+from backend.domain.user.models import (User, UserImport,
+                                        UserImportStatusChoices)
 from backend.domain.user.services import UserServices
 from utils.django.exceptions import InvalidUserException, UserException
 
@@ -48,6 +56,9 @@ class UserAppServices:
         """
         try:
             token = RefreshToken.for_user(user)
+            # Read by stateless authentication (JWT_AUTH_STATELESS) instead of loading the user.
+            token["is_staff"] = user.is_staff
+            token["is_superuser"] = user.is_superuser
             data = dict(
                 id=user.id,
                 email=user.email,
@@ -70,14 +81,13 @@ class UserAppServices:
         last_name = data.get("last_name", None)
         password = data.get("password", None)
         user_factory_method = self.user_services.get_user_factory()
-        if len(self.user_services.get_user_repo().filter(
-                email=email)) > 0:
+        if self.user_services.get_user_repo().filter(email=email).exists():
             raise UserException("Email already exists", "")
         user = user_factory_method.build_entity_with_id(
             email=email,
             first_name=first_name,
             last_name=last_name,
-            password=make_password(password)
+            password=password_hashing_service.make_password(password)
         )
         user.save()
         logger.info("User Created Successfully with Name: %s", user.first_name)
@@ -87,3 +97,161 @@ class UserAppServices:
             "email": user.email,
             "full_name": user.first_name + " " + user.last_name
         }
+
+    def bulk_create_users_from_dicts(
+        self, data: List[dict], skip_existing: bool = False, batch_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[dict], None]] = None, passwords_hashed: bool = False
+    ) -> dict:
+        """
+        This method will create Users from a list of dicts with one query for existing emails,
+        hashing each batch of passwords in parallel on the import hashing pool and inserting it
+        before hashing the next, so logins never wait behind an import.
+        Rows without a password get an unusable one. With passwords_hashed the passwords are
+        hashes already and are stored as they are. Existing emails raise UserException, or
+        are left out with skip_existing. progress_callback gets the counts after every batch.
+        Returns created/skipped counts and the skipped emails.
+        """
+        existing_emails = set(self.user_services.get_user_repo().filter(
+            email__in=[row["email"] for row in data]).values_list("email", flat=True))
+        if existing_emails and not skip_existing:
+            raise UserException("Email already exists", ", ".join(sorted(existing_emails)))
+        rows = [row for row in data if row["email"] not in existing_emails]
+
+        batch_size = batch_size or settings.USER_BULK_CREATE_BATCH_SIZE
+        user_factory_method = self.user_services.get_user_factory()
+        created = 0
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            if passwords_hashed:
+                passwords = [row["password"] for row in batch]
+            else:
+                passwords = user_import_hashing_service.make_passwords(
+                    row.get("password") for row in batch)
+            users = [
+                user_factory_method.build_entity_with_id(
+                    email=row["email"],
+                    first_name=row["first_name"],
+                    last_name=row["last_name"],
+                    password=password,
+                )
+                for row, password in zip(batch, passwords)
+            ]
+            try:
+                self.user_services.get_user_repo().bulk_create(users, batch_size=batch_size)
+            except IntegrityError as e:
+                # An email taken between the check and the insert.
+                logger.error("Error while creating Users: %s", e)
+                raise UserException("Email already exists", str(e))
+            created += len(users)
+            if progress_callback:
+                progress_callback({"users_created": created, "users_skipped": len(existing_emails)})
+        logger.info("%s Users Created Successfully", created)
+        return {
+            "created": created,
+            "skipped": len(existing_emails),
+            "skipped_emails": sorted(existing_emails),
+        }
+
+
+class UserImportAppServices:
+    """
+    User Import Application Services
+    """
+
+    def __init__(self):
+        self.user_services = UserServices()
+        self.user_app_services = UserAppServices()
+
+    def get_user_import_by_id(self, id: str) -> Union[UserImport, None]:
+        """
+        This method will return UserImport object if obtained by ID else return None.
+        """
+        self.fail_stale_user_imports()
+        try:
+            return self.user_services.get_user_import_repo().get(id=id)
+        except (UserImport.DoesNotExist, ValueError) as e:
+            logger.info("User Import not found by Id: %s", e)
+            return None
+
+    def fail_stale_user_imports(self) -> int:
+        """
+        This method will mark imports queued or running but not updated for
+        USER_IMPORT_STALE_SECONDS as failed: the password hashes only live in the memory of
+        the process that took the request, so an import outliving it can never finish. A task that
+        does start later marks its import running again.
+        """
+        stale = self.user_services.get_user_import_repo().filter(
+            status__in=[UserImportStatusChoices.QUEUED, UserImportStatusChoices.RUNNING],
+            modified_at__lt=timezone.now() - timedelta(seconds=settings.USER_IMPORT_STALE_SECONDS),
+        ).update(
+            status=UserImportStatusChoices.FAILED,
+            finished_at=timezone.now(),
+            modified_at=timezone.now(),
+            error="Import was interrupted, please upload it again.",
+        )
+        if stale:
+            logger.error("%s stale User Imports marked failed", stale)
+        return stale
+
+    def create_user_import(self, data: List[dict], skip_existing: bool = False) -> UserImport:
+        """
+        This Method will hash the passwords on the import hashing pool, store the import and
+        queue the inserts for background processing once the surrounding transaction commits,
+        so only hashes are held until they run. Existing emails raise UserException unless
+        skipped; their passwords are not hashed.
+        """
+        existing_emails = set(self.user_services.get_user_repo().filter(
+            email__in=[row["email"] for row in data]).values_list("email", flat=True))
+        if existing_emails and not skip_existing:
+            raise UserException("Email already exists", ", ".join(sorted(existing_emails)))
+        passwords = user_import_hashing_service.make_passwords(
+            None if row["email"] in existing_emails else row.get("password") for row in data)
+        rows = [{**row, "password": password} for row, password in zip(data, passwords)]
+        user_import = self.user_services.get_user_import_factory().build_entity_with_id(
+            users_total=len(rows), skip_existing=skip_existing)
+        user_import.save()
+        transaction.on_commit(partial(submit_user_import_task, self.run_user_import,
+                                      user_import.id, rows))
+        logger.info("User Import queued: %s", user_import.id)
+        return user_import
+
+    def run_user_import(self, id, data: List[dict]) -> None:
+        """
+        This Method runs on a worker thread and creates the Users of an import from rows with
+        hashed passwords, recording progress after every batch.
+        """
+        close_old_connections()
+        user_import_repo = self.user_services.get_user_import_repo()
+        try:
+            user_import = user_import_repo.get(id=id)
+            user_import_repo.filter(id=id).update(
+                status=UserImportStatusChoices.RUNNING, started_at=timezone.now(),
+                finished_at=None, error="", modified_at=timezone.now())
+
+            def record_progress(counts: dict) -> None:
+                user_import_repo.filter(id=id).update(modified_at=timezone.now(), **counts)
+
+            result = self.user_app_services.bulk_create_users_from_dicts(
+                data=data,
+                skip_existing=user_import.skip_existing,
+                progress_callback=record_progress,
+                passwords_hashed=True,
+            )
+            user_import_repo.filter(id=id).update(
+                status=UserImportStatusChoices.COMPLETED,
+                finished_at=timezone.now(),
+                modified_at=timezone.now(),
+                users_created=result["created"],
+                users_skipped=result["skipped"],
+            )
+        except Exception as e:
+            error = f"{e.item}: {e.message}" if isinstance(e, UserException) else repr(e)
+            logger.error("Error while running User Import %s: %s", id, error)
+            user_import_repo.filter(id=id).update(
+                status=UserImportStatusChoices.FAILED,
+                finished_at=timezone.now(),
+                modified_at=timezone.now(),
+                error=error
+            )
+        finally:
+            close_old_connections()
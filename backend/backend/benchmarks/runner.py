@@ -0,0 +1,140 @@
+import math
+import platform
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """
+    Timings of one benchmark. throughput is units (requests, rows, ...) per second and
+    peak_memory_mb the most memory one call of the operation allocated on top of what was
+    already allocated, so it does not depend on the benchmarks that ran before.
+    """
+    name: str
+    iterations: int
+    units: int
+    total_seconds: float
+    throughput: float
+    p50_ms: float
+    p99_ms: float
+    peak_memory_mb: Optional[float]
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def get_peak_memory_mb(operation: Callable[[], Any]) -> float:
+    """
+    This method will call operation once under tracemalloc and return, in MiB, the peak of
+    the memory it allocated. Only allocations made through Python's allocator are traced.
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        allocated = tracemalloc.get_traced_memory()[0]
+        operation()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return max(peak - allocated, 0) / (1024 * 1024)
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """
+    This method will return the nearest-rank percentile of values.
+    """
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def measure(
+    name: str,
+    operation: Callable[[], Any],
+    iterations: int,
+    warmup: int = 1,
+    units_per_iteration: int = 1,
+    setup: Optional[Callable[[], Any]] = None,
+    trace_memory: bool = True,
+) -> BenchmarkResult:
+    """
+    This method will call operation warmup times untimed, then iterations times timed, and
+    return the timings. setup runs before every call and is not timed. When trace_memory is
+    set, operation is called once more untimed to measure its peak memory, since tracing
+    slows every allocation down.
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        operation()
+    latencies = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        operation()
+        latencies.append(time.perf_counter() - started)
+    total_seconds = sum(latencies)
+    peak_memory_mb = None
+    if trace_memory:
+        if setup:
+            setup()
+        peak_memory_mb = round(get_peak_memory_mb(operation), 3)
+    units = iterations * units_per_iteration
+    return BenchmarkResult(
+        name=name,
+        iterations=iterations,
+        units=units,
+        total_seconds=round(total_seconds, 6),
+        throughput=round(units / total_seconds, 3) if total_seconds else 0.0,
+        p50_ms=round(percentile(latencies, 50) * 1000, 3),
+        p99_ms=round(percentile(latencies, 99) * 1000, 3),
+        peak_memory_mb=peak_memory_mb,
+    )
+
+
+def build_report(results: List[BenchmarkResult], **meta) -> dict:
+    """
+    This method will return results keyed by name, with the environment they ran in.
+    """
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            **meta,
+        },
+        "results": {result.name: result.as_dict() for result in results},
+    }
+
+
+def compare_to_baseline(report: dict, baseline: dict, tolerance: float) -> List[str]:
+    """
+    This method will return a line per regression against baseline: throughput down, or p99
+    latency or peak memory up, by more than tolerance (0.2 is 20%). Benchmarks missing from
+    either side are not compared.
+    """
+    regressions = []
+    baseline_results: Dict[str, dict] = baseline.get("results", {})
+    for name, result in report["results"].items():
+        base = baseline_results.get(name)
+        if base is None:
+            continue
+        if result["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {result['throughput']}/s, baseline {base['throughput']}/s")
+        if result["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p99 {result['p99_ms']}ms, baseline {base['p99_ms']}ms")
+        if result.get("peak_memory_mb") and base.get("peak_memory_mb") \
+                and result["peak_memory_mb"] > base["peak_memory_mb"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: peak memory {result['peak_memory_mb']:.1f}MiB, "
+                f"baseline {base['peak_memory_mb']:.1f}MiB")
+    return regressions
@@ -0,0 +1,186 @@
+import io
+import itertools
+import time
+from typing import List
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from openpyxl import Workbook
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from backend.application.job.cache import JobPostingCache
+from backend.application.job.ingestion import JOB_POSTING_COLUMN_MAPPING
+from backend.application.job.services import JobPostingAppServices
+from backend.benchmarks.runner import BenchmarkResult, measure
+from backend.domain.job.models import IngestionStatusChoices
+from backend.domain.job.services import JobPostingServices
+from backend.domain.user.services import UserServices
+
+TITLES = ["Software Engineer", "Data Scientist", "Product Manager", "Backend Developer",
+          "DevOps Engineer", "Sales Manager", "UX Designer", "Accountant"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries"]
+LOCATIONS = [("United States", "California", "San Francisco"),
+             ("United States", "New York", "New York"),
+             ("India", "Gujarat", "Ahmedabad"),
+             ("Germany", "Berlin", "Berlin"),
+             ("United Kingdom", "England", "London")]
+SENIORITIES = ["MidLevel", "EntryLevel", "TeamLead"]
+OFFICE_LOCATIONS = ["Hybrid", "InOffice", "WorkFromHome"]
+BENCHMARK_PASSWORD = "Benchmark-Password-1"
+SEED_URL_PREFIX = "https://jobs.example.com/"
+UPLOAD_URL_PREFIX = "https://uploads.example.com/"
+
+
+def synthetic_upload_row(index: int, url_prefix: str = SEED_URL_PREFIX) -> dict:
+    """
+    This method will return the index-th synthetic posting keyed by upload column, the same
+    for every run.
+    """
+    title = TITLES[index % len(TITLES)]
+    company = COMPANIES[index % len(COMPANIES)]
+    country, region, city = LOCATIONS[index % len(LOCATIONS)]
+    hourly = index % 5 == 0
+    return {
+        "job_name": f"{title} {index % 97}",
+        "company_name": company,
+        "job_full_text": f"{title} at {company}. " * 8,
+        "post_url": f"{url_prefix}{index}",
+        "post_apply_url": f"{url_prefix}{index}/apply",
+        "company_url": f"https://{company.lower().replace(' ', '')}.example.com",
+        "Company Industry": "Technology" if index % 3 else "Finance",
+        "Minimum Compensation": str(20 + index % 30 if hourly else 40000 + index % 50 * 1000),
+        "Maximum Compensation": str(60 + index % 30 if hourly else 90000 + index % 50 * 1000),
+        "Compensation Type": "hourly" if hourly else "annual",
+        "Job Hours": "40",
+        "Role Seniority": SENIORITIES[index % len(SENIORITIES)],
+        "Minimum Education": "Bachelors",
+        "Office Location": OFFICE_LOCATIONS[index % len(OFFICE_LOCATIONS)],
+        "post_html": f"<p>{title} at {company}</p>",
+        "city": city,
+        "region": region,
+        "country": country,
+    }
+
+
+def write_job_posting_excel(count: int, url_prefix: str = UPLOAD_URL_PREFIX) -> bytes:
+    """
+    This method will return an .xlsx upload of count synthetic postings.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    columns = list(JOB_POSTING_COLUMN_MAPPING)
+    sheet.append(columns)
+    for index in range(count):
+        row = synthetic_upload_row(index, url_prefix)
+        sheet.append([row[column] for column in columns])
+    file = io.BytesIO()
+    workbook.save(file)
+    return file.getvalue()
+
+
+def seed_job_postings(count: int) -> int:
+    """
+    This method will add synthetic postings until there are count of them and return how many
+    were added.
+    """
+    existing = JobPostingServices().get_job_posting_repo().count()
+    job_posting_app_services = JobPostingAppServices()
+    chunk_size = settings.JOB_INGEST_CHUNK_SIZE
+    for start in range(existing, count, chunk_size):
+        job_posting_app_services.bulk_create_job_posting_data([
+            {JOB_POSTING_COLUMN_MAPPING[column]: value
+             for column, value in synthetic_upload_row(index).items()}
+            for index in range(start, min(start + chunk_size, count))
+        ])
+    return max(count - existing, 0)
+
+
+class BenchmarkScenarios:
+    """
+    The API hot paths, called through Django's test client so middleware, authentication,
+    serialization and rendering are all part of the timings.
+    """
+
+    def __init__(self, iterations: int, auth_iterations: int):
+        self.iterations = iterations
+        self.auth_iterations = auth_iterations
+        self.client = APIClient()
+        self.email_counter = itertools.count()
+        self.user = UserServices().get_user_repo().create_user(
+            "Benchmark", "User", "benchmark@example.com", BENCHMARK_PASSWORD)
+        self.auth_client = APIClient()
+        self.auth_client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+
+    @staticmethod
+    def check(response, expected_status: int = 200):
+        if response.status_code != expected_status:
+            raise RuntimeError(
+                f"{response.request['PATH_INFO']} returned {response.status_code}: "
+                f"{response.content[:500]!r}")
+        return response
+
+    def job_posting_list(self, size: int) -> List[BenchmarkResult]:
+        """
+        First page and title search over size postings. The cache is invalidated before every
+        call, so the database is hit each time.
+        """
+        seed_job_postings(size)
+        url = reverse("jobs-list-of-job-posting")
+        cache = JobPostingCache()
+        return [
+            measure(f"posting_list[{size}]",
+                    lambda: self.check(self.client.get(url)),
+                    self.iterations, setup=cache.bump_generation),
+            measure(f"posting_search[{size}]",
+                    lambda: self.check(self.client.get(url, {"job_title": "enginer"})),
+                    self.iterations, setup=cache.bump_generation),
+        ]
+
+    def bulk_create(self, rows: int) -> BenchmarkResult:
+        """
+        Upload of a rows-row Excel file, timed until its ingestion finished; throughput is
+        rows per second.
+        """
+        content = write_job_posting_excel(rows)
+        url = reverse("jobs-bulk-job-posting")
+        job_posting_repo = JobPostingServices().get_job_posting_repo()
+        job_ingestion_repo = JobPostingServices().get_job_ingestion_repo()
+
+        def remove_uploaded():
+            job_posting_repo.filter(job_post_url__startswith=UPLOAD_URL_PREFIX).delete()
+
+        def upload():
+            response = self.check(self.auth_client.post(url, {
+                "file": SimpleUploadedFile("benchmark.xlsx", content),
+            }, format="multipart"))
+            ingestion_id = response.json()["data"]["ingestion_id"]
+            while True:
+                job_ingestion = job_ingestion_repo.get(id=ingestion_id)
+                if job_ingestion.status == IngestionStatusChoices.FAILED:
+                    raise RuntimeError(f"Ingestion failed: {job_ingestion.error}")
+                if job_ingestion.status == IngestionStatusChoices.COMPLETED:
+                    return
+                time.sleep(0.01)
+
+        # The previous upload is removed first, so every iteration inserts all its rows.
+        result = measure(f"bulk_create[{rows}]", upload, max(self.iterations // 10, 1),
+                         warmup=0, units_per_iteration=rows, setup=remove_uploaded)
+        remove_uploaded()
+        return result
+
+    def signup(self) -> BenchmarkResult:
+        url = reverse("users-signup")
+        return measure("signup", lambda: self.check(self.client.post(url, {
+            "email": f"benchmark{next(self.email_counter)}@example.com",
+            "first_name": "Benchmark",
+            "last_name": "User",
+            "password": BENCHMARK_PASSWORD,
+        })), self.auth_iterations)
+
+    def login(self) -> BenchmarkResult:
+        url = reverse("users-login")
+        return measure("login", lambda: self.check(self.client.post(url, {
+            "email": self.user.email, "password": BENCHMARK_PASSWORD,
+        })), self.auth_iterations)
@@ -0,0 +1,38 @@
+"""
+Settings for manage.py benchmark: backend.settings on a throwaway database, so benchmarks
+never touch real data. SQLite by default, which needs nothing else running; set
+BENCHMARK_MONGO_HOST to run against a local mongod instead.
+"""
+import os
+import tempfile
+
+from backend.settings import *  # noqa: F401,F403
+from backend.settings import ALLOWED_HOSTS, MONGO_CLIENT_OPTIONS, config
+
+# manage.py benchmark refuses to run without this.
+BENCHMARK = True
+
+BENCHMARK_MONGO_HOST = config("BENCHMARK_MONGO_HOST", default="")
+if BENCHMARK_MONGO_HOST:
+    DATABASES = {
+        "default": {
+            "ENGINE": "utils.mongo.backend",
+            "CLIENT": {
+                "name": config("BENCHMARK_DATABASE_NAME", default="backend_benchmark"),
+                "host": BENCHMARK_MONGO_HOST,
+                **MONGO_CLIENT_OPTIONS,
+            },
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": config("BENCHMARK_DATABASE_NAME", default=os.path.join(
+                tempfile.gettempdir(), "backend_benchmark.sqlite3")),
+        }
+    }
+
+MEDIA_ROOT = os.path.join(tempfile.gettempdir(), "backend_benchmark_media")
+# Requests are made with Django's test client.
+ALLOWED_HOSTS = [*ALLOWED_HOSTS, "testserver"]
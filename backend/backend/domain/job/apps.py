@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class JobConfig(AppConfig):
+    name = "backend.domain.job"
+
+    def ready(self):
+        """
+        This method will start building the job search index with JOB_SEARCH_START_ON_READY,
+        so the first search of a worker does not wait for it.
+        """
+        if settings.JOB_SEARCH_START_ON_READY:
+            from backend.application.job.search import \
+                get_job_posting_search_backend
+
+            get_job_posting_search_backend().start()
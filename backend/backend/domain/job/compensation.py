@@ -0,0 +1,55 @@
+import math
+import re
+from typing import Union
+
+WEEKS_PER_YEAR = 52
+FULL_TIME_HOURS_PER_WEEK = 40
+PART_TIME_HOURS_PER_WEEK = 20
+
+NUMBER_REGEX = re.compile(r"\d+(?:\.\d+)?")
+
+
+def parse_compensation(value) -> Union[float, None]:
+    """
+    This method will turn an uploaded compensation value ("85000", "$85,000", "85k", 42.5)
+    into a number, or None when it can't be read.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return None if math.isnan(value) else float(value)
+    text = str(value).strip().lower().replace(",", "")
+    match = NUMBER_REGEX.search(text)
+    if not match:
+        return None
+    amount = float(match.group())
+    if text[match.end():].strip().startswith("k"):
+        amount *= 1000
+    return amount
+
+
+def parse_weekly_hours(job_hours) -> float:
+    """
+    This method will read weekly hours from job_hours ("40", "37.5 hours", "Part Time"),
+    assuming full time when it can't be read.
+    """
+    text = str(job_hours or "").lower()
+    match = NUMBER_REGEX.search(text)
+    if match and 0 < float(match.group()) <= 80:
+        return float(match.group())
+    if "part" in text:
+        return PART_TIME_HOURS_PER_WEEK
+    return FULL_TIME_HOURS_PER_WEEK
+
+
+def annualize_compensation(value, type_of_compensation: str, job_hours) -> Union[float, None]:
+    """
+    This method will return the yearly amount for a compensation value, converting hourly rates
+    with the posting's weekly hours.
+    """
+    amount = parse_compensation(value)
+    if amount is None:
+        return None
+    if str(type_of_compensation).lower() == "hourly":
+        amount = amount * parse_weekly_hours(job_hours) * WEEKS_PER_YEAR
+    return round(amount, 2)
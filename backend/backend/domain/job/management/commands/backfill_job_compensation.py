@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+
+from backend.application.job.cache import JobPostingCache
+from backend.domain.job.services import JobPostingServices
+
+
+class Command(BaseCommand):
+    help = "Fills min/max_annual_compensation of existing Job Postings from their raw compensation fields."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all", action="store_true",
+            help="Recompute every Job Posting, not only the ones missing annual values.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = JobPostingServices.get_job_posting_repo().only(
+            "id", "min_compensation", "max_compensation", "type_of_compensation", "job_hours")
+        if not options["all"]:
+            queryset = queryset.filter(min_annual_compensation__isnull=True)
+
+        updated = 0
+        batch = []
+        for job_posting in queryset.iterator(chunk_size=batch_size):
+            job_posting.set_annual_compensation()
+            batch.append(job_posting)
+            if len(batch) >= batch_size:
+                updated += self.write_batch(batch)
+                batch = []
+        if batch:
+            updated += self.write_batch(batch)
+        if updated:
+            # Cached listings and their ETags would otherwise keep the old values.
+            JobPostingCache().bump_generation()
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {updated} Job Postings."))
+
+    def write_batch(self, batch: list) -> int:
+        collection = JobPostingServices.get_job_posting_collection()
+        if collection is None:
+            return JobPostingServices.get_job_posting_repo().bulk_update(
+                batch, ["min_annual_compensation", "max_annual_compensation"])
+
+        # djongo can't translate the CASE WHEN statement bulk_update generates.
+        from pymongo import UpdateOne
+
+        result = collection.bulk_write([
+            UpdateOne({"id": job_posting.id}, {"$set": {
+                "min_annual_compensation": job_posting.min_annual_compensation,
+                "max_annual_compensation": job_posting.max_annual_compensation,
+            }}) for job_posting in batch
+        ], ordered=False)
+        return result.matched_count
@@ -0,0 +1,90 @@
+import json
+import logging
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from backend.benchmarks.runner import build_report, compare_to_baseline
+from backend.benchmarks.scenarios import BenchmarkScenarios
+
+SCENARIOS = ["list", "bulk_create", "signup", "login"]
+
+
+def int_list(value: str) -> list:
+    return [int(item) for item in value.split(",") if item]
+
+
+class Command(BaseCommand):
+    help = ("Benchmarks posting/list and title search, bulk/create, signup and login on a "
+            "throwaway database and records throughput, p50/p99 latency and peak RSS. "
+            "Run with --settings=backend.benchmarks.settings.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                            help=f"Comma separated, from {', '.join(SCENARIOS)}.")
+        parser.add_argument("--sizes", type=int_list, default=[10000, 100000, 1000000],
+                            help="Postings in the database for the list/search benchmarks.")
+        parser.add_argument("--excel-rows", type=int_list, default=[1000, 10000],
+                            help="Rows of the uploaded files for the bulk_create benchmarks.")
+        parser.add_argument("--iterations", type=int, default=50,
+                            help="Requests per list/search benchmark; bulk_create does a tenth.")
+        parser.add_argument("--auth-iterations", type=int, default=20,
+                            help="Requests per signup/login benchmark.")
+        parser.add_argument("--output", "-o", help="Write the results as JSON to this file.")
+        parser.add_argument("--baseline", help="Fail when results regress against this file.")
+        parser.add_argument("--tolerance", type=float, default=0.25,
+                            help="Allowed regression against the baseline (0.25 is 25%%).")
+
+    def handle(self, *args, **options):
+        if not getattr(settings, "BENCHMARK", False):
+            raise CommandError(
+                "Benchmarks reset the database, run with --settings=backend.benchmarks.settings.")
+        scenarios = options["scenarios"].split(",")
+        unknown_scenarios = set(scenarios) - set(SCENARIOS)
+        if unknown_scenarios:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown_scenarios))}")
+
+        # The user app has no migrations.
+        call_command("migrate", run_syncdb=True, verbosity=0)
+        call_command("flush", interactive=False, verbosity=0)
+        # Request logging would be measured along with the requests.
+        logging.getLogger("django").setLevel(logging.WARNING)
+        logging.getLogger("django.request").setLevel(logging.ERROR)
+
+        runner = BenchmarkScenarios(options["iterations"], options["auth_iterations"])
+        results = []
+        try:
+            if "signup" in scenarios:
+                results.append(runner.signup())
+            if "login" in scenarios:
+                results.append(runner.login())
+            if "list" in scenarios:
+                for size in sorted(options["sizes"]):
+                    self.stderr.write(f"Seeding {size} postings...")
+                    results.extend(runner.job_posting_list(size))
+            if "bulk_create" in scenarios:
+                for rows in options["excel_rows"]:
+                    results.append(runner.bulk_create(rows))
+        except RuntimeError as e:
+            raise CommandError(f"Benchmark failed: {e}")
+
+        for result in results:
+            self.stderr.write(
+                f"{result.name:<28} {result.throughput:>12.1f}/s  p50 {result.p50_ms:>9.2f}ms  "
+                f"p99 {result.p99_ms:>9.2f}ms  peak mem {result.peak_memory_mb or 0:>7.1f}MiB")
+        report = build_report(results, database=connection.vendor)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(report, file, indent=2)
+        else:
+            self.stdout.write(json.dumps(report, indent=2))
+
+        if options["baseline"]:
+            with open(options["baseline"]) as file:
+                baseline = json.load(file)
+            regressions = compare_to_baseline(report, baseline, options["tolerance"])
+            if regressions:
+                raise CommandError("Regressions against baseline:\n" + "\n".join(regressions))
+            self.stderr.write(self.style.SUCCESS("No regressions against baseline."))
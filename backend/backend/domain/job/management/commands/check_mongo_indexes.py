@@ -0,0 +1,41 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router
+
+from utils.mongo.indexes import index_drift
+
+
+class Command(BaseCommand):
+    help = "Compares the indexes declared on models with the live MongoDB indexes and reports drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models", nargs="*", default=["job.JobPosting"],
+            help="Models to check as app_label.ModelName (default: job.JobPosting).")
+
+    def handle(self, *args, **options):
+        drift_found = False
+        for label in options["models"]:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as e:
+                raise CommandError(f"Unknown model {label}: {e}")
+            connection = connections[router.db_for_read(model)]
+            if connection.vendor != "djongo":
+                raise CommandError(
+                    f"{label} is not stored in MongoDB (database vendor: {connection.vendor}).")
+            connection.ensure_connection()
+            collection = connection.connection[model._meta.db_table]
+            drift = index_drift(model, collection)
+
+            if not (drift["missing"] or drift["unexpected"]):
+                self.stdout.write(self.style.SUCCESS(f"{label}: indexes match."))
+                continue
+            drift_found = True
+            for key, name in drift["missing"]:
+                self.stdout.write(self.style.ERROR(f"{label}: missing index {name} {list(key)}"))
+            for key, name in drift["unexpected"]:
+                self.stdout.write(self.style.WARNING(
+                    f"{label}: undeclared index {name} {list(key)}"))
+        if drift_found:
+            raise CommandError("Index drift found, run migrations or update Meta.indexes.")
@@ -0,0 +1,49 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from backend.application.job.export import EXPORT_FORMATS, JobPostingExporter
+from utils.django.exceptions import JobPostingException
+
+
+class Command(BaseCommand):
+    help = "Exports Job Postings as NDJSON, CSV or Parquet, streamed from a database cursor."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="ndjson")
+        parser.add_argument("--gzip", action="store_true",
+                            help="Gzip NDJSON/CSV; Parquet uses gzip page compression.")
+        parser.add_argument("--modified-since",
+                            help="Only postings modified at or after this ISO 8601 datetime.")
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--output", "-o", default="-",
+                            help="File to write (default: stdout).")
+
+    def handle(self, *args, **options):
+        modified_since = None
+        if options["modified_since"]:
+            modified_since = parse_datetime(options["modified_since"])
+            if modified_since is None:
+                raise CommandError(f"Invalid --modified-since: {options['modified_since']}")
+        try:
+            exporter = JobPostingExporter(
+                export_format=options["format"],
+                compress=options["gzip"],
+                modified_since=modified_since,
+                batch_size=options["batch_size"],
+            )
+        except JobPostingException as e:
+            raise CommandError(str(e))
+
+        output = sys.stdout.buffer if options["output"] == "-" else open(options["output"], "wb")
+        written = 0
+        try:
+            for chunk in exporter.stream():
+                output.write(chunk)
+                written += len(chunk)
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+        if options["output"] != "-":
+            self.stdout.write(f"Wrote {written} bytes to {options['output']}")
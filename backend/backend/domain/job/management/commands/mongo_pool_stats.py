@@ -0,0 +1,17 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from pymongo.errors import PyMongoError
+
+from utils.mongo.connection import get_mongo_client, get_pool_stats
+
+
+class Command(BaseCommand):
+    help = "Pings MongoDB through the shared client and prints its pool settings and counters."
+
+    def handle(self, *args, **options):
+        try:
+            get_mongo_client().admin.command("ping")
+        except PyMongoError as e:
+            raise CommandError(f"MongoDB is not reachable: {e}")
+        self.stdout.write(json.dumps(get_pool_stats(), indent=2, sort_keys=True))
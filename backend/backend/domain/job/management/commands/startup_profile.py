@@ -0,0 +1,101 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in a fresh interpreter, so nothing is imported yet; prints the phase timings as JSON.
+STARTUP_SCRIPT = """
+import importlib, json, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+setup_done = time.perf_counter()
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+print(json.dumps({"setup_ms": (setup_done - started) * 1000,
+                  "imports_ms": (time.perf_counter() - setup_done) * 1000,
+                  "modules": len(sys.modules)}))
+"""
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$")
+
+
+def parse_import_times(output: str) -> list:
+    """
+    This method will return (module, self us, cumulative us, depth) for every line of
+    python -X importtime output.
+    """
+    modules = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            modules.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return modules
+
+
+class Command(BaseCommand):
+    help = ("Starts Django in a fresh interpreter with python -X importtime and reports the "
+            "import time of every module, to find what slows down worker boot.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--modules", default=settings.ROOT_URLCONF,
+                            help="Comma separated modules imported after django.setup(), as "
+                                 "a worker does; defaults to the url conf.")
+        parser.add_argument("--top", type=int, default=25, help="Modules to list.")
+        parser.add_argument("--sort", choices=["cumulative", "self"], default="cumulative",
+                            help="Sort by time including or excluding nested imports.")
+        parser.add_argument("--json", action="store_true", help="Write the report as JSON.")
+
+    def handle(self, *args, **options):
+        modules = [module for module in options["modules"].split(",") if module]
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+            "PYTHONPATH": os.pathsep.join(filter(None, [str(settings.BASE_DIR),
+                                                        os.environ.get("PYTHONPATH")])),
+        }
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT, *modules],
+            env=env, capture_output=True, text=True)
+        if process.returncode != 0:
+            raise CommandError(f"Startup failed:\n{process.stderr[-2000:]}")
+        timings = json.loads(process.stdout.strip().splitlines()[-1])
+        import_times = parse_import_times(process.stderr)
+
+        sort_index = 2 if options["sort"] == "cumulative" else 1
+        slowest = sorted(import_times, key=lambda item: item[sort_index], reverse=True)
+        packages = defaultdict(int)
+        for module, self_us, _, _ in import_times:
+            packages[module.split(".")[0]] += self_us
+        report = {
+            **{key: round(value, 1) if isinstance(value, float) else value
+               for key, value in timings.items()},
+            "modules_ms": [
+                {"module": module, "self_ms": self_us / 1000, "cumulative_ms": cumulative_us / 1000,
+                 "depth": depth}
+                for module, self_us, cumulative_us, depth in slowest[:options["top"]]
+            ],
+            "packages_ms": {
+                package: self_us / 1000 for package, self_us in
+                sorted(packages.items(), key=lambda item: item[1], reverse=True)[:options["top"]]
+            },
+        }
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(
+            f"django.setup() {report['setup_ms']:.1f}ms, {', '.join(modules) or 'no modules'} "
+            f"{report['imports_ms']:.1f}ms, {report['modules']} modules loaded\n")
+        self.stdout.write(f"{'cumulative':>12} {'self':>10}  module")
+        for item in report["modules_ms"]:
+            self.stdout.write(f"{item['cumulative_ms']:>10.1f}ms {item['self_ms']:>8.1f}ms  "
+                              f"{'  ' * item['depth']}{item['module']}")
+        self.stdout.write(f"\n{'self':>12}  package")
+        for package, self_ms in report["packages_ms"].items():
+            self.stdout.write(f"{self_ms:>10.1f}ms  {package}")
@@ -0,0 +1,31 @@
+# Generated by Django 4.1.13 on 2026-10-18 11:57
+
+from django.db import migrations, models
+
+from utils.mongo.indexes import AddMongoIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0002_jobingestion'),
+    ]
+
+    operations = [
+        AddMongoIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['-created_at', '-id'], name='jobposting_created_at_idx'),
+        ),
+        AddMongoIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['job_title'], name='jobposting_job_title_idx'),
+        ),
+        AddMongoIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['country', 'region', 'city'], name='jobposting_location_idx'),
+        ),
+        AddMongoIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['role_seniority', 'office_location', '-created_at'], name='jobposting_seniority_idx'),
+        ),
+    ]
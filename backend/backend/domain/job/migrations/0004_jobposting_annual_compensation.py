@@ -0,0 +1,33 @@
+# Generated by Django 4.1.13 on 2026-10-18 11:58
+
+from django.db import migrations, models
+
+from utils.mongo.indexes import AddMongoIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0003_jobposting_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='max_annual_compensation',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='min_annual_compensation',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        AddMongoIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['min_annual_compensation'], name='jobposting_min_salary_idx'),
+        ),
+        AddMongoIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['max_annual_compensation'], name='jobposting_max_salary_idx'),
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 4.1.13 on 2026-10-18 12:01
+
+import hashlib
+import json
+
+from django.db import migrations, models
+from pymongo import UpdateOne
+
+from utils.mongo.indexes import AddMongoIndex
+
+UPDATE_BATCH_SIZE = 1000
+# JobPosting.SOURCE_FIELDS as of this migration.
+SOURCE_FIELDS = [
+    "job_title", "company_name", "job_description", "job_post_url", "job_apply_url",
+    "company_url", "company_industry", "min_compensation", "max_compensation",
+    "type_of_compensation", "job_hours", "role_seniority", "min_education",
+    "office_location", "post_html", "city", "region", "country",
+]
+
+
+def backfill_content_hash(apps, schema_editor):
+    """
+    Hashes the Job Postings stored before content_hash existed, the way
+    JobPosting.set_content_hash does, so the first upsert does not rewrite them all.
+    """
+    JobPosting = apps.get_model("job", "JobPosting")
+    connection = schema_editor.connection
+    job_postings = JobPosting.objects.only("id", *SOURCE_FIELDS).iterator(
+        chunk_size=UPDATE_BATCH_SIZE)
+    batch = []
+    for job_posting in job_postings:
+        values = [str(getattr(job_posting, field)) for field in SOURCE_FIELDS]
+        job_posting.content_hash = hashlib.sha256(
+            json.dumps(values, ensure_ascii=False).encode()).hexdigest()
+        batch.append(job_posting)
+        if len(batch) >= UPDATE_BATCH_SIZE:
+            save_content_hashes(JobPosting, connection, batch)
+            batch = []
+    if batch:
+        save_content_hashes(JobPosting, connection, batch)
+
+
+def save_content_hashes(JobPosting, connection, job_postings) -> None:
+    if connection.vendor == "djongo":
+        connection.ensure_connection()
+        connection.connection[JobPosting._meta.db_table].bulk_write([
+            UpdateOne({"id": job_posting.id}, {"$set": {"content_hash": job_posting.content_hash}})
+            for job_posting in job_postings
+        ], ordered=False)
+    else:
+        JobPosting.objects.bulk_update(job_postings, ["content_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0004_jobposting_annual_compensation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobingestion',
+            name='rows_inserted',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='jobingestion',
+            name='rows_unchanged',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='jobingestion',
+            name='rows_updated',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='jobingestion',
+            name='upsert',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.RunPython(backfill_content_hash, migrations.RunPython.noop),
+        AddMongoIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['job_post_url'], name='jobposting_post_url_idx'),
+        ),
+    ]
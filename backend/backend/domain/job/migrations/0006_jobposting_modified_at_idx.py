@@ -0,0 +1,19 @@
+# Generated by Django 4.1.13 on 2026-10-18 12:10
+
+from django.db import migrations, models
+
+from utils.mongo.indexes import AddMongoIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0005_jobposting_upsert'),
+    ]
+
+    operations = [
+        AddMongoIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['modified_at'], name='jobposting_modified_at_idx'),
+        ),
+    ]
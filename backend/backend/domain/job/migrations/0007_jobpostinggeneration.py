@@ -0,0 +1,21 @@
+# Generated by Django 4.1.13 on 2026-10-18 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0006_jobposting_modified_at_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobPostingGeneration',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('generation', models.BigIntegerField()),
+                ('last_modified', models.FloatField()),
+            ],
+        ),
+    ]
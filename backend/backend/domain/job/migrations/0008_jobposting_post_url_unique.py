@@ -0,0 +1,66 @@
+# Generated by Django 4.1.13 on 2026-10-18 14:20
+
+import logging
+
+from django.db import migrations, models
+
+from utils.mongo.indexes import AddMongoUniqueConstraint, RemoveMongoIndex
+
+logger = logging.getLogger("django")
+
+DELETE_BATCH_SIZE = 1000
+
+
+def remove_duplicate_job_postings(apps, schema_editor):
+    """
+    Keeps the most recently modified Job Posting of every job_post_url and deletes the others,
+    so the unique constraint can be built.
+    """
+    JobPosting = apps.get_model("job", "JobPosting")
+    connection = schema_editor.connection
+    removed = 0
+    if connection.vendor == "djongo":
+        connection.ensure_connection()
+        collection = connection.connection[JobPosting._meta.db_table]
+        duplicates = collection.aggregate([
+            {"$group": {"_id": "$job_post_url", "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}},
+        ], allowDiskUse=True)
+        for duplicate in duplicates:
+            stale_ids = [document["_id"] for document in collection.find(
+                {"job_post_url": duplicate["_id"]}, {"_id": 1}
+            ).sort([("modified_at", -1), ("created_at", -1)]).skip(1)]
+            removed += collection.delete_many({"_id": {"$in": stale_ids}}).deleted_count
+    else:
+        job_post_urls = set()
+        stale_ids = []
+        for id, job_post_url in JobPosting.objects.order_by(
+                "job_post_url", "-modified_at", "-created_at").values_list(
+                "id", "job_post_url").iterator():
+            if job_post_url in job_post_urls:
+                stale_ids.append(id)
+            job_post_urls.add(job_post_url)
+        for start in range(0, len(stale_ids), DELETE_BATCH_SIZE):
+            removed += JobPosting.objects.filter(
+                id__in=stale_ids[start:start + DELETE_BATCH_SIZE]).delete()[0]
+    if removed:
+        logger.info("Removed %s Job Postings repeating a job_post_url", removed)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0007_jobpostinggeneration'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_job_postings, migrations.RunPython.noop),
+        RemoveMongoIndex(
+            model_name='jobposting',
+            name='jobposting_post_url_idx',
+        ),
+        AddMongoUniqueConstraint(
+            model_name='jobposting',
+            constraint=models.UniqueConstraint(fields=('job_post_url',), name='jobposting_post_url_uniq'),
+        ),
+    ]
@@ -1,9 +1,14 @@
+import hashlib
+import json
 import logging
 import uuid
 from dataclasses import dataclass
+from typing import Union
 
 from django.db import models
+from django.utils import timezone
 
+from backend.domain.job.compensation import annualize_compensation
 from utils.django.custom_models import ActivityTracking
 
 # logging setup
@@ -20,6 +25,15 @@ class JobID:
     value: uuid.UUID
 
 
+@dataclass(frozen=True)
+class JobIngestionID:
+    """
+    This will create UUID that will pass in JobIngestionFactory Method
+
+    """
+    value: uuid.UUID
+
+
 # ---------
 # Job Posting Model
 # ---------
@@ -67,6 +81,9 @@ class JobPosting(ActivityTracking):
         max_length=10, blank=False, null=False)
     max_compensation = models.CharField(
         max_length=10, blank=False, null=False)
+    # Yearly amounts derived from min/max_compensation, type_of_compensation and job_hours.
+    min_annual_compensation = models.FloatField(null=True, blank=True)
+    max_annual_compensation = models.FloatField(null=True, blank=True)
     type_of_compensation = models.CharField(choices=CompensationChoices.choices,
                                             max_length=6, blank=False, null=False)
     job_hours = models.CharField(max_length=10, blank=False, null=False)
@@ -79,11 +96,142 @@ class JobPosting(ActivityTracking):
     city = models.CharField(max_length=100, blank=False, null=False)
     region = models.CharField(max_length=100, blank=False, null=False)
     country = models.CharField(max_length=100, blank=False, null=False)
+    # Hash of the uploaded fields, used to skip unchanged rows on upsert.
+    content_hash = models.CharField(max_length=64, blank=True, default="")
+
+    # Uploaded fields, in the order they are hashed.
+    SOURCE_FIELDS = [
+        "job_title", "company_name", "job_description", "job_post_url", "job_apply_url",
+        "company_url", "company_industry", "min_compensation", "max_compensation",
+        "type_of_compensation", "job_hours", "role_seniority", "min_education",
+        "office_location", "post_html", "city", "region", "country",
+    ]
+
+    class Meta:
+        indexes = [
+            # Listing order and keyset pagination cursor.
+            models.Index(fields=["-created_at", "-id"],
+                         name="jobposting_created_at_idx"),
+            models.Index(fields=["job_title"], name="jobposting_job_title_idx"),
+            # Incremental exports (modified_since).
+            models.Index(fields=["modified_at"], name="jobposting_modified_at_idx"),
+            models.Index(fields=["country", "region", "city"],
+                         name="jobposting_location_idx"),
+            models.Index(fields=["role_seniority", "office_location", "-created_at"],
+                         name="jobposting_seniority_idx"),
+            models.Index(fields=["min_annual_compensation"],
+                         name="jobposting_min_salary_idx"),
+            models.Index(fields=["max_annual_compensation"],
+                         name="jobposting_max_salary_idx"),
+        ]
+        constraints = [
+            # Upserts are keyed by job_post_url.
+            models.UniqueConstraint(fields=["job_post_url"], name="jobposting_post_url_uniq"),
+        ]
+
+    def set_annual_compensation(self) -> None:
+        """
+        This method will derive min/max_annual_compensation from the raw compensation fields.
+        """
+        self.min_annual_compensation = annualize_compensation(
+            self.min_compensation, self.type_of_compensation, self.job_hours)
+        self.max_annual_compensation = annualize_compensation(
+            self.max_compensation, self.type_of_compensation, self.job_hours)
+
+    def set_content_hash(self) -> None:
+        """
+        This method will hash the uploaded fields, so a re-uploaded identical row can be detected.
+        """
+        values = [str(getattr(self, field)) for field in self.SOURCE_FIELDS]
+        self.content_hash = hashlib.sha256(
+            json.dumps(values, ensure_ascii=False).encode()).hexdigest()
 
     def __str__(self) -> str:
         return self.company_name
 
 
+class JobPostingGeneration(models.Model):
+    """
+    Counter bumped on every Job Posting write, shared by every process through the database.
+    Cache keys and listing ETags are built from it.
+    """
+
+    name = models.CharField(primary_key=True, max_length=50)
+    generation = models.BigIntegerField()
+    # Unix timestamp of the last bump.
+    last_modified = models.FloatField()
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.generation})"
+
+
+# ---------
+# Job Ingestion Model
+# ---------
+class IngestionStatusChoices(models.TextChoices):
+    """
+    Choices for Ingestion Status
+    """
+    QUEUED = "queued", "Queued"
+    RUNNING = "running", "Running"
+    COMPLETED = "completed", "Completed"
+    FAILED = "failed", "Failed"
+
+
+class JobIngestion(ActivityTracking):
+    """
+    Job Ingestion class tracks a bulk Job Posting upload processed in the background.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    file = models.FileField(upload_to="job_ingestions/", blank=True)
+    file_name = models.CharField(max_length=255, blank=False, null=False)
+    status = models.CharField(choices=IngestionStatusChoices.choices,
+                              default=IngestionStatusChoices.QUEUED, max_length=10)
+    rows_total = models.PositiveIntegerField(null=True, blank=True)
+    rows_processed = models.PositiveIntegerField(default=0)
+    rows_failed = models.PositiveIntegerField(default=0)
+    upsert = models.BooleanField(default=False)
+    rows_inserted = models.PositiveIntegerField(default=0)
+    rows_updated = models.PositiveIntegerField(default=0)
+    rows_unchanged = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"{self.file_name} ({self.status})"
+
+    @property
+    def elapsed_seconds(self) -> Union[float, None]:
+        if not self.started_at:
+            return None
+        return ((self.finished_at or timezone.now()) - self.started_at).total_seconds()
+
+    @property
+    def throughput(self) -> Union[float, None]:
+        """
+        Rows handled per second since the ingestion started.
+        """
+        elapsed = self.elapsed_seconds
+        if not elapsed:
+            return None
+        return round((self.rows_processed + self.rows_failed) / elapsed, 2)
+
+    @property
+    def eta_seconds(self) -> Union[float, None]:
+        """
+        Estimated seconds left, based on current throughput and the estimated row total.
+        """
+        if self.status == IngestionStatusChoices.COMPLETED:
+            return 0.0
+        throughput = self.throughput
+        if not throughput or self.rows_total is None:
+            return None
+        rows_left = max(self.rows_total - self.rows_processed - self.rows_failed, 0)
+        return round(rows_left / throughput, 2)
+
+
 class JobFactory:
     """
     This Method is used for building instance of Job
@@ -110,7 +258,7 @@ class JobFactory:
         region: str,
         country: str,
     ) -> JobPosting:
-        return JobPosting(
+        job_posting = JobPosting(
             id=id.value,
             job_title=job_title,
             company_name=company_name,
@@ -131,6 +279,9 @@ class JobFactory:
             region=region,
             country=country
         )
+        job_posting.set_annual_compensation()
+        job_posting.set_content_hash()
+        return job_posting
 
     @classmethod
     def build_entity_with_id(
@@ -176,3 +327,17 @@ class JobFactory:
             region=region,
             country=country
         )
+
+
+class JobIngestionFactory:
+    """
+    This Method is used for building instance of Job Ingestion
+    """
+    @staticmethod
+    def build_entity(id: JobIngestionID, file, file_name: str, upsert: bool = False) -> JobIngestion:
+        return JobIngestion(id=id.value, file=file, file_name=file_name, upsert=upsert)
+
+    @classmethod
+    def build_entity_with_id(cls, file, file_name: str, upsert: bool = False) -> JobIngestion:
+        entity_id = JobIngestionID(uuid.uuid4())
+        return cls.build_entity(id=entity_id, file=file, file_name=file_name, upsert=upsert)
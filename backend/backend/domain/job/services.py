@@ -1,8 +1,14 @@
-from typing import Type
+from typing import TYPE_CHECKING, Type, Union
 
+from django.db import connections, router
+from django.db.backends.base.base import BaseDatabaseWrapper
 from django.db.models.manager import BaseManager
 
-from .models import JobFactory, JobPosting
+from .models import (JobFactory, JobIngestion, JobIngestionFactory, JobPosting,
+                     JobPostingGeneration)
+
+if TYPE_CHECKING:
+    from pymongo.collection import Collection
 
 
 class JobPostingServices:
@@ -19,3 +25,55 @@ class JobPostingServices:
         This method will return database manager for the Job Posting model.
         """
         return JobPosting.objects
+
+    @staticmethod
+    def get_job_posting_connection() -> BaseDatabaseWrapper:
+        """
+        This method will return the Django database connection Job Postings are stored in.
+        """
+        return connections[router.db_for_write(JobPosting)]
+
+    @classmethod
+    def get_job_posting_collection(cls) -> Union["Collection", None]:
+        """
+        This method will return the pymongo collection behind the Job Posting model, through the
+        djongo connection, or None when Job Postings are not stored in MongoDB.
+        """
+        connection = cls.get_job_posting_connection()
+        if connection.vendor != "djongo":
+            return None
+        connection.ensure_connection()
+        return connection.connection[JobPosting._meta.db_table]
+
+    @staticmethod
+    def get_job_posting_generation_repo() -> BaseManager[JobPostingGeneration]:
+        """
+        This method will return database manager for the Job Posting generation model.
+        """
+        return JobPostingGeneration.objects
+
+    @classmethod
+    def get_job_posting_generation_collection(cls) -> Union["Collection", None]:
+        """
+        This method will return the pymongo collection behind the Job Posting generation model,
+        or None when Job Postings are not stored in MongoDB.
+        """
+        connection = cls.get_job_posting_connection()
+        if connection.vendor != "djongo":
+            return None
+        connection.ensure_connection()
+        return connection.connection[JobPostingGeneration._meta.db_table]
+
+    @staticmethod
+    def get_job_ingestion_factory() -> Type[JobIngestionFactory]:
+        """
+        This Method will return JobIngestionFactory.
+        """
+        return JobIngestionFactory
+
+    @staticmethod
+    def get_job_ingestion_repo() -> BaseManager[JobIngestion]:
+        """
+        This method will return database manager for the Job Ingestion model.
+        """
+        return JobIngestion.objects
@@ -0,0 +1,41 @@
+import csv
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from backend.application.user.services import UserAppServices
+from backend.interface.user.serializers import BulkUserImportSerializer
+from utils.django.exceptions import UserException
+
+
+class Command(BaseCommand):
+    help = ("Creates Users from a CSV file with email, first_name, last_name and optional "
+            "password columns, validated like the bulk import endpoint.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("file")
+        parser.add_argument("--skip-existing", action="store_true",
+                            help="Leave out users whose email is taken instead of failing.")
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        with open(options["file"], newline="", encoding="utf-8") as file:
+            users = [{key: value or None for key, value in row.items()}
+                     for row in csv.DictReader(file)]
+        serializer_obj = BulkUserImportSerializer(
+            data={"users": users, "skip_existing": options["skip_existing"]})
+        if not serializer_obj.is_valid():
+            # User <index> is on line <index> + 2, after the header.
+            raise CommandError(json.dumps(serializer_obj.get_flat_errors(), indent=2))
+        try:
+            with transaction.atomic():
+                import_data = UserAppServices().bulk_create_users_from_dicts(
+                    data=serializer_obj.validated_data["users"],
+                    skip_existing=options["skip_existing"],
+                    batch_size=options["batch_size"],
+                )
+        except UserException as e:
+            raise CommandError(str(e))
+        self.stdout.write(
+            f"Created {import_data['created']} users, skipped {import_data['skipped']}.")
@@ -0,0 +1,26 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from backend.application.user.hashing import password_hashing_service
+
+
+class Command(BaseCommand):
+    help = ("Hashes sample passwords through the hashing pool with the configured hasher and "
+            "prints per-hash time and hashes/sec, to size PASSWORD_HASHING_WORKERS and the cost.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=None,
+                            help="Passwords to hash (default: 4 per worker).")
+
+    def handle(self, *args, **options):
+        count = options["count"] or settings.PASSWORD_HASHING_WORKERS * 4
+        started = time.perf_counter()
+        password_hashing_service.make_passwords(f"sample-password-{i}" for i in range(count))
+        elapsed = time.perf_counter() - started
+        stats = password_hashing_service.get_stats()
+        stats["hasher"] = settings.PASSWORD_HASHERS[0]
+        stats["hashes_per_second"] = round(count / elapsed, 2)
+        self.stdout.write(json.dumps(stats, indent=2, sort_keys=True))
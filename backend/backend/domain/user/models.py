@@ -1,9 +1,11 @@
 import uuid
 from dataclasses import dataclass
+from typing import Union
 
 from django.contrib.auth.models import (AbstractBaseUser, BaseUserManager,
                                         PermissionsMixin)
 from django.db import models
+from django.utils import timezone
 
 from utils.django.custom_models import ActivityTracking
 
@@ -17,6 +19,15 @@ class UserID:
     value: uuid.UUID
 
 
+@dataclass(frozen=True)
+class UserImportID:
+    """
+    This will create UUID that will pass in UserImportFactory Method
+
+    """
+    value: uuid.UUID
+
+
 class UserManagerAutoID(BaseUserManager):
     """
     A User Manager that sets the uuid on a model when calling the create_superuser function.
@@ -114,3 +125,59 @@ class UserFactory:
             first_name=first_name,
             last_name=last_name
         )
+
+
+# ---------
+# User Import Model
+# ---------
+class UserImportStatusChoices(models.TextChoices):
+    """
+    Choices for User Import Status
+    """
+    QUEUED = "queued", "Queued"
+    RUNNING = "running", "Running"
+    COMPLETED = "completed", "Completed"
+    FAILED = "failed", "Failed"
+
+
+class UserImport(ActivityTracking):
+    """
+    User Import class tracks a bulk User import processed in the background.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(choices=UserImportStatusChoices.choices,
+                              default=UserImportStatusChoices.QUEUED, max_length=10)
+    skip_existing = models.BooleanField(default=False)
+    users_total = models.PositiveIntegerField(default=0)
+    users_created = models.PositiveIntegerField(default=0)
+    users_skipped = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "user_import"
+
+    def __str__(self) -> str:
+        return f"{self.users_total} users ({self.status})"
+
+    @property
+    def elapsed_seconds(self) -> Union[float, None]:
+        if not self.started_at:
+            return None
+        return ((self.finished_at or timezone.now()) - self.started_at).total_seconds()
+
+
+class UserImportFactory:
+    """
+    This Class is used for building instance of User Import
+    """
+    @staticmethod
+    def build_entity(id: UserImportID, users_total: int, skip_existing: bool = False) -> UserImport:
+        return UserImport(id=id.value, users_total=users_total, skip_existing=skip_existing)
+
+    @classmethod
+    def build_entity_with_id(cls, users_total: int, skip_existing: bool = False) -> UserImport:
+        entity_id = UserImportID(uuid.uuid4())
+        return cls.build_entity(id=entity_id, users_total=users_total, skip_existing=skip_existing)
@@ -1,8 +1,13 @@
-from typing import Type
+from typing import TYPE_CHECKING, Type, Union
 
+from django.db import connections, router
+from django.db.backends.base.base import BaseDatabaseWrapper
 from django.db.models.manager import BaseManager
 
-from .models import User, UserFactory
+from .models import User, UserFactory, UserImport, UserImportFactory
+
+if TYPE_CHECKING:
+    from pymongo.collection import Collection
 
 
 class UserServices:
@@ -19,3 +24,36 @@ class UserServices:
         This method will return database manager for the User model.
         """
         return User.objects
+
+    @staticmethod
+    def get_user_connection() -> BaseDatabaseWrapper:
+        """
+        This method will return the Django database connection Users are stored in.
+        """
+        return connections[router.db_for_write(User)]
+
+    @classmethod
+    def get_user_collection(cls) -> Union["Collection", None]:
+        """
+        This method will return the pymongo collection behind the User model, through the
+        djongo connection, or None when Users are not stored in MongoDB.
+        """
+        connection = cls.get_user_connection()
+        if connection.vendor != "djongo":
+            return None
+        connection.ensure_connection()
+        return connection.connection[User._meta.db_table]
+
+    @staticmethod
+    def get_user_import_factory() -> Type[UserImportFactory]:
+        """
+        This Method will return UserImportFactory.
+        """
+        return UserImportFactory
+
+    @staticmethod
+    def get_user_import_repo() -> BaseManager[UserImport]:
+        """
+        This method will return database manager for the User Import model.
+        """
+        return UserImport.objects
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import status
+
+from backend.application.job.async_services import AsyncJobPostingAppServices
+from backend.domain.job.models import JobPosting
+from backend.interface.job.pagination import JobPostingDocumentKeysetPagination
+from backend.interface.job.serializers import ListOfJobPostingSerializer
+from backend.interface.job.views import JobPostingViewSet
+from utils.django.exceptions import JobPostingException
+from utils.django.profiling import profile_phase
+from utils.django.renderers import render_json
+from utils.errors.custom_response import CustomResponse
+
+# Logger setup
+logger = logging.getLogger("django")
+
+
+async def skip() -> None:
+    return None
+
+
+class AsyncJobPostingListView(View):
+    """
+    Async Job Posting listing and search, served from the motor driver under ASGI.
+    Takes the same query params and returns the same body as jobs/posting/list/.
+    """
+    async_job_posting_app_services = AsyncJobPostingAppServices()
+
+    @staticmethod
+    def json_response(data: dict, status_code: int) -> HttpResponse:
+        with profile_phase("render"):
+            content = render_json(data)
+        return HttpResponse(content, status=status_code, content_type="application/json")
+
+    async def get(self, request):
+        """
+        Job Posting List Method
+        """
+        services = self.async_job_posting_app_services
+        try:
+            query_params = request.GET
+            job_title = query_params.get("job_title", None)
+            # Like the sync listing, searches are neither cached nor given validators.
+            cacheable = not job_title
+            if cacheable:
+                cache_key, etag, last_modified = await services.job_posting_cache.aget_validators(
+                    "async_listing", dict(query_params.lists()))
+                not_modified_response = JobPostingViewSet.get_not_modified_response(
+                    request, etag, last_modified)
+                if not_modified_response is not None:
+                    return not_modified_response
+                cached_response_data = await services.job_posting_cache.aget(cache_key)
+                if cached_response_data is not None:
+                    return JobPostingViewSet.set_validators(
+                        self.json_response(cached_response_data, status.HTTP_200_OK),
+                        etag, last_modified)
+
+            paginator = JobPostingDocumentKeysetPagination()
+            fields = JobPostingViewSet.get_requested_fields(query_params)
+            filters = JobPostingViewSet.build_job_posting_filter(
+                query_params, JobPosting.objects.none()).active_filters
+            if job_title:
+                listing = services.search_job_posting(
+                    job_title=job_title,
+                    limit=paginator.get_page_size(query_params),
+                    fields=fields,
+                    filters=filters,
+                )
+            else:
+                listing = paginator.apaginate_collection(
+                    services.get_job_posting_collection(),
+                    match=services.job_posting_app_services.build_job_posting_match(filters),
+                    projection=services.build_projection(fields),
+                    query_params=query_params,
+                )
+            # Like the sync listing, searches come without facets.
+            include_facets = not job_title and query_params.get(
+                "facets", "true").lower() not in ("0", "false")
+            include_total = query_params.get(
+                paginator.include_total_query_param, "").lower() in ("1", "true")
+            documents, facets, estimated_total = await asyncio.gather(
+                listing,
+                services.get_job_posting_facets(filters=filters) if include_facets else skip(),
+                services.estimate_job_posting_count() if include_total else skip(),
+            )
+
+            with profile_phase("serialize"):
+                data = ListOfJobPostingSerializer(documents, many=True, fields=fields).data
+            response_data = CustomResponse().cursor_listing(
+                message="Job Posting Listed successfully",
+                data=data,
+                next_cursor=paginator.get_next_cursor(),
+                previous_cursor=paginator.get_previous_cursor(),
+                estimated_total=estimated_total,
+                facets=facets,
+            ).data
+            response = self.json_response(response_data, status.HTTP_200_OK)
+            if cacheable:
+                await services.job_posting_cache.aset(cache_key, response_data)
+                JobPostingViewSet.set_validators(response, etag, last_modified)
+            return response
+        except JobPostingException as je:
+            response = CustomResponse().fail(
+                status=status.HTTP_400_BAD_REQUEST,
+                errors=je.error_data(),
+                message=f"Unable to list jobs. {je}."
+            )
+        except Exception as le:
+            logger.error("Error while listing Job Postings: %s", le)
+            response = CustomResponse().fail(
+                status=status.HTTP_400_BAD_REQUEST,
+                errors={"error": le.args[0] if le.args else str(le)},
+                message="Unable to list jobs. Please contact administrator."
+            )
+        return self.json_response(response.data, response.status_code)
@@ -0,0 +1,50 @@
+import django_filters
+
+from backend.domain.job.models import JobPosting
+
+
+class CharInFilter(django_filters.BaseInFilter, django_filters.CharFilter):
+    """
+    Comma separated list of values, e.g. ?country=US,CA
+    """
+
+
+class JobPostingFilter(django_filters.FilterSet):
+    """
+    Filter class for Job Posting listing.
+    Facet filters take comma separated values; salary filters match postings whose annual
+    compensation range overlaps the requested one.
+    """
+    country = CharInFilter(lookup_expr="in")
+    region = CharInFilter(lookup_expr="in")
+    city = CharInFilter(lookup_expr="in")
+    role_seniority = CharInFilter(lookup_expr="in")
+    office_location = CharInFilter(lookup_expr="in")
+    type_of_compensation = CharInFilter(lookup_expr="in")
+    company_industry = CharInFilter(lookup_expr="in")
+    min_salary = django_filters.NumberFilter(
+        field_name="max_annual_compensation", lookup_expr="gte")
+    max_salary = django_filters.NumberFilter(
+        field_name="min_annual_compensation", lookup_expr="lte")
+
+    class Meta:
+        model = JobPosting
+        fields = [
+            "country", "region", "city", "role_seniority", "office_location",
+            "type_of_compensation", "company_industry", "min_salary", "max_salary"
+        ]
+
+    @property
+    def active_filters(self) -> dict:
+        """
+        Filter name -> value of the filters that got a value.
+        """
+        return {name: value for name, value in self.form.cleaned_data.items()
+                if value not in (None, "", [])}
+
+    @property
+    def is_filtering(self) -> bool:
+        """
+        True when at least one filter got a value.
+        """
+        return bool(self.active_filters)
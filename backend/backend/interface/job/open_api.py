@@ -1,14 +1,60 @@
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 
-from .serializers import BulkJobPostingSerializer, ListOfJobPostingSerializer
+from .serializers import (BulkJobPostingSerializer, JobIngestionSerializer,
+                          JobPostingExportSerializer,
+                          ListOfJobPostingSerializer)
 
 job_listing_tags = ['Job_Posting_Module']
 
+conditional_get_parameters = [
+    OpenApiParameter(
+        "If-None-Match", str, OpenApiParameter.HEADER,
+        description="ETag of a previous response; 304 when it is still current."),
+    OpenApiParameter(
+        "If-Modified-Since", str, OpenApiParameter.HEADER,
+        description="Last-Modified of a previous response; ignored with If-None-Match."),
+]
+
 bulk_job_posting_extension = extend_schema(
     tags=job_listing_tags, request=BulkJobPostingSerializer, responses={
         200: BulkJobPostingSerializer}
 )
 job_listing_extension = extend_schema(
     tags=job_listing_tags, request=ListOfJobPostingSerializer, responses={
-        200: ListOfJobPostingSerializer}
+        200: ListOfJobPostingSerializer, 304: None},
+    parameters=[
+        *conditional_get_parameters,
+        OpenApiParameter("job_title", str, description="Fuzzy job title/company search."),
+        OpenApiParameter("cursor", str, description="Opaque next/previous cursor."),
+        OpenApiParameter("page_size", int),
+        OpenApiParameter("include_total", bool, description="Add an estimated_total."),
+        *[OpenApiParameter(field, str, description="Comma separated values.") for field in [
+            "country", "region", "city", "role_seniority", "office_location",
+            "type_of_compensation", "company_industry"]],
+        OpenApiParameter(
+            "facets", bool,
+            description="Include facet counts (default true). Not given with job_title: a "
+                        "search returns one page of best matches, not a filtered collection."),
+        OpenApiParameter(
+            "stream", bool,
+            description="Stream every matching posting as one JSON list, without pagination."),
+        OpenApiParameter("min_salary", float, description="Minimum annual compensation."),
+        OpenApiParameter("max_salary", float, description="Maximum annual compensation."),
+        OpenApiParameter(
+            "fields", str,
+            description="Comma separated fields to return, or 'all'. Defaults to a card projection."),
+    ]
+)
+job_posting_detail_extension = extend_schema(
+    tags=job_listing_tags, responses={200: ListOfJobPostingSerializer, 304: None},
+    parameters=conditional_get_parameters
+)
+job_ingestion_extension = extend_schema(
+    tags=job_listing_tags, responses={
+        200: JobIngestionSerializer}
+)
+job_export_extension = extend_schema(
+    tags=job_listing_tags, parameters=[JobPostingExportSerializer],
+    responses={(200, "application/octet-stream"): OpenApiTypes.BINARY}
 )
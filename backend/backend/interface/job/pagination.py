@@ -0,0 +1,170 @@
+import base64
+import json
+import uuid
+from datetime import timezone as dt_timezone
+from typing import Callable, List, Optional, Union
+
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.query import QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+from utils.django.exceptions import JobPostingException
+from utils.errors.custom_response import CustomResponse
+
+
+class JobPostingKeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over (created_at, id), newest first.
+    Every page is an index range scan from the cursor position, so deep pages cost the same
+    as the first one.
+    """
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    include_total_query_param = "include_total"
+
+    def __init__(self, estimate_total: Optional[Callable[[], int]] = None):
+        self.estimate_total = estimate_total
+        self.next_row = None
+        self.previous_row = None
+        self.include_total = False
+
+    @staticmethod
+    def get_row_key(row) -> tuple:
+        return row.created_at, row.id
+
+    @staticmethod
+    def encode_cursor(created_at, id, reverse: bool) -> str:
+        payload = {"c": created_at.isoformat(), "i": str(id), "r": reverse}
+        return base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            created_at = parse_datetime(payload["c"])
+            if created_at is None:
+                raise ValueError(payload["c"])
+            return created_at, uuid.UUID(payload["i"]), bool(payload.get("r"))
+        except (ValueError, KeyError, TypeError) as e:
+            raise JobPostingException("Invalid cursor", str(e))
+
+    def get_page_size(self, query_params) -> int:
+        try:
+            page_size = int(query_params.get(
+                self.page_size_query_param, settings.JOB_POSTING_PAGE_SIZE))
+        except ValueError:
+            page_size = settings.JOB_POSTING_PAGE_SIZE
+        return min(max(page_size, 1), settings.JOB_POSTING_MAX_PAGE_SIZE)
+
+    def read_request(self, query_params) -> Union[str, None]:
+        """
+        This method will read the page size and include_total flag and return the cursor param.
+        """
+        self.page_size = self.get_page_size(query_params)
+        self.include_total = query_params.get(
+            self.include_total_query_param, "").lower() in ("1", "true")
+        return query_params.get(self.cursor_query_param)
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None) -> List:
+        cursor = self.read_request(request.query_params)
+        reverse = False
+        if cursor:
+            created_at, id, reverse = self.decode_cursor(cursor)
+            if reverse:
+                queryset = queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=id))
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=id))
+        ordering = ("created_at", "id") if reverse else ("-created_at", "-id")
+        return self.set_page(list(queryset.order_by(*ordering)[:self.page_size + 1]),
+                             bool(cursor), reverse)
+
+    def set_page(self, rows: List, has_cursor: bool, reverse: bool) -> List:
+        """
+        This method will trim rows fetched with page_size + 1 to the page and remember the rows
+        the next and previous cursors start from.
+        """
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        if rows:
+            if reverse:
+                self.next_row = rows[-1]
+                self.previous_row = rows[0] if has_more else None
+            else:
+                self.next_row = rows[-1] if has_more else None
+                self.previous_row = rows[0] if has_cursor else None
+        return rows
+
+    def get_next_cursor(self) -> Union[str, None]:
+        if self.next_row is None:
+            return None
+        return self.encode_cursor(*self.get_row_key(self.next_row), reverse=False)
+
+    def get_previous_cursor(self) -> Union[str, None]:
+        if self.previous_row is None:
+            return None
+        return self.encode_cursor(*self.get_row_key(self.previous_row), reverse=True)
+
+    def get_estimated_total(self) -> Union[int, None]:
+        if not (self.include_total and self.estimate_total):
+            return None
+        return self.estimate_total()
+
+    def get_paginated_response(self, data, message: str = None, facets: dict = None) -> Response:
+        return CustomResponse().cursor_listing(
+            data=data,
+            message=message,
+            next_cursor=self.get_next_cursor(),
+            previous_cursor=self.get_previous_cursor(),
+            estimated_total=self.get_estimated_total(),
+            facets=facets,
+        )
+
+
+class JobPostingDocumentKeysetPagination(JobPostingKeysetPagination):
+    """
+    The same keyset pagination over raw MongoDB documents, for the async listing.
+    """
+
+    @staticmethod
+    def get_row_key(row) -> tuple:
+        # Documents come back with naive UTC datetimes.
+        return timezone.make_aware(row["created_at"], dt_timezone.utc), row["id"]
+
+    def build_query(self, cursor: Union[str, None], match: dict) -> tuple:
+        """
+        This method will return the find() filter and sort for the page after cursor,
+        and whether the page is read backwards.
+        """
+        reverse = False
+        query = match
+        if cursor:
+            created_at, id, reverse = self.decode_cursor(cursor)
+            operator = "$gt" if reverse else "$lt"
+            keyset = {"$or": [{"created_at": {operator: created_at}},
+                              {"created_at": created_at, "id": {operator: id}}]}
+            query = {"$and": [match, keyset]} if match else keyset
+        direction = 1 if reverse else -1
+        return query, [("created_at", direction), ("id", direction)], reverse
+
+    async def apaginate_collection(
+        self, collection, match: dict, projection: dict, query_params
+    ) -> List[dict]:
+        """
+        This method will read one page of documents matching match from a motor collection.
+        """
+        cursor = self.read_request(query_params)
+        query, sort, reverse = self.build_query(cursor, match)
+        rows = await collection.find(
+            query, {**projection, "created_at": 1, "id": 1}
+        ).sort(sort).limit(self.page_size + 1).to_list(length=None)
+        return self.set_page(rows, bool(cursor), reverse)
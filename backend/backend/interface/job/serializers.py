@@ -2,7 +2,8 @@ import logging
 
 from rest_framework import serializers
 
-from backend.domain.job.models import JobPosting
+from backend.application.job.export import EXPORT_FORMATS
+from backend.domain.job.models import JobIngestion, JobPosting
 
 logger = logging.getLogger(__name__)
 logger = logging.getLogger("django")
@@ -13,12 +14,56 @@ class BulkJobPostingSerializer(serializers.Serializer):
     Serializer class for Job Posting.
     """
     file = serializers.FileField()
+    # "upsert" updates existing postings matched by job_post_url instead of adding duplicates.
+    mode = serializers.ChoiceField(choices=["create", "upsert"], default="create")
+
+
+class JobPostingExportSerializer(serializers.Serializer):
+    """
+    Serializer class for Job Posting export params.
+    """
+    # Not "format", DRF reads that query param to pick a renderer.
+    file_format = serializers.ChoiceField(choices=list(EXPORT_FORMATS), default="ndjson")
+    compress = serializers.ChoiceField(choices=["none", "gzip"], default="none")
+    modified_since = serializers.DateTimeField(required=False)
+
+
+# Default projection for listings, leaving out post_html, job_description and company_industry.
+JOB_POSTING_CARD_FIELDS = [
+    'job_title', 'company_name', 'company_url', 'job_post_url', 'job_apply_url',
+    'min_compensation', 'max_compensation', 'min_annual_compensation',
+    'max_annual_compensation', 'type_of_compensation', 'job_hours',
+    'role_seniority', 'min_education', 'office_location', 'city', 'region', 'country'
+]
 
 
 class ListOfJobPostingSerializer(serializers.ModelSerializer):
     """
     Serializer class for List of Job Posting.
+    Pass fields to only render a subset of the Job Posting fields.
     """
     class Meta:
         model = JobPosting
-        exclude = ['id', 'created_at', 'modified_at']
+        exclude = ['id', 'created_at', 'modified_at', 'content_hash']
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+
+class JobIngestionSerializer(serializers.ModelSerializer):
+    """
+    Serializer class for Job Ingestion progress.
+    """
+    throughput = serializers.FloatField(read_only=True)
+    eta_seconds = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = JobIngestion
+        fields = [
+            'id', 'file_name', 'status', 'upsert', 'rows_total', 'rows_processed',
+            'rows_failed', 'rows_inserted', 'rows_updated', 'rows_unchanged', 'throughput',
+            'eta_seconds', 'error', 'started_at', 'finished_at', 'created_at'
+        ]
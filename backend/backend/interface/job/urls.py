@@ -1,6 +1,13 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
+from .async_views import AsyncJobPostingListView
 from .views import JobPostingViewSet
 
 router = DefaultRouter()
 router.register(r"jobs", JobPostingViewSet, basename="jobs")
+
+urlpatterns = [
+    path("jobs/async/posting/list/", AsyncJobPostingListView.as_view(),
+         name="jobs-async-posting-list"),
+]
@@ -1,21 +1,36 @@
+import hashlib
 import logging
+from typing import Union
 
-import pandas as pd
 from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls.converters import UUIDConverter
+from django.utils.cache import get_conditional_response
 from django.utils.decorators import method_decorator
+from django.utils.http import http_date
 from drf_spectacular.utils import extend_schema_view
-from pymongo import MongoClient
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework.response import Response
 
-from backend.application.job.services import JobPostingAppServices
+from backend.application.job.cache import JobPostingCache
+from backend.application.job.export import JobPostingExporter
+from backend.application.job.services import (JobIngestionAppServices,
+                                              JobPostingAppServices)
 from backend.interface.job import open_api
+from backend.interface.job.filters import JobPostingFilter
 from backend.interface.job.ordering_filter import JobPostingOrderingFilter
+from backend.interface.job.pagination import JobPostingKeysetPagination
+from utils.django.authentication import CachedJWTAuthentication
+from utils.django.exceptions import JobPostingException
 from utils.django.middleware import AuthMiddleWare
+from utils.django.profiling import profile_phase
+from utils.django.renderers import render_json, stream_json_envelope
 from utils.errors.custom_response import CustomResponse
 
-from .serializers import BulkJobPostingSerializer, ListOfJobPostingSerializer
+from .serializers import (JOB_POSTING_CARD_FIELDS, BulkJobPostingSerializer,
+                          JobIngestionSerializer, JobPostingExportSerializer,
+                          ListOfJobPostingSerializer)
 
 # Logger setup
 logger = logging.getLogger("django")
@@ -23,72 +38,174 @@ logger = logging.getLogger("django")
 
 @extend_schema_view(
     list_of_job_posting=open_api.job_listing_extension,
-    bulk_job_posting=open_api.bulk_job_posting_extension
+    job_posting_detail=open_api.job_posting_detail_extension,
+    bulk_job_posting=open_api.bulk_job_posting_extension,
+    job_ingestion_status=open_api.job_ingestion_extension,
+    export_job_posting=open_api.job_export_extension
 )
 class JobPostingViewSet(viewsets.ViewSet):
     """
     This ViewSet consist of Job Posting Action.
     """
-    authentication_class = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     job_posting_app_services = JobPostingAppServices()
+    job_ingestion_app_services = JobIngestionAppServices()
+    job_posting_cache = JobPostingCache()
     filter_backends = [
         JobPostingOrderingFilter
     ]
+    filterset_class = JobPostingFilter
     filterset_fields = [
         "job_title",
     ]
     search_fields = [
         "job_title",
     ]
-    client = MongoClient(settings.DB_HOST)
-    db = client[settings.DB_NAME]
-    job_collection = db['job_jobposting']
 
     def get_serializer_class(self):
         if self.action == "bulk_job_posting":
             return BulkJobPostingSerializer
-        if self.action == "list_of_job_posting":
+        if self.action in ("list_of_job_posting", "job_posting_detail"):
             return ListOfJobPostingSerializer
+        if self.action == "job_ingestion_status":
+            return JobIngestionSerializer
+        if self.action == "export_job_posting":
+            return JobPostingExportSerializer
 
     def get_queryset(self):
         """This Method will return custom queryset"""
         queryset = self.job_posting_app_services.get_list_of_job_posting()
         return queryset
 
+    def get_job_posting_filter(self, request) -> JobPostingFilter:
+        """
+        This Method will apply the listing filters from the query params to the queryset.
+        """
+        return self.build_job_posting_filter(request.query_params, self.get_queryset())
+
+    @staticmethod
+    def build_job_posting_filter(query_params, queryset) -> JobPostingFilter:
+        """
+        This Method will validate the listing filters in query_params against queryset.
+        """
+        job_posting_filter = JobPostingFilter(query_params, queryset=queryset)
+        if not job_posting_filter.is_valid():
+            errors = job_posting_filter.errors
+            field = next(iter(errors))
+            raise JobPostingException(f"Invalid {field}", errors[field][0].rstrip("."))
+        return job_posting_filter
+
+    @staticmethod
+    def get_requested_fields(query_params) -> list:
+        """
+        This Method will return the Job Posting fields asked for with ?fields=,
+        defaulting to the card projection.
+        """
+        requested_fields = query_params.get("fields", None)
+        if not requested_fields:
+            return JOB_POSTING_CARD_FIELDS
+        serializer_fields = list(ListOfJobPostingSerializer().fields)
+        if requested_fields == "all":
+            return serializer_fields
+        fields = [field.strip() for field in requested_fields.split(",") if field.strip()]
+        unknown_fields = set(fields) - set(serializer_fields)
+        if unknown_fields:
+            raise JobPostingException("Unknown fields", ", ".join(sorted(unknown_fields)))
+        return fields
+
+    @staticmethod
+    def set_validators(response: HttpResponse, etag: str, last_modified: float) -> HttpResponse:
+        """
+        This Method will add the ETag and Last-Modified headers to response.
+        """
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    @classmethod
+    def get_not_modified_response(
+        cls, request, etag: str, last_modified: float
+    ) -> Union[HttpResponse, None]:
+        """
+        This Method will return a 304 response when If-None-Match/If-Modified-Since show the
+        client already has this version (or a 412 when If-Match fails), before anything is
+        queried or serialized, and None otherwise.
+        """
+        response = get_conditional_response(
+            request, etag=etag, last_modified=int(last_modified))
+        if response is not None:
+            cls.set_validators(response, etag, last_modified)
+        return response
+
     # @method_decorator(AuthMiddleWare, name="dispatch")
     @action(detail=False, methods=['GET'], url_path='posting/list')
     def list_of_job_posting(self, request):
         """
         Job Posting List Method
+        Facets are left out of job_title searches: a search returns one page of best matches,
+        which counts over the filtered collection would not describe.
+        Searches are neither cached nor given validators: the search index picks up writes
+        from other processes on its next refresh, after the cache generation has moved on.
         """
         try:
             job_title = request.GET.get("job_title", None)
+            cacheable = not job_title
+            if cacheable:
+                cache_key, etag, last_modified = self.job_posting_cache.get_validators(
+                    "listing", dict(request.query_params.lists()))
+                not_modified_response = self.get_not_modified_response(
+                    request, etag, last_modified)
+                if not_modified_response is not None:
+                    return not_modified_response
+            if request.query_params.get("stream", "").lower() in ("1", "true"):
+                response = self.stream_job_postings(request)
+                return self.set_validators(response, etag, last_modified) if cacheable \
+                    else response
+            if cacheable:
+                cached_response_data = self.job_posting_cache.get(cache_key)
+                if cached_response_data is not None:
+                    return self.set_validators(
+                        Response(cached_response_data, status=status.HTTP_200_OK),
+                        etag, last_modified)
+
+            paginator = JobPostingKeysetPagination(
+                estimate_total=self.job_posting_app_services.estimate_job_posting_count)
+            fields = self.get_requested_fields(request.query_params)
+            job_posting_filter = self.get_job_posting_filter(request)
             if job_title:
-                add_result = self.job_collection.aggregate(
-                    [
-                        {
-                            "$search": {
-                                "index": "job_posting",
-                                "autocomplete": {
-                                    "query": job_title,
-                                    "path": "job_title",
-                                    "fuzzy": {
-                                        "maxEdits": 2
-                                    }
-                                }
-                            }
-                        }
-                    ]
+                queryset = self.job_posting_app_services.search_job_posting(
+                    job_title=job_title,
+                    limit=paginator.get_page_size(request.query_params),
+                    fields=fields,
+                    queryset=job_posting_filter.qs if job_posting_filter.is_filtering else None
                 )
-                queryset = list(add_result)
             else:
-                queryset = (self.get_queryset())
+                queryset = paginator.paginate_queryset(
+                    job_posting_filter.qs.only("created_at", *fields), request)
+            facets = None
+            if not job_title and request.query_params.get(
+                    "facets", "true").lower() not in ("0", "false"):
+                facets = self.job_posting_app_services.get_job_posting_facets(
+                    filters=job_posting_filter.active_filters)
             list_of_job_posting_serializer = self.get_serializer_class()
             list_of_job_posting_serializer_obj = list_of_job_posting_serializer(
-                queryset, many=True)
-            return CustomResponse().listing(
+                queryset, many=True, fields=fields)
+            with profile_phase("serialize"):
+                data = list_of_job_posting_serializer_obj.data
+            response = paginator.get_paginated_response(
                 message="Job Posting Listed successfully",
-                data=list_of_job_posting_serializer_obj.data
+                data=data,
+                facets=facets
+            )
+            if cacheable:
+                self.job_posting_cache.set(cache_key, response.data)
+                self.set_validators(response, etag, last_modified)
+            return response
+        except JobPostingException as je:
+            return CustomResponse().fail(
+                status=status.HTTP_400_BAD_REQUEST,
+                errors=je.error_data(),
+                message=f"Unable to list jobs. {je}."
             )
         except Exception as le:
             return CustomResponse().fail(
@@ -97,6 +214,70 @@ class JobPostingViewSet(viewsets.ViewSet):
                 message="Unable to list jobs. Please contact administrator."
             )
 
+    def stream_job_postings(self, request) -> StreamingHttpResponse:
+        """
+        This Method will stream every Job Posting matching the listing params as one JSON
+        envelope, reading them from a database cursor, so memory stays flat however many match.
+        Facets, cursors and counts are left out; with job_title the search results are streamed.
+        """
+        fields = self.get_requested_fields(request.query_params)
+        job_posting_filter = self.get_job_posting_filter(request)
+        job_title = request.query_params.get("job_title", None)
+        if job_title:
+            job_postings = self.job_posting_app_services.search_job_posting(
+                job_title=job_title,
+                limit=JobPostingKeysetPagination().get_page_size(request.query_params),
+                fields=fields,
+                queryset=job_posting_filter.qs if job_posting_filter.is_filtering else None
+            )
+        else:
+            job_postings = job_posting_filter.qs.only(*fields).order_by(
+                "-created_at", "-id").iterator(chunk_size=settings.JOB_POSTING_STREAM_CHUNK_SIZE)
+        serializer = ListOfJobPostingSerializer(fields=fields)
+        return StreamingHttpResponse(
+            stream_json_envelope(
+                message="Job Posting Listed successfully",
+                rows=job_postings,
+                serialize=serializer.to_representation,
+                chunk_size=settings.JOB_POSTING_STREAM_CHUNK_SIZE,
+            ),
+            content_type="application/json",
+        )
+
+    @action(detail=False, methods=['GET'],
+            url_path=rf"posting/(?P<job_posting_id>{UUIDConverter.regex})")
+    def job_posting_detail(self, request, job_posting_id=None):
+        """
+        Job Posting Detail Method
+        The ETag is a hash of the posting's body, so it only changes when the posting does.
+        """
+        cache_key = self.job_posting_cache.build_key("detail", {"id": job_posting_id})
+        job_posting_detail = self.job_posting_cache.get(cache_key)
+        if job_posting_detail is None:
+            job_posting = self.job_posting_app_services.get_job_posting_by_id(id=job_posting_id)
+            if not job_posting:
+                return CustomResponse().fail(
+                    status=status.HTTP_404_NOT_FOUND,
+                    errors={"error": "Job Posting not found."},
+                    message="Unable to find job posting."
+                )
+            data = self.get_serializer_class()(job_posting).data
+            job_posting_detail = {
+                "data": data,
+                "etag": f'"{hashlib.sha1(render_json(data)).hexdigest()}"',
+                "last_modified": job_posting.modified_at.timestamp(),
+            }
+            self.job_posting_cache.set(cache_key, job_posting_detail)
+
+        etag, last_modified = job_posting_detail["etag"], job_posting_detail["last_modified"]
+        not_modified_response = self.get_not_modified_response(request, etag, last_modified)
+        if not_modified_response is not None:
+            return not_modified_response
+        return self.set_validators(CustomResponse().success(
+            data=job_posting_detail["data"],
+            message="Job Posting fetched successfully"
+        ), etag, last_modified)
+
     @method_decorator(AuthMiddleWare, name="dispatch")
     @action(detail=False, methods=['POST'], url_path="bulk/create")
     def bulk_job_posting(self, request):
@@ -108,45 +289,89 @@ class JobPostingViewSet(viewsets.ViewSet):
             bulk_job_posting_serializer_obj = bulk_job_posting_serializer(
                 data=request.data)
             if bulk_job_posting_serializer_obj.is_valid():
-                df = pd.read_excel(
-                    bulk_job_posting_serializer_obj.validated_data.get("file"))
-                bulk_create_job_post_list = []
-                for _, row in df.iterrows():
-                    job_posted_data = {
-                        "job_title": row['job_name'],
-                        "company_name": row['company_name'],
-                        'job_description': row['job_full_text'],
-                        'job_post_url': row['post_url'],
-                        'job_apply_url': row['post_apply_url'],
-                        'company_url': row['company_url'],
-                        'company_industry': row['Company Industry'],
-                        'min_compensation': row['Minimum Compensation'],
-                        'max_compensation': row['Maximum Compensation'],
-                        'type_of_compensation': row['Compensation Type'],
-                        'job_hours': row['Job Hours'],
-                        'role_seniority': row['Role Seniority'],
-                        'min_education': row['Minimum Education'],
-                        'office_location': row['Office Location'],
-                        'post_html': row['post_html'],
-                        'city': row['city'],
-                        'region': row['region'],
-                        'country': row['country']
-                    }
-                    bulk_create_job_post_list.append(job_posted_data)
-                self.job_posting_app_services.bulk_create_job_posting_data(
-                    data=bulk_create_job_post_list)
+                validated_data = bulk_job_posting_serializer_obj.validated_data
+                job_ingestion = self.job_ingestion_app_services.create_job_ingestion(
+                    file=validated_data.get("file"),
+                    upsert=validated_data.get("mode") == "upsert")
 
                 return CustomResponse().success(
-                    message="Job Posting created successfully")
+                    data={"ingestion_id": job_ingestion.id,
+                          "status": job_ingestion.status},
+                    message="Job Posting upload queued successfully")
             else:
                 return CustomResponse().serializer_invalid(
                     status=status.HTTP_400_BAD_REQUEST,
                     errors=bulk_job_posting_serializer_obj.errors,
                     message="Unable to create jobs. Please contact administrator."
                 )
+        except JobPostingException as je:
+            return CustomResponse().fail(
+                status=status.HTTP_400_BAD_REQUEST,
+                errors=je.error_data(),
+                message=f"Unable to create jobs. {je}."
+            )
         except Exception as le:
             return CustomResponse().fail(
                 status=status.HTTP_400_BAD_REQUEST,
                 errors={"error": le.args[0]},
                 message="Unable to create jobs. Please contact administrator."
             )
+
+    @method_decorator(AuthMiddleWare, name="dispatch")
+    @action(detail=False, methods=['GET'], url_path=r"ingest/(?P<ingestion_id>[^/.]+)")
+    def job_ingestion_status(self, request, ingestion_id=None):
+        """
+        Job Ingestion Status Method
+        """
+        job_ingestion = self.job_ingestion_app_services.get_job_ingestion_by_id(
+            id=ingestion_id)
+        if not job_ingestion:
+            return CustomResponse().fail(
+                status=status.HTTP_404_NOT_FOUND,
+                errors={"error": "Job Ingestion not found."},
+                message="Unable to find job ingestion."
+            )
+        job_ingestion_serializer = self.get_serializer_class()
+        return CustomResponse().success(
+            data=job_ingestion_serializer(job_ingestion).data,
+            message="Job Ingestion fetched successfully"
+        )
+
+    @method_decorator(AuthMiddleWare, name="dispatch")
+    @action(detail=False, methods=['GET'], url_path="export")
+    def export_job_posting(self, request):
+        """
+        Job Posting Export Method
+        """
+        try:
+            job_posting_export_serializer = self.get_serializer_class()
+            job_posting_export_serializer_obj = job_posting_export_serializer(
+                data=request.query_params)
+            if not job_posting_export_serializer_obj.is_valid():
+                return CustomResponse().serializer_invalid(
+                    status=status.HTTP_400_BAD_REQUEST,
+                    errors=job_posting_export_serializer_obj.errors,
+                    message="Unable to export jobs. Please contact administrator."
+                )
+            validated_data = job_posting_export_serializer_obj.validated_data
+            exporter = JobPostingExporter(
+                export_format=validated_data["file_format"],
+                compress=validated_data["compress"] == "gzip",
+                modified_since=validated_data.get("modified_since"),
+            )
+            response = StreamingHttpResponse(
+                exporter.stream(), content_type=exporter.content_type)
+            response["Content-Disposition"] = f'attachment; filename="{exporter.file_name}"'
+            return response
+        except JobPostingException as je:
+            return CustomResponse().fail(
+                status=status.HTTP_400_BAD_REQUEST,
+                errors=je.error_data(),
+                message=f"Unable to export jobs. {je}."
+            )
+        except Exception as le:
+            return CustomResponse().fail(
+                status=status.HTTP_400_BAD_REQUEST,
+                errors={"error": le.args[0]},
+                message="Unable to export jobs. Please contact administrator."
+            )
@@ -23,13 +23,16 @@ from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework_simplejwt.views import TokenRefreshView
 
 from backend.interface.job.urls import router as jobs_router
+from backend.interface.job.urls import urlpatterns as jobs_urlpatterns
 from backend.interface.user.urls import router as users_router
+from utils.metrics.views import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', RedirectView.as_view(url="admin/", permanent=False)),
     path(f"{settings.COMMON_URL}", include(users_router.urls)),
     path(f"{settings.COMMON_URL}", include(jobs_router.urls)),
+    path(f"{settings.COMMON_URL}", include(jobs_urlpatterns)),
     path(f"{settings.COMMON_URL}schema/",
          SpectacularAPIView.as_view(), name="schema"),
     path(
@@ -38,6 +41,7 @@ urlpatterns = [
         name="spec_schema",
     ),
     path("refresh/token/", TokenRefreshView.as_view(), name="refresh_token"),
+    path("metrics", metrics_view, name="metrics"),
 ]
 
 
@@ -1,6 +1,7 @@
 from drf_spectacular.utils import extend_schema
 
-from .serializers import UserLoginSerializer, UserSignupSerializer
+from .serializers import (BulkUserImportSerializer, UserImportSerializer,
+                          UserLoginSerializer, UserSignupSerializer)
 
 user_tags = ['Auth_Module']
 
@@ -12,3 +13,11 @@ user_login_extension = extend_schema(
     tags=user_tags, request=UserLoginSerializer, responses={
         200: UserLoginSerializer}
 )
+user_bulk_import_extension = extend_schema(
+    tags=user_tags, request=BulkUserImportSerializer, responses={
+        200: UserImportSerializer}
+)
+user_import_extension = extend_schema(
+    tags=user_tags, responses={
+        200: UserImportSerializer}
+)
@@ -5,15 +5,12 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 from rest_framework import serializers
 
-from backend.application.user.services import UserAppServices
+from backend.domain.user.models import UserImport
 
 logger = logging.getLogger(__name__)
 logger = logging.getLogger("django")
 
 
-user_app_services = UserAppServices()
-
-
 class UserSignupSerializer(serializers.Serializer):
     """
     Serializer class for user Signup.
@@ -41,12 +38,68 @@ class UserLoginSerializer(serializers.Serializer):
     email = serializers.EmailField(required=True)
     password = serializers.CharField(max_length=128, required=True)
 
-    def validate_email(self, value):
+
+class BulkUserSerializer(UserSignupSerializer):
+    """
+    Serializer class for one User of a bulk import; without a password the user can't log in
+    until one is set.
+    """
+    password = serializers.CharField(max_length=128, required=False, allow_null=True)
+
+
+class BulkUserImportSerializer(serializers.Serializer):
+    """
+    Serializer class for bulk User import.
+    """
+    users = BulkUserSerializer(
+        many=True, allow_empty=False, max_length=settings.USER_BULK_IMPORT_MAX_SIZE)
+    # Leave out users whose email is taken instead of rejecting the batch.
+    skip_existing = serializers.BooleanField(default=False)
+
+    def validate_users(self, value):
+        """
+        Checks that no email appears twice in the batch
+        """
+        emails = set()
+        duplicates = set()
+        for user in value:
+            if user["email"] in emails:
+                duplicates.add(user["email"])
+            emails.add(user["email"])
+        if duplicates:
+            raise ValidationError(f"Duplicate emails: {', '.join(sorted(duplicates))}")
+        return value
+
+    def get_flat_errors(self) -> dict:
         """
-        Checks if email is exists or not
+        Returns errors with the per user errors flattened to "User <index> <field>: <message>"
+        strings, so each field maps to a list of messages.
         """
-        user = user_app_services.get_user_by_email(email=value)
-        if user:
-            return user.email
-        else:
-            return None
+        errors = dict(self.errors)
+        users_errors = errors.get("users")
+        if isinstance(users_errors, dict):
+            # Errors of the list itself: empty, not a list, too long.
+            errors["users"] = [
+                str(message) for messages in users_errors.values() for message in messages]
+        elif isinstance(users_errors, list) and users_errors and isinstance(users_errors[0], dict):
+            errors["users"] = [
+                f"User {index} {field}: {message}"
+                for index, user_errors in enumerate(users_errors)
+                for field, messages in user_errors.items()
+                for message in messages
+            ]
+        return errors
+
+
+class UserImportSerializer(serializers.ModelSerializer):
+    """
+    Serializer class for bulk User import progress.
+    """
+    elapsed_seconds = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = UserImport
+        fields = [
+            'id', 'status', 'skip_existing', 'users_total', 'users_created', 'users_skipped',
+            'error', 'elapsed_seconds', 'started_at', 'finished_at', 'created_at'
+        ]
@@ -1,23 +1,23 @@
 import logging
-import os
-import sys
 
-from django.contrib.auth import authenticate
-from django.contrib.auth.models import update_last_login
 from django.db import transaction
 from drf_spectacular.utils import extend_schema_view
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
-from backend.application.user.services import UserAppServices
+from backend.application.user.auth import UserAuthAppServices
+from backend.application.user.services import (UserAppServices,
+                                               UserImportAppServices)
 from backend.domain.user.services import UserServices
 from backend.interface.user import open_api
-from utils.django.exceptions import UserException
+from utils.django.authentication import CachedJWTAuthentication
+from utils.django.exceptions import ServerBusyException, UserException
 from utils.errors.custom_response import CustomResponse
 
-from .serializers import UserLoginSerializer, UserSignupSerializer
+from .serializers import (BulkUserImportSerializer, UserImportSerializer,
+                          UserLoginSerializer, UserSignupSerializer)
 
 # Logger setup
 logger = logging.getLogger("django")
@@ -26,20 +26,41 @@ logger = logging.getLogger("django")
 @extend_schema_view(
     signup=open_api.user_sign_up_extension,
     login=open_api.user_login_extension,
+    bulk_import=open_api.user_bulk_import_extension,
+    bulk_import_status=open_api.user_import_extension,
 )
 class UserViewSet(viewsets.ViewSet):
     """
     This ViewSet consist of User's Action.
     """
-    authentication_class = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
 
     def get_serializer_class(self):
         if self.action == "signup":
             return UserSignupSerializer
         if self.action == "login":
             return UserLoginSerializer
+        if self.action == "bulk_import":
+            return BulkUserImportSerializer
+        if self.action == "bulk_import_status":
+            return UserImportSerializer
 
     user_services = UserServices()
+    user_auth_app_services = UserAuthAppServices()
+    user_import_app_services = UserImportAppServices()
+
+    @staticmethod
+    def get_server_busy_response(exception: ServerBusyException, message: str) -> Response:
+        """
+        This Method will return a 503 telling the client when to retry.
+        """
+        response = CustomResponse().fail(
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            errors=exception.error_data(),
+            message=message,
+        )
+        response["Retry-After"] = str(exception.retry_after)
+        return response
 
     @action(detail=False, methods=['POST'], name="signup")
     def signup(self, request) -> Response:
@@ -57,6 +78,9 @@ class UserViewSet(viewsets.ViewSet):
                         data=user_data,
                         message=f"User {user_data['full_name']} has been saved."
                     )
+            except ServerBusyException as be:
+                return self.get_server_busy_response(
+                    be, message="Unable to add user. Please try again later.")
             except UserException as se:
                 return CustomResponse().fail(
                     status=status.HTTP_400_BAD_REQUEST,
@@ -80,23 +104,21 @@ class UserViewSet(viewsets.ViewSet):
             email = serializer_obj.validated_data.get("email", None)
             password = serializer_obj.validated_data.get("password", None)
             try:
-                with transaction.atomic():
-                    user = authenticate(
-                        email=email, password=password)
-                    update_last_login(None, user)
-                    response_data = UserAppServices().get_user_token(user=user)
-                    message = "You have logged in successfully"
-                    logger.info("Login SuccessFully")
-                    return CustomResponse().success(data=response_data, message=message)
+                response_data = self.user_auth_app_services.login(
+                    email=email, password=password)
+                logger.info("Login SuccessFully")
+                return CustomResponse().success(
+                    data=response_data, message="You have logged in successfully")
+            except ServerBusyException as be:
+                logger.warning("Login rejected: %s", be)
+                return self.get_server_busy_response(
+                    be, message="Unable to login. Please try again later.")
             except UserException as le:
-                exc_type, exe_tb = sys.exc_info()
-                email = os.path.split(exe_tb.tb_frame.f_code.co_filename)[1]
-                logger.error(exc_type, email, exe_tb.tb_lineno, str(le))
-                message = "Email or Password is invalid."
+                logger.info("Login failed: %s", le)
                 return CustomResponse().fail(
                     status=status.HTTP_400_BAD_REQUEST,
                     errors=le.error_data(),
-                    message=message,
+                    message="Email or Password is invalid.",
                 )
             except Exception as e:
                 logger.error("Error While Login")
@@ -111,3 +133,54 @@ class UserViewSet(viewsets.ViewSet):
             errors=serializer_obj.errors,
             message="Unable to login. Please contact administrator."
         )
+
+    # Provisioning other accounts is for staff only.
+    @action(detail=False, methods=['POST'], url_path="bulk/import", permission_classes=[IsAdminUser])
+    def bulk_import(self, request) -> Response:
+        """
+        User Bulk Import Method
+        """
+        serializer = self.get_serializer_class()
+        serializer_obj = serializer(data=request.data)
+        if serializer_obj.is_valid():
+            try:
+                # Users are inserted in the background, only the password hashes are queued.
+                with transaction.atomic():
+                    user_import = self.user_import_app_services.create_user_import(
+                        data=serializer_obj.validated_data["users"],
+                        skip_existing=serializer_obj.validated_data["skip_existing"],
+                    )
+                return CustomResponse().success(
+                    data={"import_id": user_import.id, "status": user_import.status},
+                    message=f"Import of {user_import.users_total} Users queued successfully."
+                )
+            except UserException as se:
+                return CustomResponse().fail(
+                    status=status.HTTP_400_BAD_REQUEST,
+                    errors=se.error_data(),
+                    message=f"Unable to import users. {se.item}."
+                )
+        return CustomResponse().serializer_invalid(
+            status=status.HTTP_400_BAD_REQUEST,
+            errors=serializer_obj.get_flat_errors(),
+            message="Unable to import users. Please contact administrator.",
+        )
+
+    @action(detail=False, methods=['GET'], url_path=r"bulk/import/(?P<import_id>[^/.]+)",
+            permission_classes=[IsAdminUser])
+    def bulk_import_status(self, request, import_id=None) -> Response:
+        """
+        User Bulk Import Status Method
+        """
+        user_import = self.user_import_app_services.get_user_import_by_id(id=import_id)
+        if not user_import:
+            return CustomResponse().fail(
+                status=status.HTTP_404_NOT_FOUND,
+                errors={"error": "User Import not found."},
+                message="Unable to find user import."
+            )
+        user_import_serializer = self.get_serializer_class()
+        return CustomResponse().success(
+            data=user_import_serializer(user_import).data,
+            message="User Import fetched successfully"
+        )
@@ -51,6 +51,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its total covers the other middleware too.
+    "utils.django.middleware.ServerTimingMiddleware",
+    "utils.django.middleware.MetricsMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -88,18 +91,37 @@ WSGI_APPLICATION = 'backend.drivers.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+MONGO_CLIENT_OPTIONS = {
+    "maxPoolSize": config("MONGO_MAX_POOL_SIZE", default=50, cast=int),
+    "minPoolSize": config("MONGO_MIN_POOL_SIZE", default=0, cast=int),
+    "maxIdleTimeMS": config("MONGO_MAX_IDLE_TIME_MS", default=300000, cast=int),
+    "waitQueueTimeoutMS": config("MONGO_WAIT_QUEUE_TIMEOUT_MS", default=2000, cast=int),
+    "connectTimeoutMS": config("MONGO_CONNECT_TIMEOUT_MS", default=5000, cast=int),
+    "serverSelectionTimeoutMS": config(
+        "MONGO_SERVER_SELECTION_TIMEOUT_MS", default=5000, cast=int),
+    "socketTimeoutMS": config("MONGO_SOCKET_TIMEOUT_MS", default=30000, cast=int),
+}
+# Comma separated, e.g. "zstd,snappy,zlib"; zstd and snappy need their python packages.
+if config("MONGO_COMPRESSORS", default=""):
+    MONGO_CLIENT_OPTIONS["compressors"] = config("MONGO_COMPRESSORS")
+
 DATABASES = {
     'default': {
         "ENGINE": config("DB_ENGINE"),
+        # djongo closes and recreates its MongoClient on every new connection, keep it around.
+        "CONN_MAX_AGE": config("DB_CONN_MAX_AGE", default=60, cast=int),
         "CLIENT": {
             "name": config("DB_NAME"),
             "host": config("DB_HOST"),
             "username": config("DB_USERNAME"),
             "password": config("DB_PASSWORD"),
             "authMechanism": "SCRAM-SHA-1",
+            **MONGO_CLIENT_OPTIONS,
         },
     }
 }
+# Database whose client settings are used for the shared pymongo client.
+MONGO_DATABASE_ALIAS = "default"
 
 
 # Password validation
@@ -120,6 +142,29 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing. The first hasher hashes new passwords, the others still verify existing
+# hashes, which are re-hashed with the first one at the next login.
+PASSWORD_HASHER = config("PASSWORD_HASHER", default="pbkdf2_sha256")
+PASSWORD_HASHER_CLASSES = {
+    "pbkdf2_sha256": "utils.django.hashers.PBKDF2PasswordHasher",
+    "argon2": "utils.django.hashers.Argon2PasswordHasher",
+    "bcrypt_sha256": "utils.django.hashers.BCryptSHA256PasswordHasher",
+}
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_CLASSES[PASSWORD_HASHER],
+    *(path for name, path in PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER),
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+PASSWORD_PBKDF2_ITERATIONS = config("PASSWORD_PBKDF2_ITERATIONS", default=390000, cast=int)
+PASSWORD_BCRYPT_ROUNDS = config("PASSWORD_BCRYPT_ROUNDS", default=12, cast=int)
+PASSWORD_ARGON2_TIME_COST = config("PASSWORD_ARGON2_TIME_COST", default=2, cast=int)
+PASSWORD_ARGON2_MEMORY_COST = config("PASSWORD_ARGON2_MEMORY_COST", default=102400, cast=int)
+# Hashing runs on its own pool, see backend.application.user.hashing.
+PASSWORD_HASHING_WORKERS = config(
+    "PASSWORD_HASHING_WORKERS", default=os.cpu_count() or 1, cast=int)
+PASSWORD_HASHING_QUEUE_SIZE = config("PASSWORD_HASHING_QUEUE_SIZE", default=64, cast=int)
+PASSWORD_HASHING_TIMEOUT = config("PASSWORD_HASHING_TIMEOUT", default=10, cast=int)
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -164,13 +209,44 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": False,
 }
 
+# last_login is written in batches: every USER_LAST_LOGIN_FLUSH_SECONDS, or sooner once
+# USER_LAST_LOGIN_BATCH_SIZE logins are waiting.
+USER_LAST_LOGIN_FLUSH_SECONDS = config("USER_LAST_LOGIN_FLUSH_SECONDS", default=5, cast=int)
+USER_LAST_LOGIN_BATCH_SIZE = config("USER_LAST_LOGIN_BATCH_SIZE", default=500, cast=int)
+
+# Bulk user import: most users per request, and rows per insert.
+USER_BULK_IMPORT_MAX_SIZE = config("USER_BULK_IMPORT_MAX_SIZE", default=50000, cast=int)
+USER_BULK_CREATE_BATCH_SIZE = config("USER_BULK_CREATE_BATCH_SIZE", default=1000, cast=int)
+# Imports hash their passwords in the request on a pool of USER_IMPORT_HASHING_WORKERS threads,
+# then insert in the background on USER_IMPORT_WORKERS threads per process. An import not
+# updated for USER_IMPORT_STALE_SECONDS is taken as lost with its process and marked failed.
+USER_IMPORT_WORKERS = config("USER_IMPORT_WORKERS", default=1, cast=int)
+USER_IMPORT_HASHING_WORKERS = config("USER_IMPORT_HASHING_WORKERS", default=2, cast=int)
+USER_IMPORT_HASHING_QUEUE_SIZE = config("USER_IMPORT_HASHING_QUEUE_SIZE", default=16, cast=int)
+USER_IMPORT_STALE_SECONDS = config("USER_IMPORT_STALE_SECONDS", default=900, cast=int)
+
+# Share of requests profiled by ServerTimingMiddleware, 0 turns it off.
+PROFILING_SAMPLE_RATE = config("PROFILING_SAMPLE_RATE", default=0.05, cast=float)
+
+# Every process writes its metrics to a file in METRICS_DIR, /metrics sums them. Clear the
+# directory when deploying. With METRICS_TOKEN set, /metrics needs it as a Bearer token.
+METRICS_DIR = config("METRICS_DIR", default=os.path.join(BASE_DIR, "metrics"))
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+
+# JWT authentication caches, per process.
+JWT_AUTH_TOKEN_CACHE_SIZE = config("JWT_AUTH_TOKEN_CACHE_SIZE", default=10000, cast=int)
+JWT_AUTH_USER_CACHE_SIZE = config("JWT_AUTH_USER_CACHE_SIZE", default=10000, cast=int)
+JWT_AUTH_USER_CACHE_TTL = config("JWT_AUTH_USER_CACHE_TTL", default=30, cast=int)
+# Build request.user from the token claims instead of loading it from the database.
+JWT_AUTH_STATELESS = config("JWT_AUTH_STATELESS", default=False, cast=bool)
+
 # Rest Framework Configuration
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "utils.django.authentication.CachedJWTAuthentication",
     ),
-    "DEFAULT_RENDERER_CLASSES": ("rest_framework.renderers.JSONRenderer",),
+    "DEFAULT_RENDERER_CLASSES": ("utils.django.renderers.ORJSONRenderer",),
 }
 
 # Spectacular Configuration
@@ -185,25 +261,37 @@ SPECTACULAR_SETTINGS = {
 
 # Logging Setup
 
+# Logging goes through a bounded queue to a listener thread, which writes JSON lines to a size
+# rotated LOG_FILE ("{pid}" is replaced by the process id) and text to stderr. Keep "{pid}" in
+# LOG_FILE: worker processes rotating one shared file lose and mix up records.
+LOG_FILE = config("LOG_FILE", default="./logs/debug.{pid}.log")
+LOG_MAX_BYTES = config("LOG_MAX_BYTES", default=10 * 1024 * 1024, cast=int)
+LOG_BACKUP_COUNT = config("LOG_BACKUP_COUNT", default=5, cast=int)
+LOG_QUEUE_SIZE = config("LOG_QUEUE_SIZE", default=10000, cast=int)
+# Records of one message let through per LOG_SAMPLE_WINDOW seconds, 0 disables sampling.
+LOG_SAMPLE_BURST = config("LOG_SAMPLE_BURST", default=50, cast=int)
+LOG_SAMPLE_WINDOW = config("LOG_SAMPLE_WINDOW", default=1.0, cast=float)
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": not DEBUG,
     "handlers": {
-        "file": {
+        "queue": {
             "level": "INFO",
-            "class": "logging.FileHandler",
-            "filename": "./logs/debug.log",
-            "formatter": "simple",
+            "()": "utils.logging.handlers.QueueLogHandler",
+            "filename": LOG_FILE,
+            "max_bytes": LOG_MAX_BYTES,
+            "backup_count": LOG_BACKUP_COUNT,
+            "stream": True,
+            "stream_format": "{levelname} {asctime} {name} {module} {lineno} {message}",
+            "queue_size": LOG_QUEUE_SIZE,
+            "sample_burst": LOG_SAMPLE_BURST,
+            "sample_window": LOG_SAMPLE_WINDOW,
         },
-        "stream": {
-            "level": "INFO",
-            "class": "logging.StreamHandler",
-            "formatter": "simple",
-        }
     },
     "loggers": {
         "django": {
-            "handlers": ["file", "stream"],
+            "handlers": ["queue"],
             "level": "INFO",
             "propagate": True,
         },
@@ -233,3 +321,58 @@ DB_NAME = config("DB_NAME")
 
 # URL name settings
 COMMON_URL = config("COMMON_URL")
+
+# Cache Configuration
+# Defaults to a per-process LRU cache with a TTL. Set CACHE_BACKEND/CACHE_LOCATION to a shared
+# backend (e.g. django.core.cache.backends.redis.RedisCache) when running several processes.
+
+CACHE_BACKEND = config(
+    "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache")
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": config("CACHE_LOCATION", default="backend"),
+        "TIMEOUT": config("CACHE_TIMEOUT", default=300, cast=int),
+    }
+}
+if CACHE_BACKEND.endswith("LocMemCache"):
+    CACHES["default"]["OPTIONS"] = {
+        "MAX_ENTRIES": config("CACHE_MAX_ENTRIES", default=1000, cast=int)}
+
+JOB_POSTING_CACHE_ALIAS = "default"
+# Seconds a process reuses the cache generation it read from the database; a write in another
+# process is seen after at most this long.
+JOB_POSTING_GENERATION_TTL = config("JOB_POSTING_GENERATION_TTL", default=1.0, cast=float)
+
+# Job Posting ingestion
+JOB_INGEST_CHUNK_SIZE = config("JOB_INGEST_CHUNK_SIZE", default=5000, cast=int)
+JOB_INGEST_BATCH_SIZE = config("JOB_INGEST_BATCH_SIZE", default=1000, cast=int)
+JOB_INGEST_WORKERS = config("JOB_INGEST_WORKERS", default=2, cast=int)
+# An ingestion queued or running but not updated for this long is taken as lost with the
+# process that held it and marked failed.
+JOB_INGEST_STALE_SECONDS = config("JOB_INGEST_STALE_SECONDS", default=3600, cast=int)
+
+# Job Posting listing
+JOB_POSTING_PAGE_SIZE = config("JOB_POSTING_PAGE_SIZE", default=50, cast=int)
+JOB_POSTING_MAX_PAGE_SIZE = config("JOB_POSTING_MAX_PAGE_SIZE", default=500, cast=int)
+# Rows read per database round trip (and emitted per chunk) by ?stream=1 listings.
+JOB_POSTING_STREAM_CHUNK_SIZE = config("JOB_POSTING_STREAM_CHUNK_SIZE", default=1000, cast=int)
+JOB_FACET_LIMIT = config("JOB_FACET_LIMIT", default=20, cast=int)
+
+# Job Posting export: rows per cursor batch, CSV/NDJSON chunk and Parquet row group.
+JOB_EXPORT_BATCH_SIZE = config("JOB_EXPORT_BATCH_SIZE", default=5000, cast=int)
+
+# Job Posting search
+# Use "backend.application.job.search.AtlasJobPostingSearchBackend" on MongoDB Atlas.
+JOB_SEARCH_BACKEND = config(
+    "JOB_SEARCH_BACKEND", default="backend.application.job.search.NgramJobPostingSearchBackend")
+JOB_SEARCH_MAX_EDITS = config("JOB_SEARCH_MAX_EDITS", default=2, cast=int)
+JOB_SEARCH_REFRESH_SECONDS = config("JOB_SEARCH_REFRESH_SECONDS", default=30, cast=int)
+# Start building the in-process index when Django starts instead of on the first search.
+# Set it for the web workers only: management commands start Django too.
+JOB_SEARCH_START_ON_READY = config("JOB_SEARCH_START_ON_READY", default=False, cast=bool)
+# Deleted postings are dropped from the in-process index when all ids are compared, this often.
+JOB_SEARCH_RECONCILE_SECONDS = config("JOB_SEARCH_RECONCILE_SECONDS", default=300, cast=int)
+# Searches arriving while the index is first built wait up to this long, then use what is built.
+JOB_SEARCH_BUILD_WAIT_SECONDS = config("JOB_SEARCH_BUILD_WAIT_SECONDS", default=5.0, cast=float)
+JOB_SEARCH_ATLAS_INDEX = config("JOB_SEARCH_ATLAS_INDEX", default="job_posting")
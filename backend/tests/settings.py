@@ -0,0 +1,23 @@
+"""
+Settings for the test suite: backend.settings on SQLite, so the tests need no MongoDB.
+Run with python manage.py test tests --settings=tests.settings.
+"""
+import os
+import tempfile
+
+from backend.settings import *  # noqa: F401,F403
+from backend.settings import LOGGING
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(tempfile.gettempdir(), "backend_test.sqlite3"),
+    }
+}
+
+# Hashing at production cost would make every test that creates a user slow.
+PASSWORD_PBKDF2_ITERATIONS = 1000
+MEDIA_ROOT = os.path.join(tempfile.gettempdir(), "backend_test_media")
+METRICS_DIR = os.path.join(tempfile.gettempdir(), "backend_test_metrics")
+# Log to stderr only.
+LOGGING["handlers"]["queue"]["filename"] = None
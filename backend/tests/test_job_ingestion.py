@@ -0,0 +1,43 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.utils import timezone
+
+from backend.application.job.services import JobIngestionAppServices
+from backend.domain.job.models import IngestionStatusChoices
+from backend.domain.job.services import JobPostingServices
+
+
+class JobIngestionAppServicesTests(TestCase):
+    def setUp(self):
+        self.job_ingestion_app_services = JobIngestionAppServices()
+
+    def create_job_ingestion(self):
+        return self.job_ingestion_app_services.create_job_ingestion(
+            file=SimpleUploadedFile("jobs.csv", b"job_name,company_name\nDeveloper,Acme\n"))
+
+    def test_task_submitted_on_commit(self):
+        with mock.patch("backend.application.job.services.submit_ingestion_task") as submit:
+            with self.captureOnCommitCallbacks() as callbacks:
+                job_ingestion = self.create_job_ingestion()
+            submit.assert_not_called()
+            for callback in callbacks:
+                callback()
+        submit.assert_called_once_with(
+            self.job_ingestion_app_services.run_job_ingestion, job_ingestion.id)
+        job_ingestion.file.delete(save=False)
+
+    def test_interrupted_ingestion_marked_failed(self):
+        with mock.patch("backend.application.job.services.submit_ingestion_task"):
+            job_ingestion = self.create_job_ingestion()
+        JobPostingServices().get_job_ingestion_repo().filter(id=job_ingestion.id).update(
+            status=IngestionStatusChoices.RUNNING,
+            modified_at=timezone.now() - timedelta(days=1))
+
+        job_ingestion = self.job_ingestion_app_services.get_job_ingestion_by_id(
+            id=job_ingestion.id)
+        self.assertEqual(job_ingestion.status, IngestionStatusChoices.FAILED)
+        self.assertTrue(job_ingestion.error)
+        job_ingestion.file.delete(save=False)
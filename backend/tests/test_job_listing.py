@@ -0,0 +1,37 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from backend.domain.job.models import JobPosting
+
+
+class JobPostingListingFacetTests(APITestCase):
+    url = reverse("jobs-list-of-job-posting")
+
+    def setUp(self):
+        caches["default"].clear()
+        JobPosting.objects.create(job_title="Python Developer", company_name="Acme",
+                                  country="Germany")
+
+    def test_facets_listed(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["facets"]["country"], [{"value": "Germany", "count": 1}])
+
+    def test_search_without_facets(self):
+        with mock.patch("backend.application.job.services.JobPostingAppServices."
+                        "search_job_posting", return_value=[]) as search_job_posting:
+            response = self.client.get(self.url, {"job_title": "python"})
+        self.assertEqual(response.status_code, 200)
+        search_job_posting.assert_called_once()
+        self.assertNotIn("facets", response.data)
+
+    def test_search_not_cached(self):
+        with mock.patch("backend.application.job.services.JobPostingAppServices."
+                        "search_job_posting", return_value=[]) as search_job_posting:
+            for _ in range(2):
+                response = self.client.get(self.url, {"job_title": "python"})
+                self.assertNotIn("ETag", response)
+        self.assertEqual(search_job_posting.call_count, 2)
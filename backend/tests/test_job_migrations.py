@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from backend.domain.job.models import JobPosting as CurrentJobPosting
+
+
+class MigrationTestCase(TransactionTestCase):
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+
+class JobPostingContentHashMigrationTests(MigrationTestCase):
+    migrate_from = [("job", "0004_jobposting_annual_compensation")]
+    migrate_to = [("job", "0005_jobposting_upsert")]
+
+    def test_backfills_content_hash(self):
+        JobPosting = self.migrate(self.migrate_from).get_model("job", "JobPosting")
+        job_posting = JobPosting.objects.create(
+            job_title="Python Developer", company_name="Acme",
+            job_post_url="https://jobs.example.com/1", min_compensation="50000")
+
+        self.migrate(self.migrate_to)
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+        job_posting = CurrentJobPosting.objects.get(id=job_posting.id)
+        content_hash = job_posting.content_hash
+        job_posting.set_content_hash()
+        self.assertTrue(content_hash)
+        self.assertEqual(content_hash, job_posting.content_hash)
+
+
+class JobPostingPostUrlUniqueMigrationTests(MigrationTestCase):
+    migrate_from = [("job", "0007_jobpostinggeneration")]
+    migrate_to = [("job", "0008_jobposting_post_url_unique")]
+
+    def test_keeps_newest_posting_per_url(self):
+        JobPosting = self.migrate(self.migrate_from).get_model("job", "JobPosting")
+        now = timezone.now()
+        for index, job_title in enumerate(["Old", "Newest", "Older"]):
+            job_posting = JobPosting.objects.create(
+                job_title=job_title, job_post_url="https://jobs.example.com/1")
+            JobPosting.objects.filter(id=job_posting.id).update(
+                modified_at=now - timedelta(days=[1, 0, 2][index]))
+        JobPosting.objects.create(job_title="Other", job_post_url="https://jobs.example.com/2")
+
+        JobPosting = self.migrate(self.migrate_to).get_model("job", "JobPosting")
+        self.assertEqual(
+            sorted(JobPosting.objects.values_list("job_post_url", "job_title")),
+            [("https://jobs.example.com/1", "Newest"), ("https://jobs.example.com/2", "Other")])
@@ -0,0 +1,49 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from backend.application.job.search import (FILTER_OVERFETCH,
+                                            NgramJobPostingSearchBackend)
+from backend.domain.job.models import JobPosting
+
+
+class NgramJobPostingSearchBackendTests(TestCase):
+    def setUp(self):
+        self.backend = NgramJobPostingSearchBackend()
+        # Refreshed by hand instead of on the background thread.
+        patcher = mock.patch.object(self.backend, "start")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.job_posting = JobPosting.objects.create(
+            job_title="Python Developer", company_name="Acme")
+        self.backend.refresh()
+
+    def search(self, query: str) -> list:
+        return [doc_id for doc_id, _ in self.backend.search_ids(query)]
+
+    def test_search(self):
+        self.assertEqual(self.search("pyth"), [str(self.job_posting.id)])
+        self.assertEqual(self.search("pythno developer"), [str(self.job_posting.id)])
+        self.assertEqual(self.search("golang"), [])
+
+    def test_refresh_picks_up_modified_postings(self):
+        self.job_posting.job_title = "Golang Developer"
+        self.job_posting.save()
+        self.backend.refresh(force=True)
+        self.assertEqual(self.search("golang"), [str(self.job_posting.id)])
+        self.assertEqual(self.search("python"), [])
+
+    def test_refresh_drops_deleted_postings(self):
+        self.job_posting.delete()
+        with self.settings(JOB_SEARCH_RECONCILE_SECONDS=0):
+            self.backend.refresh(force=True)
+        self.assertEqual(self.search("python"), [])
+        self.assertEqual(self.backend.documents, {})
+
+    def test_filtered_search_ranks_a_bounded_window(self):
+        with mock.patch.object(
+                self.backend, "search_ids", wraps=self.backend.search_ids) as search_ids:
+            job_postings = self.backend.search(
+                "python", 2, queryset=JobPosting.objects.filter(company_name="Acme"))
+        search_ids.assert_called_once_with("python", 2 * FILTER_OVERFETCH)
+        self.assertEqual(job_postings, [self.job_posting])
@@ -0,0 +1,74 @@
+import io
+
+from django.db import IntegrityError
+from django.test import TestCase
+
+from backend.application.job.ingestion import JOB_POSTING_COLUMN_MAPPING
+from backend.application.job.services import JobPostingAppServices
+from backend.domain.job.models import JobPosting
+
+
+def job_posting_data(job_post_url: str, job_title: str = "Python Developer") -> dict:
+    return {
+        "job_title": job_title, "company_name": "Acme", "job_description": "Python at Acme",
+        "job_post_url": job_post_url, "job_apply_url": f"{job_post_url}/apply",
+        "company_url": "https://acme.example.com", "company_industry": "Technology",
+        "min_compensation": "40000", "max_compensation": "60000",
+        "type_of_compensation": "annual", "job_hours": "40", "role_seniority": "Senior",
+        "min_education": "Bachelors", "office_location": "Remote", "post_html": "<p></p>",
+        "city": "Berlin", "region": "Berlin", "country": "Germany",
+    }
+
+
+class JobPostingUpsertTests(TestCase):
+    def setUp(self):
+        self.job_posting_app_services = JobPostingAppServices()
+
+    def test_repeated_url_not_counted_unchanged(self):
+        counts = self.job_posting_app_services.upsert_job_posting_data([
+            job_posting_data("https://jobs.example.com/1", "Python Developer"),
+            job_posting_data("https://jobs.example.com/1", "Golang Developer"),
+        ])
+        self.assertEqual(counts, {"rows_inserted": 1, "rows_updated": 0, "rows_unchanged": 0})
+        self.assertEqual(JobPosting.objects.get().job_title, "Golang Developer")
+
+    def test_counts(self):
+        self.job_posting_app_services.upsert_job_posting_data([
+            job_posting_data("https://jobs.example.com/1"),
+            job_posting_data("https://jobs.example.com/2"),
+        ])
+        counts = self.job_posting_app_services.upsert_job_posting_data([
+            job_posting_data("https://jobs.example.com/1"),
+            job_posting_data("https://jobs.example.com/2", "Golang Developer"),
+            job_posting_data("https://jobs.example.com/3"),
+        ])
+        self.assertEqual(counts, {"rows_inserted": 1, "rows_updated": 1, "rows_unchanged": 1})
+
+    def test_job_post_url_unique(self):
+        self.job_posting_app_services.bulk_create_job_posting_data(
+            [job_posting_data("https://jobs.example.com/1")])
+        with self.assertRaises(IntegrityError):
+            self.job_posting_app_services.bulk_create_job_posting_data(
+                [job_posting_data("https://jobs.example.com/1")])
+
+    def test_file_create_mode_upserts_repeated_urls(self):
+        self.job_posting_app_services.bulk_create_job_posting_data(
+            [job_posting_data("https://jobs.example.com/1")])
+        rows = [
+            job_posting_data("https://jobs.example.com/1", "Golang Developer"),
+            job_posting_data("https://jobs.example.com/2"),
+            job_posting_data("https://jobs.example.com/2", "Rust Developer"),
+        ]
+        columns = list(JOB_POSTING_COLUMN_MAPPING)
+        csv = "\n".join([",".join(columns)] + [
+            ",".join(row[JOB_POSTING_COLUMN_MAPPING[column]] for column in columns)
+            for row in rows
+        ])
+        counts = self.job_posting_app_services.bulk_create_job_posting_from_file(
+            file=io.BytesIO(csv.encode()), file_name="jobs.csv")
+        self.assertEqual(counts["rows_failed"], 0)
+        self.assertEqual((counts["rows_inserted"], counts["rows_updated"]), (1, 1))
+        self.assertEqual(
+            sorted(JobPosting.objects.values_list("job_post_url", "job_title")),
+            [("https://jobs.example.com/1", "Golang Developer"),
+             ("https://jobs.example.com/2", "Rust Developer")])
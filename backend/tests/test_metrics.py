@@ -0,0 +1,130 @@
+import os
+import subprocess
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+
+from utils.metrics.registry import MERGED_STORE_FILE, MetricsRegistry
+from utils.metrics.store import INITIAL_SIZE, MmapValueStore, read_store
+
+
+def exited_pid() -> int:
+    process = subprocess.Popen(["true"])
+    process.wait()
+    return process.pid
+
+
+class MmapValueStoreTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "metrics_1.db")
+
+    def test_values_read_from_file(self):
+        store = MmapValueStore(self.path)
+        store.inc("requests", 1)
+        store.inc("requests", 2.5)
+        store.set("in_flight", 4)
+        store.set("in_flight", 2)
+        self.assertEqual(dict(read_store(self.path)), {"requests": 3.5, "in_flight": 2.0})
+        store.close()
+
+    def test_grows_past_initial_size(self):
+        store = MmapValueStore(self.path)
+        keys = [f"key_{index:06d}_{'x' * 32}" for index in range(INITIAL_SIZE // 32)]
+        for index, key in enumerate(keys):
+            store.inc(key, index)
+        self.assertGreater(os.path.getsize(self.path), INITIAL_SIZE)
+        values = dict(read_store(self.path))
+        self.assertEqual(len(values), len(keys))
+        self.assertEqual(values[keys[-1]], len(keys) - 1)
+        store.close()
+
+    def test_reopen_keeps_values(self):
+        store = MmapValueStore(self.path)
+        store.inc("requests", 3)
+        store.close()
+        store = MmapValueStore(self.path)
+        store.inc("requests", 1)
+        store.inc("errors", 1)
+        self.assertEqual(dict(read_store(self.path)), {"requests": 4.0, "errors": 1.0})
+        store.close()
+
+
+class MetricsRegistryTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings_override = override_settings(METRICS_DIR=self.directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.registry = MetricsRegistry()
+        self.requests = self.registry.counter("requests", "Requests served.", ["method"])
+        self.in_flight = self.registry.gauge("in_flight", "Requests in flight.")
+        self.latency = self.registry.histogram(
+            "latency_seconds", "Request latency.", buckets=(0.1, 1.0))
+
+    def tearDown(self):
+        if self.registry.store is not None:
+            self.registry.store.close()
+
+    def write_exited_store(self) -> str:
+        path = os.path.join(self.directory, f"metrics_{exited_pid()}.db")
+        store = MmapValueStore(path)
+        store.inc(self.requests.key("_total", {"method": "GET"}), 5)
+        store.set(self.in_flight.key("", {}), 7)
+        store.close()
+        return path
+
+    def test_render(self):
+        self.requests.inc(method="GET")
+        self.requests.inc(2, method="POST")
+        self.in_flight.set(3)
+        self.in_flight.dec()
+        self.latency.observe(0.05)
+        self.latency.observe(0.5)
+        self.latency.observe(5)
+        self.assertEqual(self.registry.render(), "\n".join([
+            "# HELP requests Requests served.",
+            "# TYPE requests counter",
+            'requests_total{method="GET"} 1',
+            'requests_total{method="POST"} 2',
+            "# HELP in_flight Requests in flight.",
+            "# TYPE in_flight gauge",
+            "in_flight 2",
+            "# HELP latency_seconds Request latency.",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{le="0.1"} 1',
+            'latency_seconds_bucket{le="1.0"} 2',
+            'latency_seconds_bucket{le="+Inf"} 3',
+            "latency_seconds_count 3",
+            "latency_seconds_sum 5.55",
+        ]) + "\n")
+
+    def test_label_values_escaped(self):
+        self.requests.inc(method='a"b\\c\nd')
+        self.assertIn('requests_total{method="a\\"b\\\\c\\nd"} 1', self.registry.render())
+
+    def test_wrong_labels(self):
+        with self.assertRaises(ValueError):
+            self.requests.inc(path="/")
+
+    def test_exited_process_merged(self):
+        path = self.write_exited_store()
+        self.requests.inc(method="GET")
+        rendered = self.registry.render()
+        self.assertIn('requests_total{method="GET"} 6', rendered)
+        self.assertNotIn("in_flight", rendered)
+        self.assertFalse(os.path.exists(path))
+        self.assertTrue(os.path.exists(os.path.join(self.directory, MERGED_STORE_FILE)))
+        # Merged once, not again on the next scrape.
+        self.assertIn('requests_total{method="GET"} 6', self.registry.render())
+
+    def test_reused_pid_starts_from_merged_file(self):
+        path = self.write_exited_store()
+        os.rename(path, os.path.join(self.directory, f"metrics_{os.getpid()}.db"))
+        self.in_flight.inc()
+        rendered = self.registry.render()
+        self.assertIn("in_flight 1", rendered)
+        self.assertIn('requests_total{method="GET"} 5', rendered)
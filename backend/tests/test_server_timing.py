@@ -0,0 +1,33 @@
+from django.core.cache import caches
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from backend.domain.job.models import JobPosting
+
+
+@override_settings(PROFILING_SAMPLE_RATE=1)
+class ServerTimingMiddlewareTests(APITestCase):
+    url = reverse("jobs-list-of-job-posting")
+
+    def setUp(self):
+        caches["default"].clear()
+        JobPosting.objects.create(job_title="Python Developer", company_name="Acme")
+
+    def test_server_timing_header(self):
+        with self.assertLogs("django", "INFO") as logs:
+            response = self.client.get(self.url, {"facets": "false"})
+        self.assertIn("total;dur=", response["Server-Timing"])
+        self.assertIn("db;dur=", response["Server-Timing"])
+        self.assertTrue(any(hasattr(record, "profile") for record in logs.records))
+
+    def test_streamed_response_profiled_until_body_is_done(self):
+        with self.assertLogs("django", "INFO") as logs:
+            response = self.client.get(self.url, {"stream": "1"})
+            self.assertFalse(response.has_header("Server-Timing"))
+            self.assertFalse(any(hasattr(record, "profile") for record in logs.records))
+            b"".join(response.streaming_content)
+        profiles = [record.profile for record in logs.records if hasattr(record, "profile")]
+        self.assertEqual(len(profiles), 1)
+        self.assertTrue(profiles[0]["streamed"])
+        self.assertGreater(profiles[0]["db_count"], 0)
@@ -0,0 +1,116 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.hashers import check_password
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from backend.application.user.services import UserImportAppServices
+from backend.domain.user.services import UserServices
+from backend.interface.user.serializers import BulkUserImportSerializer
+
+
+class BulkUserImportValidationTests(APITestCase):
+    url = reverse("users-bulk-import")
+
+    def setUp(self):
+        self.admin = UserServices().get_user_repo().create_user(
+            "Admin", "User", "admin@example.com", "Admin-Password-1", is_staff=True)
+        self.client.force_authenticate(self.admin)
+
+    def assert_invalid(self, payload: dict, expected_error: str):
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["message"],
+                         "Unable to import users. Please contact administrator.")
+        self.assertIn(expected_error, response.data["errors"])
+
+    def test_empty_users(self):
+        self.assert_invalid({"users": []}, "This list may not be empty.")
+
+    def test_users_not_a_list(self):
+        self.assert_invalid({"users": {"email": "a@example.com"}}, "Expected a list of items")
+
+    def test_too_many_users(self):
+        # Declared fields are copied from their constructor arguments for every serializer.
+        users_field = BulkUserImportSerializer._declared_fields["users"]
+        with mock.patch.dict(users_field._kwargs, {"max_length": 1}):
+            self.assert_invalid({"users": [
+                {"email": f"user{index}@example.com", "first_name": "A", "last_name": "B"}
+                for index in range(2)
+            ]}, "Ensure this field has no more than 1 elements.")
+
+    def test_invalid_user(self):
+        self.assert_invalid({"users": [{"email": "not-an-email", "first_name": "A"}]},
+                            "User 0")
+
+
+class BulkUserImportTests(APITransactionTestCase):
+    url = reverse("users-bulk-import")
+
+    def setUp(self):
+        self.admin = UserServices().get_user_repo().create_user(
+            "Admin", "User", "admin@example.com", "Admin-Password-1", is_staff=True)
+        self.client.force_authenticate(self.admin)
+
+    def wait_for_import(self, import_id: str) -> dict:
+        status_url = reverse("users-bulk-import-status", kwargs={"import_id": import_id})
+        deadline = time.monotonic() + 10
+        while True:
+            response = self.client.get(status_url)
+            self.assertEqual(response.status_code, 200)
+            if response.data["data"]["status"] in ("completed", "failed"):
+                return response.data["data"]
+            self.assertLess(time.monotonic(), deadline, "Import did not finish")
+            time.sleep(0.05)
+
+    def test_import_runs_in_background(self):
+        response = self.client.post(self.url, {"skip_existing": True, "users": [
+            {"email": f"user{index}@example.com", "first_name": "A", "last_name": "B",
+             "password": "Password-1"}
+            for index in range(3)
+        ] + [{"email": "admin@example.com", "first_name": "A", "last_name": "B"}]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["status"], "queued")
+
+        user_import = self.wait_for_import(response.data["data"]["import_id"])
+        self.assertEqual(user_import["status"], "completed")
+        self.assertEqual(user_import["users_total"], 4)
+        self.assertEqual(user_import["users_created"], 3)
+        self.assertEqual(user_import["users_skipped"], 1)
+        user = UserServices().get_user_repo().get(email="user0@example.com")
+        self.assertTrue(user.check_password("Password-1"))
+
+    def test_only_password_hashes_queued(self):
+        with mock.patch("backend.application.user.services.submit_user_import_task") as submit:
+            response = self.client.post(self.url, {"users": [
+                {"email": "user@example.com", "first_name": "A", "last_name": "B",
+                 "password": "Password-1"}]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        _, _, rows = submit.call_args.args
+        self.assertNotEqual(rows[0]["password"], "Password-1")
+        self.assertTrue(check_password("Password-1", rows[0]["password"]))
+
+    def test_existing_email_rejected_before_queueing(self):
+        response = self.client.post(self.url, {"users": [
+            {"email": "admin@example.com", "first_name": "A", "last_name": "B"}]}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(UserServices().get_user_import_repo().exists())
+
+    def test_unknown_import(self):
+        response = self.client.get(reverse(
+            "users-bulk-import-status", kwargs={"import_id": "00000000-0000-0000-0000-000000000000"}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_interrupted_import_marked_failed(self):
+        user_import_repo = UserServices().get_user_import_repo()
+        user_import = UserServices().get_user_import_factory().build_entity_with_id(users_total=1)
+        user_import.save()
+        user_import_repo.filter(id=user_import.id).update(
+            status="running", modified_at=timezone.now() - timedelta(hours=1))
+
+        user_import = UserImportAppServices().get_user_import_by_id(id=user_import.id)
+        self.assertEqual(user_import.status, "failed")
+        self.assertTrue(user_import.error)
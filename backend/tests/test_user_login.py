@@ -0,0 +1,58 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from backend.application.user.auth import last_login_recorder
+from backend.application.user.hashing import (PasswordHashingService,
+                                              password_hashing_service)
+from backend.domain.user.services import UserServices
+from utils.django.exceptions import ServerBusyException
+
+
+class PasswordHashingServiceTests(SimpleTestCase):
+    @override_settings(PASSWORD_HASHING_WORKERS=1, PASSWORD_HASHING_QUEUE_SIZE=0,
+                       PASSWORD_HASHING_TIMEOUT=0.01)
+    def test_full_pool_raises_server_busy(self):
+        service = PasswordHashingService()
+        _, slots = service._get_executor()
+        slots.acquire()
+        try:
+            with self.assertRaises(ServerBusyException) as raised:
+                service.make_password("Password-1")
+        finally:
+            slots.release()
+        self.assertEqual(raised.exception.retry_after, 1)
+
+
+class UserLoginTests(APITestCase):
+    url = reverse("users-login")
+
+    def setUp(self):
+        UserServices().get_user_repo().create_user("A", "B", "user@example.com", "Password-1")
+
+    def tearDown(self):
+        # Written while the test database still exists, not at exit.
+        last_login_recorder.flush()
+
+    def test_login(self):
+        response = self.client.post(
+            self.url, {"email": "user@example.com", "password": "Password-1"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(last_login_recorder.flush(), 1)
+        user = UserServices().get_user_repo().get(email="user@example.com")
+        self.assertIsNotNone(user.last_login)
+
+    def test_wrong_password(self):
+        response = self.client.post(
+            self.url, {"email": "user@example.com", "password": "Password-2"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_server_busy(self):
+        busy = ServerBusyException("Server busy", "Too many password operations", retry_after=5)
+        with mock.patch.object(password_hashing_service, "check_password", side_effect=busy):
+            response = self.client.post(
+                self.url, {"email": "user@example.com", "password": "Password-1"}, format="json")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "5")
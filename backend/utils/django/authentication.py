@@ -0,0 +1,117 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from utils.django.profiling import profile_phase
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU mapping with an optional time to live per entry.
+    """
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self.lock:
+            self.entries[key] = (value, expires_at)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+# Per process. Other processes see a user change once JWT_AUTH_USER_CACHE_TTL has passed.
+verified_token_cache = LRUCache(settings.JWT_AUTH_TOKEN_CACHE_SIZE)
+user_cache = LRUCache(settings.JWT_AUTH_USER_CACHE_SIZE, ttl=settings.JWT_AUTH_USER_CACHE_TTL)
+
+
+def invalidate_cached_user(sender, instance, **kwargs) -> None:
+    user_cache.delete(str(getattr(instance, api_settings.USER_ID_FIELD)))
+
+
+post_save.connect(invalidate_cached_user, sender=settings.AUTH_USER_MODEL,
+                  dispatch_uid="invalidate_cached_user_on_save")
+post_delete.connect(invalidate_cached_user, sender=settings.AUTH_USER_MODEL,
+                    dispatch_uid="invalidate_cached_user_on_delete")
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that skips repeated work for tokens it has already seen:
+    - verified tokens are kept in an LRU keyed by the raw token, so a token's signature is
+      checked once (its expiry is still checked on every request);
+    - users are kept for JWT_AUTH_USER_CACHE_TTL seconds and dropped when the user is saved
+      or deleted in this process.
+    With JWT_AUTH_STATELESS the user is built from the token claims (id, is_staff,
+    is_superuser) and the database is not read at all; staff changes then only apply to
+    tokens issued afterwards.
+    """
+
+    def authenticate(self, request):
+        with profile_phase("auth"):
+            return super().authenticate(request)
+
+    def get_validated_token(self, raw_token: bytes) -> Token:
+        validated_token = verified_token_cache.get(raw_token)
+        if validated_token is not None:
+            try:
+                validated_token.check_exp()
+                return validated_token
+            except TokenError:
+                verified_token_cache.delete(raw_token)
+        validated_token = super().get_validated_token(raw_token)
+        verified_token_cache.set(raw_token, validated_token)
+        return validated_token
+
+    def get_user(self, validated_token: Token):
+        if settings.JWT_AUTH_STATELESS:
+            return TokenUser(validated_token)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = user_cache.get(str(user_id)) if user_id is not None else None
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(str(user_id), user)
+        elif api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed")
+        # Views may change the user they get, keep the cached one clean.
+        return copy.copy(user)
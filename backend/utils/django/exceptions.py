@@ -20,3 +20,28 @@ class UserException(Exception):
 
     def __str__(self) -> str:
         return f"{self.item} {self.message}"
+
+
+@dataclass(frozen=True)
+class ServerBusyException(Exception):
+    item: str
+    message: str
+    retry_after: int
+
+    def error_data(self) -> dict:
+        return {"item": f"{self.item}", "message": f"{self.message}"}
+
+    def __str__(self) -> str:
+        return f"{self.item} {self.message}"
+
+
+@dataclass(frozen=True)
+class JobPostingException(Exception):
+    item: str
+    message: str
+
+    def error_data(self) -> dict:
+        return {"item": f"{self.item}", "message": f"{self.message}"}
+
+    def __str__(self) -> str:
+        return f"{self.item}: {self.message}"
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+# The work factors are read from settings on every use, so changing them (and restarting)
+# is enough: hashes made with another factor are reported by must_update() and re-hashed on
+# the user's next login.
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with PASSWORD_PBKDF2_ITERATIONS iterations.
+    """
+
+    @property
+    def iterations(self) -> int:
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class BCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+    """
+    bcrypt over SHA-256 with 2 ** PASSWORD_BCRYPT_ROUNDS rounds. Needs the bcrypt package.
+    """
+
+    @property
+    def rounds(self) -> int:
+        return settings.PASSWORD_BCRYPT_ROUNDS
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Argon2id with PASSWORD_ARGON2_TIME_COST passes over PASSWORD_ARGON2_MEMORY_COST KiB.
+    Needs the argon2-cffi package.
+    """
+
+    @property
+    def time_cost(self) -> int:
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self) -> int:
+        return settings.PASSWORD_ARGON2_MEMORY_COST
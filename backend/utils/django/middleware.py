@@ -1,9 +1,17 @@
 import logging
-from typing import Any
+import time
+from contextlib import ExitStack
+from typing import Any, Iterable, Iterator
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
 from rest_framework import status
 
+from utils.django.profiling import (RequestProfile, resume_profile,
+                                    should_profile, start_profile,
+                                    stop_profile, time_query)
 from utils.errors.custom_response import CustomResponse
+from utils.metrics.registry import registry
 
 logger = logging.getLogger(__name__)
 logger = logging.getLogger("django")
@@ -17,7 +25,7 @@ class AuthMiddleWare:
     def __init__(self, get_response, pk=None) -> None:
         self.get_response = get_response
 
-    def __call__(self, request, pk=None) -> Any:
+    def __call__(self, request, pk=None, **kwargs) -> Any:
         if not request.user.is_authenticated:
             logger.error("Authentication not provided.")
             return CustomResponse().fail(
@@ -28,7 +36,7 @@ class AuthMiddleWare:
         if not (request.user.is_superuser or request.user.is_staff):
             response = (
                 self.get_response(
-                    request, pk) if pk else self.get_response(request)
+                    request, pk, **kwargs) if pk else self.get_response(request, **kwargs)
             )
             return response
         else:
@@ -38,3 +46,149 @@ class AuthMiddleWare:
                 message="Access denied.",
                 status=status.HTTP_403_FORBIDDEN
             )
+
+
+class ServerTimingMiddleware:
+    """
+    This class will profile a PROFILING_SAMPLE_RATE share of requests: wall time per phase
+    (auth, db, serialize, render) and the number of database calls, sent back as a
+    Server-Timing header and logged with the profile in the record's "profile" attribute.
+    Requests that aren't sampled only pay for the sampling decision.
+    MongoDB commands are timed by the shared client's command listener, other databases
+    through an execute wrapper, which under ASGI doesn't reach the thread sync views run on.
+    Streamed bodies are generated after the headers are sent, so streamed responses get no
+    Server-Timing header; their profile covers generating the body and is logged at its end.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request) -> Any:
+        if self.is_async:
+            return self.__acall__(request)
+        if not should_profile():
+            return self.get_response(request)
+        profile, token = start_profile()
+        try:
+            with self.time_queries():
+                response = self.get_response(request)
+        finally:
+            stop_profile(token)
+        return self.finish(request, response, profile)
+
+    async def __acall__(self, request) -> Any:
+        if not should_profile():
+            return await self.get_response(request)
+        profile, token = start_profile()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_profile(token)
+        return self.finish(request, response, profile)
+
+    def time_queries(self) -> ExitStack:
+        stack = ExitStack()
+        if not self.is_async:
+            for connection in connections.all():
+                # djongo's commands already reach the command listener.
+                if connection.vendor != "djongo":
+                    stack.enter_context(connection.execute_wrapper(time_query))
+        return stack
+
+    def finish(self, request, response, profile: RequestProfile) -> Any:
+        if response.streaming:
+            response.streaming_content = self.profile_streaming_content(
+                request, response, profile, response.streaming_content)
+            return response
+        total_seconds = profile.elapsed()
+        response["Server-Timing"] = profile.server_timing(total_seconds)
+        self.log_profile(request, response, profile, total_seconds)
+        return response
+
+    def profile_streaming_content(
+        self, request, response, profile: RequestProfile, content: Iterable[bytes]
+    ) -> Iterator[bytes]:
+        """
+        This method will generate the streamed body with profile as the current profile, one
+        chunk at a time, and log the profile once the body is done.
+        """
+        iterator = iter(content)
+        try:
+            while True:
+                token = resume_profile(profile)
+                try:
+                    with self.time_queries():
+                        chunk = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    stop_profile(token)
+                yield chunk
+        finally:
+            if hasattr(iterator, "close"):
+                iterator.close()
+            self.log_profile(request, response, profile, profile.elapsed(), streamed=True)
+
+    @staticmethod
+    def log_profile(request, response, profile: RequestProfile, total_seconds: float,
+                    streamed: bool = False) -> None:
+        profile_data = profile.as_dict(total_seconds)
+        logger.info(
+            "Request profile %s %s %s %.1fms", request.method, request.path,
+            response.status_code, profile_data["total_ms"], extra={"profile": {
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                **({"streamed": True} if streamed else {}),
+                **profile_data,
+            }})
+
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "Request latency by route, method and status.",
+    ["route", "method", "status"])
+
+
+class MetricsMiddleware:
+    """
+    This class will record the latency of every request in http_request_duration_seconds,
+    labelled with the URL name (e.g. users-login, jobs-list-of-job-posting) rather than the
+    path, so labels stay few.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request) -> Any:
+        if self.is_async:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self.observe(request, response, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request) -> Any:
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.observe(request, response, time.perf_counter() - started)
+        return response
+
+    @staticmethod
+    def observe(request, response, seconds: float) -> None:
+        resolver_match = getattr(request, "resolver_match", None)
+        http_request_duration.observe(
+            seconds,
+            route=(resolver_match.url_name or resolver_match.route) if resolver_match else "unmatched",
+            method=request.method,
+            status=response.status_code,
+        )
@@ -0,0 +1,112 @@
+import contextvars
+import random
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from django.conf import settings
+
+
+class RequestProfile:
+    """
+    Wall time and call count per phase (auth, db, serialize, render, ...) of one request.
+    Phases can overlap: a query run while serializing counts for both db and serialize.
+    """
+    __slots__ = ("started", "seconds", "counts")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.seconds: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+        self.counts[phase] = self.counts.get(phase, 0) + 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self, total_seconds: float) -> dict:
+        return {
+            "total_ms": round(total_seconds * 1000, 3),
+            **{f"{phase}_ms": round(seconds * 1000, 3) for phase, seconds in self.seconds.items()},
+            **{f"{phase}_count": count for phase, count in self.counts.items()},
+        }
+
+    def server_timing(self, total_seconds: float) -> str:
+        """
+        This method will return the phases as a Server-Timing header value.
+        """
+        metrics = [
+            f'{phase};dur={seconds * 1000:.3f};desc="{self.counts[phase]}"'
+            for phase, seconds in self.seconds.items()
+        ]
+        metrics.append(f"total;dur={total_seconds * 1000:.3f}")
+        return ", ".join(metrics)
+
+
+_current_profile: contextvars.ContextVar = contextvars.ContextVar("request_profile", default=None)
+
+
+def should_profile() -> bool:
+    """
+    This method will decide, with probability PROFILING_SAMPLE_RATE, whether to profile a request.
+    """
+    sample_rate = settings.PROFILING_SAMPLE_RATE
+    return sample_rate >= 1 or (sample_rate > 0 and random.random() < sample_rate)
+
+
+def start_profile() -> Tuple[RequestProfile, contextvars.Token]:
+    profile = RequestProfile()
+    return profile, _current_profile.set(profile)
+
+
+def resume_profile(profile: RequestProfile) -> contextvars.Token:
+    """
+    This method will make profile the current one again, e.g. while a streamed body is generated.
+    """
+    return _current_profile.set(profile)
+
+
+def stop_profile(token: contextvars.Token) -> None:
+    _current_profile.reset(token)
+
+
+def get_current_profile() -> Optional[RequestProfile]:
+    return _current_profile.get()
+
+
+def record_phase(phase: str, seconds: float) -> None:
+    """
+    This method will add seconds to phase of the request being profiled, if any.
+    """
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.add(phase, seconds)
+
+
+@contextmanager
+def profile_phase(phase: str) -> Iterator[None]:
+    """
+    This method will time the with block as phase of the request being profiled, if any.
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(phase, time.perf_counter() - started)
+
+
+def time_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper that records every query as the db phase.
+    """
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record_phase("db", time.perf_counter() - started)
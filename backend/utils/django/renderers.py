@@ -0,0 +1,67 @@
+import logging
+from typing import Any, Callable, Iterable, Iterator
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from utils.django.profiling import profile_phase
+
+logger = logging.getLogger("django")
+
+# Types orjson doesn't know (lazy strings, Decimal, QuerySets, ...) go through DRF's encoder.
+_drf_encoder = JSONEncoder()
+
+
+def render_json(data: Any, option: int = 0) -> bytes:
+    """
+    This method will encode data to JSON bytes with orjson, escaping U+2028/U+2029 like
+    DRF's JSONRenderer so the output stays a valid JavaScript literal.
+    """
+    content = orjson.dumps(data, default=_drf_encoder.default, option=option)
+    if b"\xe2\x80\xa8" in content or b"\xe2\x80\xa9" in content:
+        content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+    return content
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson. Output is compact; any requested indent is rendered
+    with two spaces, the only indent orjson supports.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        with profile_phase("render"):
+            return render_json(data, orjson.OPT_INDENT_2 if indent else 0)
+
+
+def stream_json_envelope(
+    message: str,
+    rows: Iterable,
+    serialize: Callable[[Any], dict],
+    chunk_size: int,
+) -> Iterator[bytes]:
+    """
+    This method will yield the {"success", "message", "data": [...]} envelope as JSON bytes,
+    serializing rows as they are read and emitting one piece per chunk_size rows.
+    A failure after the first piece can't change the status any more; it is logged and the
+    body is left truncated, so clients see invalid JSON rather than a silently short list.
+    """
+    yield b'{"success":true,"message":' + render_json(message) + b',"data":['
+    pieces = []
+    separator = b""
+    try:
+        for row in rows:
+            pieces.append(separator + render_json(serialize(row)))
+            separator = b","
+            if len(pieces) >= chunk_size:
+                yield b"".join(pieces)
+                pieces = []
+    except Exception as e:
+        logger.error("Error while streaming response: %s", e)
+        raise
+    pieces.append(b"]}")
+    yield b"".join(pieces)
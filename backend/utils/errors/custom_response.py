@@ -1,77 +1,89 @@
-import inspect
 from typing import Union
 
 from rest_framework import status
 from rest_framework.response import Response
 
+DEFAULT_SUCCESS_MESSAGE = "Request completed successfully."
 
-class CustomResponse:
-    """This class will create custom response."""
 
-    def __init__(self):
-        self.caller_function = inspect.stack()[1].function
+class CustomResponse:
+    """
+    This class will create custom response.
+    It holds no state, so building one per response costs nothing; envelopes are built as
+    dict literals in their final key order.
+    """
+    __slots__ = ()
 
-    def struct_response(
-        self, data: dict, success: bool, message: str, errors=None
-    ) -> dict:
-        response = dict(success=success, message=message,
-                        data=data)
+    @staticmethod
+    def struct_response(data: dict, success: bool, message: str, errors=None) -> dict:
         if errors:
-            response.pop("data")
-            response["errors"] = errors
-        return response
+            return {"success": success, "message": message, "errors": errors}
+        return {"success": success, "message": message, "data": data}
 
+    @staticmethod
     def listing_struct_response(
-        self, data: dict, success: bool, message: str, count: int, errors=None
+        data: dict, success: bool, message: str, count: int, errors=None
     ) -> dict:
-        response = dict(success=success, message=message,
-                        count=count, data=data)
         if errors:
-            response.pop("data")
-            response["errors"] = errors
-        return response
+            return {"success": success, "message": message, "count": count, "errors": errors}
+        return {"success": success, "message": message, "count": count, "data": data}
 
-    def success(self, data: dict = {}, message: str = None) -> dict:
+    @staticmethod
+    def first_message(message: Union[str, dict]) -> str:
+        """This method will return the first message of a field -> messages dict."""
+        return message[next(iter(message))][0] if isinstance(message, dict) else message
+
+    def success(self, data: dict = None, message: str = None) -> Response:
         """This method will create custom response for success event with response status 200."""
-        success_message = message if message else self.success_message()
         response_data = self.struct_response(
-            data=data, success=True, message=success_message
+            data={} if data is None else data, success=True,
+            message=message or DEFAULT_SUCCESS_MESSAGE
         )
         return Response(response_data, status=status.HTTP_200_OK)
 
-    def fail(self, status, errors: dict, message: Union[str, dict]) -> dict:
+    def fail(self, status, errors: dict, message: Union[str, dict]) -> Response:
         """This method will create custom response for failure event with custom response status."""
-        error_message = (
-            message[next(iter(message))][0] if isinstance(
-                message, dict) else message
-        )
         response_data = self.struct_response(
-            data={}, success=False, message=error_message, errors=errors
+            data={}, success=False, message=self.first_message(message), errors=errors
         )
         return Response(response_data, status=status)
 
-    def serializer_invalid(self, status, errors: Union[str, dict], message: str) -> dict:
+    def serializer_invalid(self, status, errors: Union[str, dict], message: str) -> Response:
         """
         This method will create custom response for serializer failure event with custom response status.
         This function takes status,errors,message as input and returns Response.
         """
-        final_message = (
-            message[next(iter(message))][0] if isinstance(
-                message, dict) else message
-        )
-        error_message = (
-            errors[next(iter(errors))][0] if isinstance(
-                errors, dict) else errors
-        )
         response_data = self.struct_response(
-            data={}, success=False, message=final_message, errors="Error While Operation." + " " + error_message
+            data={}, success=False, message=self.first_message(message),
+            errors="Error While Operation." + " " + self.first_message(errors)
         )
         return Response(response_data, status=status)
 
-    def listing(self, data: dict = {}, message: str = None) -> dict:
+    def listing(self, data: dict = None, message: str = None) -> Response:
         """This method will create custom response for success event with response status 200."""
-        success_message = message if message else self.success_message()
+        data = {} if data is None else data
+        response_data = self.listing_struct_response(
+            data=data, success=True, message=message or DEFAULT_SUCCESS_MESSAGE, count=len(data)
+        )
+        return Response(response_data, status=status.HTTP_200_OK)
+
+    def cursor_listing(
+        self,
+        data: list,
+        message: str = None,
+        next_cursor: str = None,
+        previous_cursor: str = None,
+        estimated_total: int = None,
+        facets: dict = None,
+    ) -> Response:
+        """This method will create custom response for a cursor paginated listing with response status 200."""
         response_data = self.listing_struct_response(
-            data=data, success=True, message=success_message, count=len(data)
+            data=data, success=True, message=message or DEFAULT_SUCCESS_MESSAGE, count=len(data)
         )
+        response_data["next"] = next_cursor
+        response_data["previous"] = previous_cursor
+        if estimated_total is not None:
+            response_data["estimated_total"] = estimated_total
+        if facets is not None:
+            response_data["facets"] = facets
         return Response(response_data, status=status.HTTP_200_OK)
@@ -0,0 +1,226 @@
+import copy
+import logging
+import os
+import queue
+import threading
+import time
+import weakref
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, List, Optional, Tuple, Union
+
+from utils.logging.formatters import JsonFormatter
+from utils.metrics.registry import registry
+
+records_dropped = registry.counter(
+    "log_records_dropped", "Log records dropped rather than block the logging thread.",
+    ["reason"])
+
+# Handlers whose listener thread has to be started again in a forked child.
+_queue_handlers = weakref.WeakSet()
+
+
+class SamplingPolicy:
+    """
+    This class will let burst records of each message (logger, level and unformatted
+    message) through per window seconds and suppress the rest; the first record let through
+    in the next window carries how many were suppressed. Records above max_level are never
+    sampled.
+    """
+    MAX_MESSAGES = 10000
+
+    def __init__(self, burst: int, window: float, max_level: int):
+        self.burst = burst
+        self.window = window
+        self.max_level = max_level
+        self.lock = threading.Lock()
+        # message -> [window start, records let through, records suppressed]
+        self.messages: Dict[tuple, list] = {}
+
+    def allow(self, record: logging.LogRecord) -> Tuple[bool, int]:
+        """
+        This method will return whether the record is let through and, if it is, how many
+        records of its message were suppressed before it.
+        """
+        if self.burst <= 0 or record.levelno > self.max_level:
+            return True, 0
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        with self.lock:
+            state = self.messages.get(key)
+            if state is None or now - state[0] >= self.window:
+                if state is None and len(self.messages) >= self.MAX_MESSAGES:
+                    self.messages.clear()
+                self.messages[key] = [now, 1, 0]
+                return True, state[2] if state is not None else 0
+            if state[1] < self.burst:
+                state[1] += 1
+                return True, 0
+            state[2] += 1
+            return False, 0
+
+
+class BlockingSentinelQueueListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # The queue may be full; the listener makes room, so wait rather than lose the sentinel.
+        self.queue.put(self._sentinel)
+
+
+class QueueLogHandler(QueueHandler):
+    """
+    This class will put records on a bounded queue and return; a listener thread formats
+    them and writes them to a size rotated JSON file (filename, "{pid}" is replaced by the
+    process id) and, if stream is set, to stderr. Logging never blocks the calling thread:
+    repeated messages are sampled, records below WARNING are dropped once the queue is
+    high_water full and every record is dropped once it is full. Drops are counted in the
+    log_records_dropped metric and reported by a warning record every report_interval seconds.
+    RotatingFileHandler is not safe across processes, give each worker its own file.
+    """
+
+    def __init__(self, filename: Optional[str] = None, max_bytes: int = 10 * 1024 * 1024,
+                 backup_count: int = 5, stream: bool = True,
+                 stream_format: str = "{levelname} {asctime} {name} {module} {lineno} {message}",
+                 queue_size: int = 10000, high_water: float = 0.8, sample_burst: int = 50,
+                 sample_window: float = 1.0, sample_max_level: Union[int, str] = logging.ERROR,
+                 report_interval: float = 10.0):
+        super().__init__(queue.Queue(queue_size))
+        self.filename = filename
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.stream = stream
+        self.stream_format = stream_format
+        self.queue_size = queue_size
+        self.high_water_size = max(int(queue_size * high_water), 1)
+        if isinstance(sample_max_level, str):
+            sample_max_level = logging.getLevelName(sample_max_level.upper())
+        self.sampling = SamplingPolicy(sample_burst, sample_window, sample_max_level)
+        self.report_interval = report_interval
+        self.exception_formatter = logging.Formatter()
+        self.targets: List[logging.Handler] = []
+        self.listener: Optional[QueueListener] = None
+        self.dropped_lock = threading.Lock()
+        self.dropped = Counter()
+        self.last_report = time.monotonic()
+        self.start()
+        _queue_handlers.add(self)
+
+    def build_targets(self) -> List[logging.Handler]:
+        targets = []
+        if self.filename:
+            filename = self.filename.replace("{pid}", str(os.getpid()))
+            os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+            file_handler = RotatingFileHandler(
+                filename, maxBytes=self.max_bytes, backupCount=self.backup_count,
+                encoding="utf-8", delay=True)
+            file_handler.setFormatter(JsonFormatter())
+            targets.append(file_handler)
+        if self.stream:
+            stream_handler = logging.StreamHandler()
+            stream_handler.setFormatter(logging.Formatter(self.stream_format, style="{"))
+            targets.append(stream_handler)
+        return targets
+
+    def start(self) -> None:
+        self.queue = queue.Queue(self.queue_size)
+        self.targets = self.build_targets()
+        self.listener = BlockingSentinelQueueListener(
+            self.queue, *self.targets, respect_handler_level=True)
+        self.listener.start()
+
+    def restart_after_fork(self) -> None:
+        """
+        This method will start a listener thread in a forked child, which only has the thread
+        that forked. Records queued in the parent are the parent's to write.
+        """
+        self.sampling.lock = threading.Lock()
+        self.dropped_lock = threading.Lock()
+        self.dropped = Counter()
+        for target in self.targets:
+            target.close()
+        self.start()
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # emit() is thread safe and never waits, so the handler lock is not taken.
+        allowed = self.filter(record)
+        if allowed:
+            if isinstance(allowed, logging.LogRecord):
+                record = allowed
+            self.emit(record)
+        return bool(allowed)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        This method will merge the message arguments and render the traceback, which may
+        change once the caller goes on, and leave the formatting to the listener thread.
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self.exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            allowed, suppressed = self.sampling.allow(record)
+            if not allowed:
+                self.drop("sampled")
+                return
+            if record.levelno < logging.WARNING and self.queue.qsize() >= self.high_water_size:
+                self.drop("backpressure")
+                return
+            prepared = self.prepare(record)
+            if suppressed:
+                prepared.suppressed = suppressed
+            self.queue.put_nowait(prepared)
+        except queue.Full:
+            self.drop("queue_full")
+        except Exception:
+            self.handleError(record)
+            return
+        if self.dropped and time.monotonic() - self.last_report >= self.report_interval:
+            self.report_dropped()
+
+    def drop(self, reason: str) -> None:
+        records_dropped.inc(reason=reason)
+        with self.dropped_lock:
+            self.dropped[reason] += 1
+
+    def report_dropped(self) -> None:
+        with self.dropped_lock:
+            dropped, self.dropped = self.dropped, Counter()
+            self.last_report = time.monotonic()
+        if not dropped:
+            return
+        record = logging.LogRecord(
+            __name__, logging.WARNING, __file__, 0, "%s log records dropped: %s",
+            (sum(dropped.values()), ", ".join(f"{count} {reason}" for reason, count in
+                                              sorted(dropped.items()))), None)
+        record.dropped = dict(dropped)
+        try:
+            self.queue.put_nowait(self.prepare(record))
+        except queue.Full:
+            with self.dropped_lock:
+                self.dropped.update(dropped)
+
+    def close(self) -> None:
+        """
+        This method will write the queued records and stop the listener thread.
+        """
+        _queue_handlers.discard(self)
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        for target in self.targets:
+            target.close()
+        super().close()
+
+
+def _restart_listeners_after_fork() -> None:
+    for handler in list(_queue_handlers):
+        handler.restart_after_fork()
+
+
+os.register_at_fork(after_in_child=_restart_listeners_after_fork)
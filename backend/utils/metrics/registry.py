@@ -0,0 +1,310 @@
+import fcntl
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from utils.metrics.store import MmapValueStore, read_store
+
+logger = logging.getLogger("django")
+
+STORE_FILE_PATTERN = re.compile(r"^metrics_(\d+)\.db$")
+# Counters and histograms of exited processes, folded into one file.
+MERGED_STORE_FILE = "metrics_merged.db"
+LOCK_FILE = "metrics.lock"
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric:
+    """
+    Base class for metrics. Samples are kept in this process's store file as
+    [type, name, suffix, labels] keys, so any process can render every process's samples.
+    """
+    type = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str,
+                 labelnames: Sequence[str] = ()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.keys: Dict[Tuple, str] = {}
+
+    def key(self, suffix: str, labels: dict, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        try:
+            label_values = tuple(str(labels[name]) for name in self.labelnames) + extra
+        except KeyError:
+            label_values = None
+        cache_key = (suffix, label_values)
+        key = self.keys.get(cache_key)
+        if key is None:
+            if label_values is None or set(labels) != set(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {', '.join(self.labelnames)}")
+            key = json.dumps([self.type, self.name, suffix, [
+                *([name, str(labels[name])] for name in self.labelnames),
+                *([name, value] for name, value in extra),
+            ]])
+            self.keys[cache_key] = key
+        return key
+
+
+class Counter(Metric):
+    """
+    Counter; name it without the _total suffix, which is added to its samples.
+    """
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        self.registry.get_store().inc(self.key("_total", labels), amount)
+
+
+class Gauge(Metric):
+    """
+    Gauge summed over the live processes; values of exited processes are dropped.
+    """
+    type = "gauge"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        self.registry.get_store().inc(self.key("", labels), amount)
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        self.registry.get_store().set(self.key("", labels), value)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str,
+                 labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels) -> None:
+        # Stored per bucket, made cumulative when rendered.
+        bucket = next(bound for bound in self.buckets if value <= bound)
+        store = self.registry.get_store()
+        store.inc(self.key("_bucket", labels, (("le", format_bound(bucket)),)), 1)
+        store.inc(self.key("_sum", labels), value)
+        store.inc(self.key("_count", labels), 1)
+
+
+def format_bound(bound: float) -> str:
+    return "+Inf" if bound == math.inf else repr(float(bound))
+
+
+def is_process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsRegistry:
+    """
+    Metrics shared by every process writing to METRICS_DIR. Each process writes its own
+    memory-mapped file there, so recording a sample is a dict lookup and an 8 byte write, no
+    lock or IPC between processes; render() sums the files at scrape time.
+    The counters and histograms of exited processes are folded into one merged file and their
+    files deleted, so totals never go down and a scrape reads one file per live process.
+    Their gauges are dropped. Clear METRICS_DIR when deploying, not while workers run.
+    """
+
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+        self.lock = threading.Lock()
+        self.store: Optional[MmapValueStore] = None
+        self.pid = None
+
+    def get_store(self) -> MmapValueStore:
+        if self.store is None or self.pid != os.getpid():
+            with self.lock:
+                if self.store is None or self.pid != os.getpid():
+                    # After a fork the parent's file stays the parent's.
+                    os.makedirs(settings.METRICS_DIR, exist_ok=True)
+                    path = os.path.join(settings.METRICS_DIR, f"metrics_{os.getpid()}.db")
+                    if os.path.exists(path):
+                        # Left by an exited process that had the same pid.
+                        with self.directory_lock(exclusive=True):
+                            self.merge_store_file(path)
+                    self.store = MmapValueStore(path)
+                    self.pid = os.getpid()
+        return self.store
+
+    @contextmanager
+    def directory_lock(self, exclusive: bool):
+        """
+        This method will hold a lock on METRICS_DIR across processes: shared while reading
+        the files, exclusive while merging them, so a scrape never counts a file twice.
+        """
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        with open(os.path.join(settings.METRICS_DIR, LOCK_FILE), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def merge_store_file(self, path: str) -> None:
+        """
+        This method will add the counters and histograms of an exited process's file to the
+        merged file and delete it. Hold the exclusive directory_lock.
+        """
+        try:
+            entries = list(read_store(path))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.error("Error while reading metrics file %s: %s", path, e)
+            entries = []
+        entries = [(key, value) for key, value in entries
+                   if json.loads(key)[0] != "gauge" and value]
+        if entries:
+            merged_store = MmapValueStore(os.path.join(settings.METRICS_DIR, MERGED_STORE_FILE))
+            try:
+                for key, value in entries:
+                    merged_store.inc(key, value)
+            finally:
+                merged_store.close()
+        os.remove(path)
+
+    def merge_exited_stores(self) -> None:
+        """
+        This method will merge the files of exited processes.
+        """
+        if not any(not is_process_alive(pid) for _, pid in self.iter_store_files()):
+            return
+        with self.directory_lock(exclusive=True):
+            for path, pid in self.iter_store_files():
+                if pid != os.getpid() and not is_process_alive(pid):
+                    self.merge_store_file(path)
+
+    def register(self, metric: Metric) -> Metric:
+        with self.lock:
+            if metric.name in self.metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(self, name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(self, name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def iter_store_files(self) -> Iterable[Tuple[str, int]]:
+        if not os.path.isdir(settings.METRICS_DIR):
+            return
+        for file_name in os.listdir(settings.METRICS_DIR):
+            match = STORE_FILE_PATTERN.match(file_name)
+            if match:
+                yield os.path.join(settings.METRICS_DIR, file_name), int(match.group(1))
+
+    def collect(self) -> Dict[Tuple[str, str], Dict[Tuple[str, Tuple], float]]:
+        """
+        This method will return the samples of every process, summed, keyed by
+        (type, name) and then by (suffix, labels).
+        """
+        self.merge_exited_stores()
+        samples = defaultdict(lambda: defaultdict(float))
+        with self.directory_lock(exclusive=False):
+            paths = [(os.path.join(settings.METRICS_DIR, MERGED_STORE_FILE), None),
+                     *self.iter_store_files()]
+            for path, pid in paths:
+                alive = None
+                try:
+                    entries = list(read_store(path))
+                except FileNotFoundError:
+                    continue
+                except (OSError, ValueError) as e:
+                    logger.error("Error while reading metrics file %s: %s", path, e)
+                    continue
+                for key, value in entries:
+                    metric_type, name, suffix, labels = json.loads(key)
+                    if metric_type == "gauge":
+                        # A process may have exited since the merge.
+                        if alive is None:
+                            alive = pid is not None and is_process_alive(pid)
+                        if not alive:
+                            continue
+                    samples[(metric_type, name)][(suffix, tuple(map(tuple, labels)))] += value
+        return samples
+
+    def render(self) -> str:
+        """
+        This method will return every metric in the Prometheus text exposition format.
+        """
+        lines: List[str] = []
+        for (metric_type, name), metric_samples in sorted(self.collect().items()):
+            metric = self.metrics.get(name)
+            if metric is not None:
+                lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            if metric_type == "histogram":
+                metric_samples = cumulate_buckets(metric_samples)
+            for (suffix, labels), value in sorted(metric_samples.items(), key=sample_order):
+                lines.append(f"{name}{suffix}{format_labels(labels)} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def bucket_bound(labels: Tuple) -> float:
+    return float(dict(labels)["le"].replace("+Inf", "inf"))
+
+
+def cumulate_buckets(samples: Dict[Tuple[str, Tuple], float]) -> Dict[Tuple[str, Tuple], float]:
+    """
+    This method will turn per bucket counts into the cumulative counts Prometheus expects.
+    """
+    cumulated = {key: value for key, value in samples.items() if key[0] != "_bucket"}
+    series = defaultdict(list)
+    for (suffix, labels), value in samples.items():
+        if suffix == "_bucket":
+            series[tuple(label for label in labels if label[0] != "le")].append((labels, value))
+    for buckets in series.values():
+        total = 0.0
+        for labels, value in sorted(buckets, key=lambda bucket: bucket_bound(bucket[0])):
+            total += value
+            cumulated[("_bucket", labels)] = total
+    return cumulated
+
+
+def sample_order(sample) -> tuple:
+    (suffix, labels), _ = sample
+    series = tuple(label for label in labels if label[0] != "le")
+    bound = bucket_bound(labels) if suffix == "_bucket" else 0.0
+    return series, suffix, bound
+
+
+def format_labels(labels: Tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in labels) + "}"
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(value)
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,107 @@
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, Iterator, Tuple
+
+# Layout: an 8 byte header holding the number of bytes in use, then one entry per key:
+# [4 byte key length][utf-8 key, padded to 8 bytes][8 byte double].
+_HEADER = struct.Struct("Q")
+_KEY_LENGTH = struct.Struct("I")
+_VALUE = struct.Struct("d")
+INITIAL_SIZE = 64 * 1024
+
+
+def _entry_layout(key_length: int) -> Tuple[int, int]:
+    """
+    Returns the offset of the value within an entry and the entry size.
+    """
+    value_offset = _KEY_LENGTH.size + key_length
+    value_offset += -value_offset % 8
+    return value_offset, value_offset + _VALUE.size
+
+
+def _iter_entries(data, used: int) -> Iterator[Tuple[str, float, int]]:
+    position = _HEADER.size
+    while position < used:
+        key_length = _KEY_LENGTH.unpack_from(data, position)[0]
+        key_start = position + _KEY_LENGTH.size
+        value_offset, entry_size = _entry_layout(key_length)
+        key = bytes(data[key_start:key_start + key_length]).decode()
+        yield key, _VALUE.unpack_from(data, position + value_offset)[0], position + value_offset
+        position += entry_size
+
+
+class MmapValueStore:
+    """
+    Float values keyed by string in a memory-mapped file owned by one process. Only the owner
+    writes; other processes read the file with read_store(). A new entry is written before the
+    header counts it, so readers never see half an entry, and values are aligned 8 byte writes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = open(path, "a+b")
+        if os.fstat(self.file.fileno()).st_size < INITIAL_SIZE:
+            self.file.truncate(INITIAL_SIZE)
+        self.capacity = os.fstat(self.file.fileno()).st_size
+        self.mmap = mmap.mmap(self.file.fileno(), self.capacity)
+        self.used = _HEADER.unpack_from(self.mmap, 0)[0] or _HEADER.size
+        self.positions: Dict[str, int] = {
+            key: value_position for key, _, value_position in _iter_entries(self.mmap, self.used)}
+
+    def _grow(self, needed: int) -> None:
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        self.mmap.close()
+        self.file.truncate(capacity)
+        self.capacity = capacity
+        self.mmap = mmap.mmap(self.file.fileno(), capacity)
+
+    def _add_key(self, key: str) -> int:
+        encoded = key.encode()
+        value_offset, entry_size = _entry_layout(len(encoded))
+        if self.used + entry_size > self.capacity:
+            self._grow(self.used + entry_size)
+        _KEY_LENGTH.pack_into(self.mmap, self.used, len(encoded))
+        self.mmap[self.used + _KEY_LENGTH.size:self.used + _KEY_LENGTH.size + len(encoded)] = encoded
+        value_position = self.used + value_offset
+        _VALUE.pack_into(self.mmap, value_position, 0.0)
+        self.used += entry_size
+        _HEADER.pack_into(self.mmap, 0, self.used)
+        self.positions[key] = value_position
+        return value_position
+
+    def inc(self, key: str, amount: float) -> None:
+        with self.lock:
+            position = self.positions.get(key)
+            if position is None:
+                position = self._add_key(key)
+            _VALUE.pack_into(self.mmap, position, _VALUE.unpack_from(self.mmap, position)[0] + amount)
+
+    def set(self, key: str, value: float) -> None:
+        with self.lock:
+            position = self.positions.get(key)
+            if position is None:
+                position = self._add_key(key)
+            _VALUE.pack_into(self.mmap, position, value)
+
+    def close(self) -> None:
+        with self.lock:
+            self.mmap.close()
+            self.file.close()
+
+
+def read_store(path: str) -> Iterator[Tuple[str, float]]:
+    """
+    This method will yield the (key, value) pairs of a store file, written by any process.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) < _HEADER.size:
+        return
+    used = min(_HEADER.unpack_from(data, 0)[0], len(data))
+    for key, value, _ in _iter_entries(data, used):
+        yield key, value
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+from utils.metrics.registry import registry
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@require_GET
+def metrics_view(request) -> HttpResponse:
+    """
+    This view will return every process's metrics in the Prometheus text format. When
+    METRICS_TOKEN is set, scrapers have to send it as a Bearer token.
+    """
+    if settings.METRICS_TOKEN and not constant_time_compare(
+            request.headers.get("Authorization", ""), f"Bearer {settings.METRICS_TOKEN}"):
+        return HttpResponse("Unauthorized", status=401, content_type="text/plain")
+    return HttpResponse(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
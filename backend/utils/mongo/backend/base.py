@@ -0,0 +1,35 @@
+from collections import OrderedDict
+
+from django.conf import settings
+from djongo.base import DatabaseWrapper as DjongoDatabaseWrapper
+from djongo.base import DjongoClient
+
+from utils.mongo.connection import get_mongo_client
+
+
+class DatabaseWrapper(DjongoDatabaseWrapper):
+    """
+    djongo backend that runs on the shared per-process MongoClient from utils.mongo.connection.
+    djongo keeps one module-level client per database and closes it whenever any thread opens
+    a new connection, which drops every other thread's pooled sockets, and the client is
+    carried over into forked workers. Here connections borrow the shared client instead and
+    closing a Django connection leaves the pool alone.
+    """
+
+    def get_new_connection(self, connection_params):
+        if self.alias != settings.MONGO_DATABASE_ALIAS:
+            return super().get_new_connection(connection_params)
+        name = connection_params.pop("name")
+        enforce_schema = connection_params.pop("enforce_schema")
+        self.client_connection = get_mongo_client()
+        database = self.client_connection.get_database(
+            name,
+            codec_options=self.client_connection.codec_options.with_options(
+                document_class=OrderedDict),
+        )
+        self.djongo_connection = DjongoClient(database, enforce_schema)
+        return database
+
+    def _close(self):
+        if self.alias != settings.MONGO_DATABASE_ALIAS:
+            return super()._close()
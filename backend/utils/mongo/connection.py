@@ -0,0 +1,256 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from typing import Dict, Union
+
+from django.conf import settings
+from pymongo import MongoClient, monitoring
+
+from utils.django.profiling import record_phase
+from utils.metrics.registry import registry
+
+logger = logging.getLogger("django")
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+# Motor clients are bound to the event loop they were created on; a client holds its loop, so
+# they are kept by loop and closed once the loop is.
+_motor_clients = {}
+_motor_clients_lock = threading.Lock()
+
+
+pool_checkouts = registry.counter(
+    "mongo_pool_checkouts", "MongoDB connections checked out of the pool.")
+pool_checkout_failures = registry.counter(
+    "mongo_pool_checkout_failures", "MongoDB connection check outs that failed.",
+    ["reason"])
+pool_checkout_wait = registry.histogram(
+    "mongo_pool_checkout_wait_seconds", "Time spent waiting for a pooled MongoDB connection.",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0))
+pool_connections = registry.gauge(
+    "mongo_pool_connections", "MongoDB connections open and checked out.", ["state"])
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """
+    pymongo ConnectionPoolListener that counts pool events for this process and records them
+    in the shared metrics.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        # A check out starts and ends on the same thread.
+        self.local = threading.local()
+
+    def _count(self, name: str) -> None:
+        with self.lock:
+            self.counts[name] += 1
+
+    def pool_created(self, event) -> None:
+        self._count("pools_created")
+
+    def pool_cleared(self, event) -> None:
+        self._count("pools_cleared")
+
+    def pool_closed(self, event) -> None:
+        self._count("pools_closed")
+
+    def connection_created(self, event) -> None:
+        self._count("connections_created")
+        pool_connections.inc(state="open")
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        self._count("connections_closed")
+        pool_connections.dec(state="open")
+
+    def connection_check_out_started(self, event) -> None:
+        self._count("checkouts_started")
+        self.local.check_out_started = time.perf_counter()
+
+    def _observe_wait(self) -> None:
+        started = getattr(self.local, "check_out_started", None)
+        if started is not None:
+            pool_checkout_wait.observe(time.perf_counter() - started)
+            self.local.check_out_started = None
+
+    def connection_check_out_failed(self, event) -> None:
+        self._count("checkouts_failed")
+        self._observe_wait()
+        pool_checkout_failures.inc(reason=event.reason)
+        logger.warning("MongoDB connection check out failed for %s: %s",
+                       event.address, event.reason)
+
+    def connection_checked_out(self, event) -> None:
+        self._count("checkouts")
+        self._observe_wait()
+        pool_checkouts.inc()
+        pool_connections.inc(state="in_use")
+
+    def connection_checked_in(self, event) -> None:
+        self._count("checkins")
+        pool_connections.dec(state="in_use")
+
+    def reset(self) -> None:
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        self.local = threading.local()
+
+    def snapshot(self) -> Dict[str, int]:
+        with self.lock:
+            counts = dict(self.counts)
+        return {
+            **counts,
+            "connections_open": (counts.get("connections_created", 0)
+                                 - counts.get("connections_closed", 0)),
+            "connections_in_use": counts.get("checkouts", 0) - counts.get("checkins", 0),
+        }
+
+
+pool_stats_listener = PoolStatsListener()
+
+
+class CommandTimingListener(monitoring.CommandListener):
+    """
+    pymongo CommandListener that adds each command's round trip to the db phase of the request
+    being profiled (see utils.django.profiling). Commands are reported on the thread that sent
+    them, so motor's, sent from its executor threads, are not attributed to a request.
+    """
+
+    def started(self, event) -> None:
+        pass
+
+    def succeeded(self, event) -> None:
+        record_phase("db", event.duration_micros / 1_000_000)
+
+    def failed(self, event) -> None:
+        record_phase("db", event.duration_micros / 1_000_000)
+
+
+command_timing_listener = CommandTimingListener()
+
+
+def get_mongo_client_options() -> dict:
+    """
+    This method will return the MongoClient keyword arguments, the same ones djongo gets from
+    DATABASES, so both clients share pool sizes, timeouts and compression.
+    """
+    options = {
+        key: value for key, value in
+        settings.DATABASES[settings.MONGO_DATABASE_ALIAS]["CLIENT"].items()
+        if key != "name"
+    }
+    # Connect on first use instead of in the constructor.
+    options["connect"] = False
+    return options
+
+
+def _reset_client() -> None:
+    # The parent's sockets and monitor threads are not usable in a forked child; drop the
+    # reference without closing it, so the parent's connections are left alone.
+    global _client, _client_pid, _client_lock, _motor_clients_lock
+    _client = None
+    _client_pid = None
+    _client_lock = threading.Lock()
+    _motor_clients.clear()
+    _motor_clients_lock = threading.Lock()
+    pool_stats_listener.reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_client)
+
+
+def get_mongo_client():
+    """
+    This method will return this process's MongoClient, creating it on first use and again
+    after a fork.
+    """
+    global _client, _client_pid
+    if _client is None or _client_pid != os.getpid():
+        with _client_lock:
+            if _client is None or _client_pid != os.getpid():
+                _client = MongoClient(
+                    event_listeners=[pool_stats_listener, command_timing_listener],
+                    **get_mongo_client_options())
+                _client_pid = os.getpid()
+                logger.info("MongoDB client created for process %s", _client_pid)
+    return _client
+
+
+def get_mongo_database():
+    """
+    This method will return the configured database on the shared client.
+    """
+    return get_mongo_client()[settings.DB_NAME]
+
+
+def get_mongo_collection(name: str):
+    """
+    This method will return a collection on the shared client.
+    """
+    return get_mongo_database()[name]
+
+
+def close_finished_motor_clients() -> int:
+    """
+    This method will close the motor clients of event loops that have been closed, e.g. the
+    per call loops async_to_sync creates when async views are served under WSGI, and return
+    how many were closed.
+    """
+    with _motor_clients_lock:
+        finished = [loop for loop in _motor_clients if loop.is_closed()]
+        clients = [_motor_clients.pop(loop) for loop in finished]
+    for client in clients:
+        # Closes the pooled connections, which takes them off the pool gauges.
+        client.close()
+    return len(clients)
+
+
+def get_motor_client():
+    """
+    This method will return the motor (asyncio) client of the running event loop, creating it on
+    first use. It has the same options as the pymongo client and reports to the same pool stats.
+    A process serving ASGI has one loop and so one client; clients of loops that have finished
+    since are closed first.
+    """
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    close_finished_motor_clients()
+    loop = asyncio.get_running_loop()
+    with _motor_clients_lock:
+        client = _motor_clients.get(loop)
+        if client is None:
+            client = AsyncIOMotorClient(
+                event_listeners=[pool_stats_listener, command_timing_listener], io_loop=loop,
+                **get_mongo_client_options())
+            _motor_clients[loop] = client
+            logger.info("MongoDB motor client created for process %s", os.getpid())
+    return client
+
+
+def get_motor_collection(name: str):
+    """
+    This method will return a collection on the running event loop's motor client.
+    """
+    return get_motor_client()[settings.DB_NAME][name]
+
+
+def get_pool_stats() -> Dict[str, Union[int, None]]:
+    """
+    This method will return this process's pool counters with the configured pool limits.
+    """
+    options = get_mongo_client_options()
+    return {
+        **pool_stats_listener.snapshot(),
+        "max_pool_size": options.get("maxPoolSize"),
+        "min_pool_size": options.get("minPoolSize"),
+        "client_created": _client is not None and _client_pid == os.getpid(),
+    }
@@ -0,0 +1,15 @@
+from typing import Iterable
+
+
+def to_mongo_document(instance, connection, add: bool, exclude: Iterable[str] = ()) -> dict:
+    """
+    This method will return a model instance as the document djongo would write, running
+    auto_now/auto_now_add and each field's database conversion.
+    """
+    document = {}
+    for field in instance._meta.concrete_fields:
+        if field.name in exclude:
+            continue
+        value = field.pre_save(instance, add)
+        document[field.column] = field.get_db_prep_save(value, connection=connection)
+    return document
@@ -0,0 +1,119 @@
+from typing import Dict, List, Tuple, Union
+
+from django.db import migrations, models
+
+IndexKey = Tuple[Tuple[str, int], ...]
+
+
+def index_key(model, index: Union[models.Index, models.UniqueConstraint]) -> IndexKey:
+    """
+    This method will return the MongoDB key spec of a declared index, e.g. "-created_at" ->
+    ("created_at", -1).
+    """
+    key = []
+    for field_name in index.fields:
+        direction = -1 if field_name.startswith("-") else 1
+        column = model._meta.get_field(field_name.lstrip("-")).column
+        key.append((column, direction))
+    return tuple(key)
+
+
+def declared_index_keys(model) -> Dict[IndexKey, str]:
+    """
+    This method will return key spec -> name of every index the model declares: the primary key,
+    unique/db_index fields, Meta.indexes and unique Meta.constraints.
+    """
+    declared = {}
+    for field in model._meta.concrete_fields:
+        if field.primary_key or field.unique or field.db_index:
+            declared[((field.column, 1),)] = field.column
+    for index in model._meta.indexes:
+        declared[index_key(model, index)] = index.name
+    for constraint in model._meta.constraints:
+        if isinstance(constraint, models.UniqueConstraint) and constraint.fields:
+            declared[index_key(model, constraint)] = constraint.name
+    return declared
+
+
+def live_index_keys(collection) -> Dict[IndexKey, str]:
+    """
+    This method will return key spec -> name of the indexes that exist on a MongoDB collection.
+    """
+    return {
+        tuple((field, int(direction)) for field, direction in info["key"]): name
+        for name, info in collection.index_information().items()
+        if name != "_id_"
+    }
+
+
+def index_drift(model, collection) -> Dict[str, List[Tuple[IndexKey, str]]]:
+    """
+    This method will compare declared and live indexes by key spec and return the missing
+    (declared, not in MongoDB) and unexpected (in MongoDB, not declared) ones.
+    """
+    declared = declared_index_keys(model)
+    live = live_index_keys(collection)
+    return {
+        "missing": [(key, name) for key, name in declared.items() if key not in live],
+        "unexpected": [(key, name) for key, name in live.items() if key not in declared],
+    }
+
+
+class AddMongoIndex(migrations.AddIndex):
+    """
+    AddIndex that builds the index with pymongo on djongo, which otherwise drops the sort
+    direction of "-field" entries. Other database backends use the regular AddIndex.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "djongo":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        schema_editor.connection.ensure_connection()
+        collection = schema_editor.connection.connection[model._meta.db_table]
+        collection.create_index(list(index_key(model, self.index)), name=self.index.name)
+
+
+class RemoveMongoIndex(migrations.RemoveIndex):
+    """
+    RemoveIndex that drops the index with pymongo on djongo. Other database backends use the
+    regular RemoveIndex.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "djongo":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        schema_editor.connection.ensure_connection()
+        collection = schema_editor.connection.connection[model._meta.db_table]
+        if self.name in collection.index_information():
+            collection.drop_index(self.name)
+
+
+class AddMongoUniqueConstraint(migrations.AddConstraint):
+    """
+    AddConstraint that builds a UniqueConstraint as a unique index with pymongo on djongo.
+    Other database backends use the regular AddConstraint.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "djongo":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        from pymongo.errors import DuplicateKeyError
+
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        schema_editor.connection.ensure_connection()
+        collection = schema_editor.connection.connection[model._meta.db_table]
+        try:
+            collection.create_index(list(index_key(model, self.constraint)),
+                                    name=self.constraint.name, unique=True)
+        except DuplicateKeyError as e:
+            raise ValueError(
+                f"{model._meta.db_table} has duplicate {', '.join(self.constraint.fields)} "
+                f"values, written while migrating; migrate again: {e}") from e